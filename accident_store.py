@@ -0,0 +1,268 @@
+#----------------------------
+# File Headers:
+#----------------------------
+# Shebang:
+#!/usr/bin/env python
+
+
+# Encoding:
+# -*- coding: utf-8 -*-
+
+
+# Docstring:
+"""
+Filename: accident_store.py
+Authors: Tsukiko
+Date: 18/10/2026
+Version: 1.0.0
+Description:
+    A compact binary store for the accident log that bladder capacity is learned from.
+    The file is a 16 byte header followed by fixed-width little-endian records, and is
+    read through a memory map so loading costs the same however long the log grows.
+
+    Header: magic b'OMOA', format version (uint16), record size (uint16), 8 reserved bytes.
+    Record: time (float64, minutes, NaN if unknown), amount (float64, mL).
+
+    migrate_csv() converts the accidents.csv written by earlier versions in one go.
+
+License: MIT License
+Contact: tsukiko1701@gmail.com
+Dependencies: array, csv, math, mmap, os, struct, sys
+"""
+
+
+# Dunders:
+__author__ = "Tsukiko"
+__copyright__ = "Copyright (c) 2025 Tsukiko-030"
+__credits__ = ["Tsukiko"]
+__license__ = "The MIT License (MIT)"
+__version__ = "1.0.0"
+__maintainer__ = "Tsukiko"
+__email__ = "tsukiko1701@gmail.com"
+__status__ = "Production"
+#----------------------------
+
+
+
+
+#----------------------------
+# Import Statements:
+#----------------------------
+from array import array
+import csv
+import math
+import mmap
+import os
+import struct
+import sys
+#----------------------------
+
+
+
+
+#--------------------------------------
+# Exterior Variables:
+#--------------------------------------
+MAGIC = b'OMOA'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHH8x')
+RECORD = struct.Struct('<dd')
+#--------------------------------------
+
+
+
+
+#--------------------------------------
+# Exterior Functions:
+#--------------------------------------
+def migrate_csv(csv_path, store_path):
+    """
+    One-shot conversion of an accidents.csv into a binary store. Does nothing if the store
+    already exists or there is no CSV. The CSV is kept, renamed with a '.migrated' suffix.
+    Returns the number of accidents migrated.
+    """
+    if os.path.exists(store_path) or not os.path.exists(csv_path):
+        return 0
+
+    with open(csv_path, 'r', newline='') as f:
+        amounts = [float(row[0]) for row in csv.reader(f) if row]
+
+    # Write to a temporary file first, so a crash never leaves a half-written store behind:
+    os.makedirs(os.path.dirname(os.path.abspath(store_path)), exist_ok=True)
+    temporary_path = store_path + '.tmp'
+    with open(temporary_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, RECORD.size))
+        f.writelines(RECORD.pack(math.nan, amount) for amount in amounts)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary_path, store_path)
+    os.replace(csv_path, csv_path + '.migrated')
+    return len(amounts)
+#--------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# AccidentStoreError Class:
+#----------------------------------------------------------------------------------------------------------------------
+class AccidentStoreError(Exception):
+    """This custom exception is used to report errors in the use of the AccidentStore class."""
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# AccidentStore Class:
+#----------------------------------------------------------------------------------------------------------------------
+class AccidentStore():
+    # Constructor:
+    def __init__(self, path):
+        """
+        Initializes the AccidentStore Class.
+        :param path: Store file, created along with its directory on the first append.
+        """
+        self.path = path
+        self._file = None
+        self._map = None
+        # Views onto the map, made once per mapping and released when it is unmapped:
+        self._records = None
+        self._doubles = None
+        self._columns = {}
+
+
+
+
+    # Private Methods:
+    def _open(self):
+        """Maps the store into memory and returns the memoryview of its records, or None if it is empty."""
+        if self._map is None:
+            if not os.path.exists(self.path) or os.path.getsize(self.path) <= HEADER.size:
+                return None
+            self._file = open(self.path, 'rb')
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, record_size = HEADER.unpack_from(self._map)
+            if magic != MAGIC or record_size != RECORD.size:
+                self.close()
+                raise AccidentStoreError(self.path + " is not an accident store.")
+            if version > FORMAT_VERSION:
+                self.close()
+                raise AccidentStoreError(self.path + " was written by a newer version of the app.")
+
+        if self._records is None:
+            # A record torn by a crash mid-append is ignored:
+            count = (len(self._map) - HEADER.size) // RECORD.size
+            self._records = memoryview(self._map)[HEADER.size:HEADER.size + count * RECORD.size]
+        return self._records
+
+
+
+
+    def _column(self, index):
+        """Returns one column of the records as a sequence of floats, without copying where possible."""
+        view = self._open()
+        if view is None:
+            return []
+        if sys.byteorder == 'little':
+            if index not in self._columns:
+                if self._doubles is None:
+                    self._doubles = view.cast('d')
+                self._columns[index] = self._doubles[index::2]
+            return self._columns[index]
+        else:
+            column = array('d', view.tobytes())
+            column.byteswap()
+            return column[index::2]
+
+
+
+
+    # Public Methods:
+    def amounts(self):
+        """Returns the accident amounts, as a zero-copy view onto the mapped file on little-endian machines."""
+        return self._column(1)
+
+
+
+
+    def times(self):
+        """Returns the accident times, NaN for accidents migrated from CSV."""
+        return self._column(0)
+
+
+
+
+    def append(self, records):
+        """
+        Appends accidents to the store.
+        :param records: Iterable of (time, amount) pairs.
+        Views previously returned by amounts() and times() are released first.
+        """
+        records = list(records)
+        if not records:
+            return
+
+        self.close()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        new_file = not os.path.exists(self.path) or os.path.getsize(self.path) < HEADER.size
+        with open(self.path, 'wb' if new_file else 'ab') as f:
+            if new_file:
+                f.write(HEADER.pack(MAGIC, FORMAT_VERSION, RECORD.size))
+            else:
+                # Drop any record torn by an earlier crash, so the new ones stay aligned:
+                f.truncate(HEADER.size + (f.tell() - HEADER.size) // RECORD.size * RECORD.size)
+            f.writelines(RECORD.pack(float(t), float(amount)) for t, amount in records)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+
+
+    def reset(self):
+        """Deletes the store. Views previously returned are released first."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+
+
+    def close(self):
+        """Releases any views handed out and unmaps the store."""
+        for view in self._columns.values():
+            view.release()
+        self._columns = {}
+        for view in (self._doubles, self._records):
+            if view is not None:
+                view.release()
+        self._doubles = self._records = None
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#--------------------------------------------------------------------------------------------------
+# Ideas for Improvements:
+#--------------------------------------------------------------------------------------------------
+"""
+* Store why each accident happened, see Ideas.md.
+"""
+#--------------------------------------------------------------------------------------------------
+
+
+
+
+#--------------------------------------------------------------------------------------------------
+# References:
+#--------------------------------------------------------------------------------------------------
+"""
+* https://docs.python.org/3/library/mmap.html
+"""
+#--------------------------------------------------------------------------------------------------
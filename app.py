@@ -21,7 +21,7 @@ Description:
 
 License: The MIT License (MIT)
 Contact: https://github.com/perv-asive, tsukiko1701@gmail.com
-Dependencies: time, tkinter, tkinter.ttk, tkinter.messagebox, customtkinter, appdirs, csv, os, math, omo.py, stopwatch.py, timer.py
+Dependencies: startup.py, time, logging, tkinter, tkinter.messagebox, customtkinter, appdirs, os, math, accident_store.py, bindings.py, chart.py, gauge.py, hold_store.py, journal.py, model_service.py, omo.py, profiling.py, refresh.py, stopwatch.py, virtual_list.py
 """
 
 
@@ -42,18 +42,23 @@ __status__ = "Production"
 #----------------------------
 #Import Statements:
 #----------------------------
+import startup # First, so startup profiling sees every import.
 import time
 import tkinter as tk
-import tkinter.ttk as ttk
-from tkinter import messagebox
 import customtkinter as ctk
-import appdirs
-import csv
 import os
 import math
-import omo
+import bindings
+import chart
+import gauge
+import model_service
+import profiling
+import refresh
 import stopwatch
-import timer
+import virtual_list
+# Not needed for the first frame, imported later: tkinter.messagebox when resetting the capacity log,
+# tkinter.filedialog when exporting a profile, logging when something fails,
+# omo (and with it numpy), appdirs, journal, accident_store and hold_store by the model service thread.
 #----------------------------
 
 
@@ -62,8 +67,15 @@ import timer
 #---------------------------------------------------------------
 #Set up save file storage paths:
 #---------------------------------------------------------------
-save_dir = appdirs.user_data_dir('Omo Trainer', 'PERVasive')
-accident_log = os.path.join(save_dir, 'accidents.csv')
+def save_paths():
+    # Returns the accident log, accident store, session journal and hold history paths:
+    import appdirs
+    save_dir = appdirs.user_data_dir('Omo Trainer', 'PERVasive')
+    accident_log = os.path.join(save_dir, 'accidents.csv') # Written by earlier versions, migrated on first start.
+    accident_store_path = os.path.join(save_dir, 'accidents.bin')
+    session_journal = os.path.join(save_dir, 'session.journal')
+    hold_store_path = os.path.join(save_dir, 'holds.sqlite3')
+    return accident_log, accident_store_path, session_journal, hold_store_path
 #---------------------------------------------------------------
 
 
@@ -74,6 +86,30 @@ accident_log = os.path.join(save_dir, 'accidents.csv')
 #--------------------------------------
 def current_time_in_minutes_float():
     return time.time()/60.0
+
+
+
+
+# Drinker methods timed while profiling is enabled, see profiling.py:
+PROFILED_DRINKER_METHODS = ('add_drink', 'add_release', 'set_permission', 'snapshot', 'projection',
+                            'bladder_curve', 'load_events', 'compact')
+
+
+
+
+def log_error(message, error):
+    # For failures the app carries on after, such as a hold the hold history could not record:
+    import logging
+    logging.getLogger(__name__).error(message, exc_info=error)
+
+
+
+
+def event_kind(event):
+    # The chart marker for a Drink or Release event, told apart without importing omo:
+    if not hasattr(event, 'permission'):
+        return 'drink'
+    return 'pee' if event.permission else 'accident'
 #--------------------------------------
 
 
@@ -84,6 +120,8 @@ def current_time_in_minutes_float():
 #----------------------------------------------------------------------------------------------------------------------
 class App(object):
     def __init__(self):
+        startup.profile.mark("imports done")
+
         #Setup application window:
         self.root = ctk.CTk()
         self.root.columnconfigure(0, weight=1)
@@ -91,24 +129,41 @@ class App(object):
         self.root.title("Omo Tracker")
         
 
-        #Try to load application icon:
-        self.root.iconbitmap('icon.ico')
+        #The Drinker lives on the model service's worker thread, which starts by loading the session
+        #history while the window is built. The GUI only sends it commands and shows the States it
+        #publishes, which come back through the inbox. The main loop never waits for the service.
+        #Until the first State arrives the Drink, Pee and Accident buttons are disabled:
+        self.journal = None
+        self.accident_store = None
+        self.hold_store = None
+        self.recovered_events = []
+        self.model_state = None
+        self.history_loaded = False
+        self.inbox = model_service.Inbox(self.root)
+        self.model_service = model_service.ModelService(self.load_history, self._publish_state, self._publish_error)
 
 
-        #Initialize Drinker Class:
-        self.drinker = omo.Drinker()
+        #The bladder gauge frames are decoded and scaled once, after the first frame is on screen.
+        #From then on polls and resizes only swap cached images:
+        self.gauge_sprites = gauge.SpriteCache()
+        self.gauge_ready = False
+        self.first_frame_shown = False
 
 
-        #Initialize Hold Stopwatch:
-        self.hold_stopwatch = stopwatch.Stopwatch()
+        #The activity log keeps its own copy of the events, in the same columnar store as the Drinker, for the
+        #GUI thread. It is created with the first State, once omo has been imported by the model service.
+        #Pees and accidents wait in pending_activity until the model service has measured them:
+        self.activity = None
+        self.pending_activity = []
+        self.chart_samples = []
 
 
-        #Try to load hold history CSV
-        self.load_data()
+        #Initialize Hold Stopwatch, and the time the hold started for the hold history:
+        self.hold_stopwatch = stopwatch.Stopwatch()
+        self.hold_start = None
 
 
         # Initialize GUI property variables:
-        self.desperation = tk.DoubleVar()
         self.drink_amount = tk.IntVar()
         self.drink_amount.set(500)
         self.bladder_text = tk.StringVar()
@@ -117,6 +172,15 @@ class App(object):
         self.hold_time_display_control_variable = tk.StringVar() # Variable for controling GUI's the displayed hold time.
 
 
+        #Only push values to the Tk variables above when the displayed value changes:
+        self.bindings = {
+            'hold_time': bindings.Binding(self.hold_time_display_control_variable),
+            'bladder_text': bindings.Binding(self.bladder_text),
+            'eta_text': bindings.Binding(self.eta_text),
+        }
+        profiling.profiler.add_counters('Tk variable writes (pushed, suppressed)', lambda: bindings.counters(self.bindings))
+
+
         #GUI Styling:
         self.button_font = ctk.CTkFont("Arial", 12)
 
@@ -130,12 +194,19 @@ class App(object):
 
 
         #Initialize hold stopwatch:
-        self.hold_time_display_control_variable.set("00:00:00") # Initialize the hold stopwatch display.
+        self.bindings['hold_time'].set("00:00:00") # Initialize the hold stopwatch display.
         self.hold_stopwatch.start_stopwatch() # Start the hold stopwatch.
+        self.hold_start = current_time_in_minutes_float()
         
 
-        #Periodically check for GUI changes and update backend:
+        #Refresh the GUI whenever a displayed value is due to change, and straight away on restoring the window:
+        self.refresh_scheduler = refresh.RefreshScheduler(self.root, self.poll)
+        profiling.profiler.watch_drift(self.root)
+        self.root.bind("<Map>", self._on_map)
+        self.inbox.start()
+        self.model_service.start()
         self.poll()
+        startup.profile.mark("window built")
 
 
 
@@ -149,8 +220,11 @@ class App(object):
 
 
         #Set up customtkinter widgets:
-        self.bladder_bar = ctk.CTkProgressBar(self.mainframe, orientation = "vertical", variable=self.desperation, fg_color = "#ffb8bf", border_color = "#fb928e", progress_color = "#fff177")
-        self.bladder_bar.grid(column=0, row=0, rowspan=2, sticky=(tk.N, tk.S))
+        frame_color = ctk.ThemeManager.theme["CTkFrame"]["fg_color"][ctk.get_appearance_mode() == "Dark"]
+        self.bladder_gauge_label = tk.Label(self.mainframe, borderwidth = 0, highlightthickness = 0, bg = frame_color)
+        self.bladder_gauge_label.grid(column=0, row=0, rowspan=2, sticky=(tk.N, tk.S))
+        self.bladder_gauge = gauge.Gauge(self.bladder_gauge_label, self.gauge_sprites)
+        self.root.bind("<Configure>", self._fit_gauge, add = "+")
 
         self.bladder_display = ctk.CTkLabel(self.mainframe, textvariable = self.bladder_text)
         self.bladder_display.grid(column = 0, row = 2, sticky = (tk.S, tk.W))
@@ -178,9 +252,23 @@ class App(object):
         self.hold_time_display = ctk.CTkLabel(self.mainframe, textvariable = self.hold_time_display_control_variable)
         self.hold_time_display.grid(column = 4, row = 2, sticky = (tk.S, tk.E))
 
+        #The bladder chart samples the model in batches on the model service thread and appends a segment per batch:
+        self.chart_canvas = tk.Canvas(self.mainframe, height = 120, bg = frame_color, highlightthickness = 0)
+        self.chart_canvas.grid(column = 0, row = 3, columnspan = 5, sticky = (tk.W, tk.E))
+        self.bladder_chart = chart.Chart(self.chart_canvas)
+        self.chart_canvas.bind("<Configure>", lambda event: self.bladder_chart.resize(event.width, event.height))
+
+        #Only the rows on screen have widgets, so the activity log stays fast however long the session runs:
+        text_color = ctk.ThemeManager.theme["CTkLabel"]["text_color"][ctk.get_appearance_mode() == "Dark"]
+        self.activity_list = virtual_list.VirtualList(self.mainframe, [], bg = frame_color, fg = text_color)
+        self.activity_list.grid(column = 0, row = 4, columnspan = 5, sticky = (tk.W, tk.E))
+
         for child in self.mainframe.winfo_children():
             child.grid_configure(padx = 5, pady = 5)
 
+        for button in (self.drink_button, self.pee_button, self.accident_button):
+            button.configure(state = "disabled")
+
 
 
 
@@ -190,6 +278,19 @@ class App(object):
         self.root.config(menu=self.menubar)
         self.menubar.add_cascade(menu = self.menu_main, label = 'Menu')
         self.menu_main.add_command(label = 'Reset Capacity Log', command = self.reset_capacity)
+        self.menu_chart = tk.Menu(self.menubar, tearoff = 0)
+        self.menubar.add_cascade(menu = self.menu_chart, label = 'Chart')
+        for label, span in (('Whole Session', None), ('Last 4 Hours', 240.0), ('Last Hour', 60.0)):
+            self.menu_chart.add_command(label = label, command = lambda span=span: self.bladder_chart.zoom(span))
+
+        self.profiling_enabled = tk.BooleanVar(value = profiling.profiler.enabled)
+        self.cprofile_enabled = tk.BooleanVar(value = False)
+        self.menu_profiling = tk.Menu(self.menubar, tearoff = 0)
+        self.menubar.add_cascade(menu = self.menu_profiling, label = 'Profiling')
+        self.menu_profiling.add_checkbutton(label = 'Enable Profiling', variable = self.profiling_enabled, command = self.toggle_profiling)
+        self.menu_profiling.add_checkbutton(label = 'Record cProfile (slow)', variable = self.cprofile_enabled, command = self.toggle_profiling)
+        self.menu_profiling.add_command(label = 'Export Report...', command = self.export_profile)
+        self.menu_profiling.add_command(label = 'Save cProfile Dump...', command = self.export_cprofile)
 
 
 
@@ -203,6 +304,133 @@ class App(object):
 
 
 
+    def _on_map(self, event):
+        if event.widget is not self.root:
+            return
+        if not self.first_frame_shown:
+            self.first_frame_shown = True
+            self.root.after_idle(self._first_frame)
+        self.refresh_scheduler.wake()
+
+
+
+
+    def _first_frame(self):
+        startup.profile.mark("first frame")
+
+        #Try to load application icon:
+        self.root.iconbitmap('icon.ico')
+
+        self._warm_gauge(0)
+
+
+
+
+    def _warm_gauge(self, frame):
+        # One frame per callback, so the window stays responsive while the gauge is prepared:
+        self.gauge_sprites.warm_frame(frame)
+        if frame + 1 < gauge.FRAME_COUNT:
+            self.root.after(1, self._warm_gauge, frame + 1)
+        else:
+            self.gauge_ready = True
+            self._fit_gauge()
+            startup.profile.mark("gauge ready")
+            self._finish_startup()
+
+
+
+
+    def _publish_state(self, state):
+        # Model service thread: hand the State over to the main loop, and nothing else.
+        self.inbox.put(self._on_model_state, state)
+
+
+
+
+    def _publish_error(self, error):
+        # Model service thread, as above.
+        self.inbox.put(self._on_model_error, error)
+
+
+
+
+    def _publish_chart_samples(self, future):
+        # Model service thread, as above.
+        self.inbox.put(self._on_chart_samples)
+
+
+
+
+    def _on_chart_samples(self):
+        while self.chart_samples and self.chart_samples[0].done():
+            self.bladder_chart.extend(*self.chart_samples.pop(0).result())
+
+
+
+
+    def _on_model_error(self, error):
+        self.inbox.stop()
+        self.root.destroy()
+        raise error
+
+
+
+
+    def _on_model_state(self, state):
+        self.model_state = state
+        if not self.history_loaded:
+            self.history_loaded = True
+            for button in (self.drink_button, self.pee_button, self.accident_button):
+                button.configure(state = "normal")
+            startup.profile.mark("history loaded")
+            self._finish_startup()
+            import omo # Already imported by the model service thread.
+            self.activity = omo.EventLog()
+            self.activity_list.source = self.activity.view()
+            for event in self.recovered_events:
+                self.activity.insert(event)
+                self.bladder_chart.add_marker(event.time, event_kind(event))
+            self.bladder_chart.set_start(self.recovered_events[0].time if self.recovered_events else state.time, state.time)
+            self.recovered_events = []
+            self.activity_list.refresh()
+        self._drain_activity()
+        self.show(state)
+
+
+
+
+    def _drain_activity(self):
+        # Log the pees and accidents the model service has finished measuring, in the order they happened:
+        appended = False
+        while self.pending_activity and self.pending_activity[0][0].done():
+            future, t, permission = self.pending_activity.pop(0)
+            error = future.exception()
+            if error is not None:
+                log_error("Measuring the release failed, it is logged without an amount.", error)
+            self.activity.insert_release(t, future.result() if error is None else math.nan, permission)
+            self.bladder_chart.add_marker(t, 'pee' if permission else 'accident')
+            appended = True
+        if appended:
+            self.activity_list.refresh()
+
+
+
+
+    def _finish_startup(self):
+        if self.gauge_ready and self.history_loaded:
+            startup.profile.report()
+
+
+
+
+    def _fit_gauge(self, event=None):
+        # Fit the gauge to the window, leaving room for the row of text underneath:
+        if event is None or event.widget is self.root:
+            self.bladder_gauge.fit(self.root.winfo_height() - self.bladder_display.winfo_reqheight() - 30)
+
+
+
+
     def _on_click(self, button):
         """Briefly disables a CustomTkinter button to avoid accidental double-clicking."""
         button.configure(state="disabled")  # Disable the button
@@ -211,98 +439,277 @@ class App(object):
 
 
 
+    @profiling.profiler.timed("App.drink")
     def drink(self):
-        self.drinker.add_drink(current_time_in_minutes_float(), self.drink_amount.get())
+        t = current_time_in_minutes_float()
+        self.model_service.add_drink(t, self.drink_amount.get())
+        self.activity.insert_drink(t, self.drink_amount.get())
+        self.activity_list.refresh()
+        self.bladder_chart.add_marker(t, 'drink')
         self._on_click(self.drink_button)
+        self.refresh_scheduler.wake()
+
+
+
+
+    def _end_hold(self, t, outcome):
+        # Record the hold in the hold history, then start the next one. Queued ahead of the release,
+        # so the model service still sees the full bladder:
+        future = self.model_service.submit(self._record_hold, self.hold_start, t,
+                                           self.hold_stopwatch.get_elapsed_time(), outcome)
+        self.pending_activity.append((future, t, outcome == 'pee'))
+        self.hold_stopwatch.reset_stopwatch()
+        self.hold_stopwatch.start_stopwatch()
+        self.hold_start = t
 
 
 
 
+    @profiling.profiler.timed("App.accident")
     def accident(self):
-        # Store Urination and the fact that permission was allowed not in CSV:
-        self.drinker.add_release(current_time_in_minutes_float(), False)
+        t = current_time_in_minutes_float()
 
+        # Record and reset the hold:
+        self._end_hold(t, 'accident')
 
-        # Reset Hold Timer:
-        self.hold_stopwatch.reset_stopwatch()
-        self.hold_stopwatch.start_stopwatch()
+
+        # Store Urination and the fact that permission was allowed not in CSV:
+        self.model_service.add_release(t, False)
 
 
         #Briefly disable the I can't hold it button to avoid accidental double clicking:
         self._on_click(self.accident_button)
+        self.refresh_scheduler.wake()
 
 
 
 
+    @profiling.profiler.timed("App.pee")
     def pee(self):
-        # Store Urination and the fact that permission was allowed in CSV:
-        self.drinker.add_release(current_time_in_minutes_float(), True)
+        t = current_time_in_minutes_float()
 
+        #Record and reset the hold:
+        self._end_hold(t, 'pee')
 
-        #Reset hold timer:
-        self.hold_stopwatch.reset_stopwatch()
-        self.hold_stopwatch.start_stopwatch()
+
+        # Store Urination and the fact that permission was allowed in CSV:
+        self.model_service.add_release(t, True)
 
 
         # Briefly disable the button to prevent accidental double clicking:
         self._on_click(self.pee_button)
+        self.refresh_scheduler.wake()
 
 
 
 
+    @profiling.profiler.timed("App.poll")
     def poll(self):
         t = current_time_in_minutes_float()
 
-        self.hold_time_display_control_variable.set(self.hold_stopwatch.output_elapsed_time())
+        self.bindings['hold_time'].set(self.hold_stopwatch.output_elapsed_time())
+
+        # Still loading the history:
+        if self.model_state is None:
+            self.bindings['bladder_text'].set("Loading...")
+
+        # Until the model service publishes the State at t, fall back to the hold time or the safety net:
+        self.refresh_scheduler.schedule(self.hold_stopwatch.seconds_until_next_change())
+        self.model_service.refresh(t)
+
+
 
-        self.desperation.set(self.drinker.desperation(t))
 
-        self.bladder_text.set(str(round(self.drinker.bladder(t))) + " mL/" + str(round(self.drinker.capacity)) + " mL")
+    @profiling.profiler.timed("App.show")
+    def show(self, state):
+        # Display a State published by the model service, then sleep until something on screen changes:
+        t = state.time
+
+        self.bladder_gauge.set(state.desperation)
+
+        # Ask for the chart samples due by now, they are drawn when the model service has worked them out:
+        self.bladder_chart.set_capacity(state.capacity)
+        times = self.bladder_chart.due(t)
+        if times:
+            future = self.model_service.submit(self._sample_chart, times)
+            self.chart_samples.append(future)
+            future.add_done_callback(self._publish_chart_samples)
+
+        self.bindings['bladder_text'].set(str(round(state.bladder)) + " mL/" + str(round(state.capacity)) + " mL")
         
-        if self.drinker.eta:
-            eta = math.ceil(self.drinker.eta - t)
+        if state.eta:
+            eta = math.ceil(state.eta - t)
             if eta > 1:
-                self.eta_text.set("Potty emergency in: " + str(eta) + " minutes")
+                self.bindings['eta_text'].set("Potty emergency in: " + str(eta) + " minutes")
             elif eta == 1:
-                self.eta_text.set("Potty emergency in: " + str(eta) + " minute")
+                self.bindings['eta_text'].set("Potty emergency in: " + str(eta) + " minute")
             else:
-                self.eta_text.set("Potty emergency now!")
+                self.bindings['eta_text'].set("Potty emergency now!")
         else:
-            self.eta_text.set("")
-        
-        self.root.after(500, self.poll)
+            self.bindings['eta_text'].set("")
+
+        # Sleep until the next value on screen changes, or the safety net while minimized:
+        if self.root.state() in ("iconic", "withdrawn"):
+            self.refresh_scheduler.schedule()
+        else:
+            self.refresh_scheduler.schedule(
+                self.hold_stopwatch.seconds_until_next_change(),
+                refresh.seconds_until_eta_text_changes(state.eta, t),
+                refresh.seconds_until_volume(state, refresh.next_rounded_volume(state.bladder), t),
+                refresh.seconds_until_volume(state, refresh.next_level_volume(
+                    state.desperation, state.capacity, self.bladder_gauge.levels), t))
+
+
+
 
+    def load_history(self):
+        # Runs on the model service thread and must not touch any Tk object. The journal and accident
+        # store are only used on that thread too, until the service is stopped.
+        import accident_store
+        import journal
+        import hold_store
+        import omo
+        profiling.profiler.instrument(omo.Drinker, PROFILED_DRINKER_METHODS)
+        accident_log, accident_store_path, session_journal, hold_store_path = save_paths()
 
+        #Initialize Drinker Class, recovering the session from its journal if the app did not exit cleanly:
+        drinker = journal.rebuild(session_journal)
+        self.journal = journal.Journal(session_journal)
+        drinker.journal = self.journal
+        self.recovered_events = list(drinker.history) # Handed to the activity log by the first State.
 
+        #Try to load the accident log:
+        self.accident_store = accident_store.AccidentStore(accident_store_path)
+        accident_store.migrate_csv(accident_log, accident_store_path)
+        drinker.old_accidents = self.accident_store.amounts()
 
-    def load_data(self):
-        if os.path.exists(accident_log):
-            with open(accident_log, 'r', newline='') as f:
-                reader = csv.reader(f)
-                self.drinker.old_accidents = [float(row[0]) for row in reader]
+        #Open the hold history, its writer thread commits in the background:
+        self.hold_store = hold_store.HoldStore(hold_store_path)
+        return drinker
 
 
 
 
-    def save_data(self):
-        os.makedirs(os.path.dirname(accident_log), exist_ok=True)
-        with open(accident_log, 'a', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerows([accident.amount] for accident in self.drinker.accidents)
+    def _sample_chart(self, drinker, times):
+        # Runs on the model service thread, see submit(). Times the drinker has compacted away are skipped:
+        compacted_until = drinker.compacted_until
+        if compacted_until is not None:
+            times = [t for t in times if t >= compacted_until]
+        return times, drinker.bladder_curve(times).bladder
+
+
+
+
+    def _record_hold(self, drinker, start, end, duration, outcome):
+        # Runs on the model service thread, see submit(). The bladder only fills between releases,
+        # so its peak during the hold is what it holds at the end, and what is about to be released:
+        # A hold the hold history fails to record is logged here, the release is still measured:
+        import hold_store
+        peak = drinker.bladder(end)
+        try:
+            self.hold_store.record(start, end, duration, peak, outcome)
+        except hold_store.HoldStoreError as error:
+            log_error("Recording the hold failed.", error)
+        return peak
+
+
+
+
+    def save_data(self, drinker):
+        # Runs on the model service thread, see submit().
+        # Appending unmaps the store, so hand the drinker a plain copy of the old accidents first:
+        drinker.old_accidents = list(drinker.old_accidents)
+        self.accident_store.append((accident.time, accident.amount) for accident in drinker.accidents)
+
+
+
+
+    def _reset_capacity(self, drinker):
+        # Runs on the model service thread, see submit().
+        drinker.old_accidents = []
+        self.accident_store.reset()
+
+
+
+
+    def close(self):
+        # After the main loop: save, let the model service finish, then close the journal.
+        # Nothing is published to the main loop any more, so the inbox is left undrained.
+        try:
+            self.inbox.stop()
+        except tk.TclError:
+            pass # The window is already destroyed, along with the binding.
+        # Queued even while the history is still loading, the worker saves once it has loaded:
+        saved = self.model_service.submit(self.save_data)
+        self.model_service.stop()
+        # Done, as the worker finished the commands queued before stop(), unless loading failed. The journal
+        # is only deleted after a completed save, otherwise the next start recovers the session from it:
+        if self.journal is not None:
+            self.journal.close(discard=saved.done() and saved.exception() is None)
+        if self.hold_store is not None:
+            self.hold_store.close()
+        profiling.profiler.close()
+        if saved.done():
+            saved.result() # Re-raises a failed save.
+
+
+
+
+    def toggle_profiling(self):
+        # Profiling menu: cProfile is only recorded while profiling is enabled as well.
+        if self.profiling_enabled.get():
+            profiling.profiler.enable()
+            if self.cprofile_enabled.get():
+                profiling.profiler.start_cprofile()
+            else:
+                profiling.profiler.stop_cprofile()
+        else:
+            profiling.profiler.disable()
+
+
+
+
+    def export_profile(self):
+        from tkinter import filedialog
+        path = filedialog.asksaveasfilename(title = "Export Profile Report", defaultextension = ".json",
+                                            filetypes = [("JSON", "*.json")], initialfile = "omo_profile.json")
+        if path:
+            profiling.profiler.write_report(path)
+
+
+
+
+    def export_cprofile(self):
+        from tkinter import filedialog, messagebox
+        path = filedialog.asksaveasfilename(title = "Save cProfile Dump", defaultextension = ".prof",
+                                            filetypes = [("cProfile", "*.prof")], initialfile = "omo.prof")
+        if path and not profiling.profiler.dump_cprofile(path):
+            messagebox.showinfo("No cProfile", "Enable Record cProfile in the Profiling menu first.")
 
 
 
 
     def reset_capacity(self):
+        from tkinter import messagebox
         response = messagebox.askyesno("Confirm Reset", "Are you sure you want to reset the capacity log?")
 
         if response:  # User clicked "Yes".
-            if os.path.exists(accident_log):
-                os.remove(accident_log)
-            self.drinker.old_accidents = []
-            tk.messagebox.showinfo("Reset Successful", "Capacity has been reset.")
+            # Reported once the model service has reset it, the State published after it shows the new capacity:
+            future = self.model_service.submit(self._reset_capacity)
+            future.add_done_callback(lambda future: self.inbox.put(self._on_capacity_reset, future))
+            self.model_service.refresh(current_time_in_minutes_float())
         else:  # User clicked "No"
-            tk.messagebox.showinfo("Reset Canceled", "Capacity reset was canceled.")
+            messagebox.showinfo("Reset Canceled", "Capacity reset was canceled.")
+
+
+
+
+    def _on_capacity_reset(self, future):
+        from tkinter import messagebox
+        if future.exception() is not None:
+            messagebox.showerror("Reset Failed", "The capacity log could not be reset: " + str(future.exception()))
+        else:
+            messagebox.showinfo("Reset Successful", "Capacity has been reset.")
 
 #----------------------------------------------------------------------------------------------------------------------
 
@@ -315,5 +722,5 @@ class App(object):
 if __name__ == "__main__":
     app = App()
     app.root.mainloop()
-    app.save_data()
+    app.close()
 #----------------------------
@@ -0,0 +1,175 @@
+#----------------------------
+# File Headers:
+#----------------------------
+# Shebang:
+#!/usr/bin/env python
+
+
+# Encoding:
+# -*- coding: utf-8 -*-
+
+
+# Docstring:
+"""
+Filename: batch_writer.py
+Authors: Tsukiko
+Date: 18/10/2026
+Version: 1.0.0
+Description:
+    A background writer thread that commits items in groups, shared by the session journal
+    and the hold history. Items are queued without waiting on the disk. The writer gathers
+    them for up to commit_interval seconds and hands each group to a write function, such as
+    one fsync or one SQLite transaction per group. Any exception from a write is kept and
+    re-raised on the next call from another thread, as the error type of the store using the
+    writer, and the writer carries on with the next group. Should the thread die all the same,
+    put() and flush() raise rather than wait for it.
+
+License: MIT License
+Contact: tsukiko1701@gmail.com
+Dependencies: queue, threading, time
+"""
+
+
+# Dunders:
+__author__ = "Tsukiko"
+__copyright__ = "Copyright (c) 2025 Tsukiko-030"
+__credits__ = ["Tsukiko"]
+__license__ = "The MIT License (MIT)"
+__version__ = "1.0.0"
+__maintainer__ = "Tsukiko"
+__email__ = "tsukiko1701@gmail.com"
+__status__ = "Production"
+#----------------------------
+
+
+
+
+#----------------------------
+# Import Statements:
+#----------------------------
+import queue
+import threading
+import time
+#----------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# BatchWriter Class:
+#----------------------------------------------------------------------------------------------------------------------
+class BatchWriter():
+    # Constructor:
+    def __init__(self, write, commit_interval, name, error_type, what):
+        """
+        Initializes the BatchWriter Class and starts its writer thread.
+        :param write: Called on the writer thread with a list of queued items to commit together.
+        :param commit_interval: Seconds the writer waits to gather items into one write.
+        :param name: Name of the writer thread.
+        :param error_type: Exception type failed writes are re-raised as on the caller's thread.
+        :param what: What is written, for the error message, e.g. "the journal".
+        """
+        self._write = write
+        self._commit_interval = commit_interval
+        self._error_type = error_type
+        self._what = what
+        self._queue = queue.Queue()
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+
+
+
+    # Private Methods:
+    def _run(self):
+        """Writer thread: gathers items for up to commit_interval, then writes them in one go."""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self._commit_interval
+            while batch[-1] is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            items = [item for item in batch if item is not None]
+            try:
+                if items:
+                    self._write(items)
+            except Exception as error:
+                self._error = error
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+            if batch[-1] is None:
+                return
+
+
+
+
+    # Public Methods:
+    def raise_error(self):
+        """Re-raises a failure from the writer thread on the calling thread."""
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise self._error_type("Writing " + self._what + " failed: " + str(error)) from error
+        if not self._thread.is_alive() and self._queue.unfinished_tasks:
+            raise self._error_type("Writing " + self._what + " failed: the writer thread stopped with "
+                                   + str(self._queue.unfinished_tasks) + " items unwritten.")
+
+
+
+
+    def put(self, item):
+        """Queues item, after re-raising any earlier failure. Never blocks on the disk."""
+        self.raise_error()
+        if not self._thread.is_alive():
+            raise self._error_type("Writing " + self._what + " failed: the writer thread has stopped.")
+        self._queue.put(item)
+
+
+
+
+    def flush(self):
+        """Blocks until every queued item has been written, or the writer thread has stopped."""
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks and self._thread.is_alive():
+                self._queue.all_tasks_done.wait(0.1)
+        self.raise_error()
+
+
+
+
+    def stop(self):
+        """Writes any queued items and stops the writer thread. Call raise_error() afterwards to see failures."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#--------------------------------------------------------------------------------------------------
+# Ideas for Improvements:
+#--------------------------------------------------------------------------------------------------
+"""
+* Commit straight away once a group reaches a size limit, rather than waiting out the interval.
+"""
+#--------------------------------------------------------------------------------------------------
+
+
+
+
+#--------------------------------------------------------------------------------------------------
+# References:
+#--------------------------------------------------------------------------------------------------
+"""
+* https://www.postgresql.org/docs/current/wal-async-commit.html
+"""
+#--------------------------------------------------------------------------------------------------
@@ -0,0 +1,282 @@
+#----------------------------
+# File Headers:
+#----------------------------
+# Shebang:
+#!/usr/bin/env python
+
+
+# Encoding:
+# -*- coding: utf-8 -*-
+
+
+# Docstring:
+"""
+Filename: benchmark.py
+Authors: Tsukiko
+Date: 18/10/2026
+Version: 1.0.0
+Description:
+    Benchmarks the hot paths of omo.py, stopwatch.py and timer.py. Each Drinker operation
+    and a simulated App.poll tick is timed against histories from 10 to 1,000,000 events, so
+    the results show how the costs scale. Results are written as JSON, so runs from different
+    commits can be compared, and the run fails if the cost of a poll tick grows noticeably
+    with the length of the history, as it should be constant.
+
+    Usage:
+        python benchmark.py --output results.json
+        python benchmark.py --compare baseline.json
+
+License: MIT License
+Contact: tsukiko1701@gmail.com
+Dependencies: argparse, json, math, platform, sys, time, omo.py, replay.py, stopwatch.py, timer.py
+"""
+
+
+# Dunders:
+__author__ = "Tsukiko"
+__copyright__ = "Copyright (c) 2025 Tsukiko-030"
+__credits__ = ["Tsukiko"]
+__license__ = "The MIT License (MIT)"
+__version__ = "1.0.0"
+__maintainer__ = "Tsukiko"
+__email__ = "tsukiko1701@gmail.com"
+__status__ = "Production"
+#----------------------------
+
+
+
+
+#----------------------------
+# Import Statements:
+#----------------------------
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+import omo
+import replay
+import stopwatch
+import timer
+#----------------------------
+
+
+
+
+#--------------------------------------
+# Exterior Variables:
+#--------------------------------------
+# History sizes, in events:
+SIZES = (10, 100, 1000, 10**4, 10**5, 10**6)
+# Calls per timing and timings per measurement, the fastest timing is kept:
+CALLS = 1000
+REPEATS = 5
+# A poll tick is meant to cost the same however long the history, one whose cost grows
+# faster than size ** MAX_SLOPE fails the run. Allows for cache effects at the largest sizes:
+MAX_SLOPE = 0.25
+# Slowdown against a baseline, as a fraction, that counts as a regression:
+TOLERANCE = 0.25
+#--------------------------------------
+
+
+
+
+#--------------------------------------
+# Exterior Functions:
+#--------------------------------------
+def _best_ns_per_call(function, calls=CALLS, repeats=REPEATS):
+    """Returns the fastest of repeats timings of calls calls to function(i), in ns per call."""
+    best = math.inf
+    for repeat in range(repeats):
+        start = time.perf_counter_ns()
+        for i in range(calls):
+            function(i)
+        best = min(best, time.perf_counter_ns() - start)
+    return best / calls
+
+
+
+
+def _drinker(size):
+    """Returns a Drinker whose history holds size synthetic events, and the time of the last one."""
+    drinker = omo.Drinker()
+    # omo.bladder_past queries the whole history, so none of it may be compacted away
+    drinker.compaction_horizon = None
+    drinker.old_accidents = [600.0, 700.0]
+    # Replayed rather than loaded, so the model works out what each release voids, as in a real session:
+    end = None
+    for frame in replay.replay(replay.synthetic_session(size), drinker):
+        end = frame.event.time
+    return drinker, end
+
+
+
+
+def poll_tick(drinker, hold_stopwatch, t):
+    """Does the work of one App.poll tick, minus the Tk variable writes."""
+    hold_time = hold_stopwatch.output_elapsed_time()
+    snapshot = drinker.snapshot(t)
+    bladder_text = str(round(snapshot.bladder)) + " mL/" + str(round(snapshot.capacity)) + " mL"
+    if snapshot.eta:
+        eta = math.ceil(snapshot.eta - t)
+        if eta > 1:
+            eta_text = "Potty emergency in: " + str(eta) + " minutes"
+        elif eta == 1:
+            eta_text = "Potty emergency in: " + str(eta) + " minute"
+        else:
+            eta_text = "Potty emergency now!"
+    else:
+        eta_text = ""
+    return hold_time, snapshot.desperation, bladder_text, eta_text
+
+
+
+
+def measure_drinker(size):
+    """Returns {operation: ns per call} for a history of size events."""
+    drinker, end = _drinker(size)
+    hold_stopwatch = stopwatch.Stopwatch()
+    hold_stopwatch.start_stopwatch()
+    now = end + 1.0
+    results = {
+        'omo.bladder': _best_ns_per_call(lambda i: drinker.bladder(now)),
+        'omo.bladder_past': _best_ns_per_call(lambda i: drinker.bladder(end * (i % 100) / 100.0)),
+        'omo.desperation': _best_ns_per_call(lambda i: drinker.desperation(now)),
+        'omo.capacity': _best_ns_per_call(lambda i: drinker.capacity),
+        'omo.eta': _best_ns_per_call(lambda i: drinker.eta),
+        'app.poll_tick': _best_ns_per_call(lambda i: poll_tick(drinker, hold_stopwatch, now)),
+    }
+
+    # Adding events mutates the drinker, so each timing continues where the last left off:
+    clock = [now]
+    def add_drink(i):
+        clock[0] += 0.01
+        drinker.add_drink(clock[0], 250)
+    def add_release(i):
+        clock[0] += 0.01
+        drinker.add_release(clock[0], True)
+    results['omo.add_drink'] = _best_ns_per_call(add_drink)
+    results['omo.add_release'] = _best_ns_per_call(add_release)
+    return results
+
+
+
+
+def measure_rates():
+    """Returns {operation: calls per second} for the stopwatch and timer queries."""
+    hold_stopwatch = stopwatch.Stopwatch()
+    hold_stopwatch.start_stopwatch()
+    countdown = timer.Timer(3600)
+    countdown.start_countdown()
+    return {
+        'stopwatch.output_elapsed_time': 1e9 / _best_ns_per_call(lambda i: hold_stopwatch.output_elapsed_time()),
+        'timer.get_remaining_time': 1e9 / _best_ns_per_call(lambda i: countdown.get_remaining_time()),
+    }
+
+
+
+
+def run(sizes=SIZES, out=sys.stdout):
+    """Runs the whole suite and returns the results as a JSON-ready dict."""
+    drinker_results = {}
+    for size in sizes:
+        for operation, ns in measure_drinker(size).items():
+            drinker_results.setdefault(operation, {})[str(size)] = ns
+        out.write(f"{size:>9} events: poll tick {drinker_results['app.poll_tick'][str(size)]:10.0f} ns\n")
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'ns_per_call': drinker_results,
+        'calls_per_second': measure_rates(),
+    }
+
+
+
+
+def scaling_slope(by_size):
+    """Returns the slope of log(cost) against log(size), fitted by least squares. 0 is constant cost, 1 linear."""
+    points = [(math.log(int(size)), math.log(ns)) for size, ns in by_size.items()]
+    if len(points) < 2:
+        return 0.0
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    spread = sum((x - mean_x) ** 2 for x, _ in points)
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / spread if spread else 0.0
+
+
+
+
+def check(results, baseline=None, max_slope=MAX_SLOPE, tolerance=TOLERANCE):
+    """Returns a list of failures: super-linear poll tick scaling, and regressions against baseline."""
+    failures = []
+    slope = scaling_slope(results['ns_per_call']['app.poll_tick'])
+    if slope > max_slope:
+        failures.append(f"app.poll_tick grows as size ** {slope:.2f}, more than size ** {max_slope}")
+
+    if baseline is not None:
+        for operation, by_size in results['ns_per_call'].items():
+            for size, ns in by_size.items():
+                old = baseline.get('ns_per_call', {}).get(operation, {}).get(size)
+                if old and ns > old * (1 + tolerance):
+                    failures.append(f"{operation} at {size} events: {old:.0f} ns -> {ns:.0f} ns")
+        for operation, rate in results['calls_per_second'].items():
+            old = baseline.get('calls_per_second', {}).get(operation)
+            if old and rate < old / (1 + tolerance):
+                failures.append(f"{operation}: {old:.0f} -> {rate:.0f} calls/sec")
+    return failures
+#--------------------------------------
+
+
+
+
+#--------------------------------------------------------------------------------------------------
+# Ideas for Improvements:
+#--------------------------------------------------------------------------------------------------
+"""
+* Run in CI on every commit and keep the JSON results as build artifacts.
+"""
+#--------------------------------------------------------------------------------------------------
+
+
+
+
+#--------------------------------------------------------------------------------------------------
+# References:
+#--------------------------------------------------------------------------------------------------
+"""
+* https://docs.python.org/3/library/time.html#time.perf_counter_ns
+"""
+#--------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------
+# Main Loop
+#----------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Omo Tracker hot paths.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, help="history sizes, in events")
+    parser.add_argument('--output', help="write the results to this JSON file")
+    parser.add_argument('--compare', help="JSON results of an earlier run to check for regressions")
+    parser.add_argument('--max-slope', type=float, default=MAX_SLOPE)
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE)
+    args = parser.parse_args()
+
+    results = run(args.sizes)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    failures = check(results, baseline, args.max_slope, args.tolerance)
+    for failure in failures:
+        print("FAIL: " + failure)
+    sys.exit(1 if failures else 0)
+#----------------------------
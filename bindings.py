@@ -0,0 +1,149 @@
+#----------------------------
+# File Headers:
+#----------------------------
+# Shebang:
+#!/usr/bin/env python
+
+
+# Encoding:
+# -*- coding: utf-8 -*-
+
+
+# Docstring:
+"""
+Filename: bindings.py
+Authors: Tsukiko
+Date: 18/10/2026
+Version: 1.0.0
+Description:
+    A thin layer between the model and the Tk variables the GUI displays. Every .set() on a
+    Tk variable is a round trip into Tcl and redraws the CustomTkinter widgets tied to it, even
+    if the value has not changed. A Binding remembers the last value it pushed, rounds floats
+    to the steps the widget can actually show, such as one pixel of a progress bar, and skips
+    updates that would not change anything. It also counts the updates it pushed and skipped.
+
+License: MIT License
+Contact: tsukiko1701@gmail.com
+Dependencies: None
+"""
+
+
+# Dunders:
+__author__ = "Tsukiko"
+__copyright__ = "Copyright (c) 2025 Tsukiko-030"
+__credits__ = ["Tsukiko"]
+__license__ = "The MIT License (MIT)"
+__version__ = "1.0.0"
+__maintainer__ = "Tsukiko"
+__email__ = "tsukiko1701@gmail.com"
+__status__ = "Production"
+#----------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Binding Class:
+#----------------------------------------------------------------------------------------------------------------------
+class Binding():
+    # Constructor:
+    def __init__(self, variable, levels=None):
+        """
+        Initializes the Binding Class.
+        :param variable: Tk variable to push values into, such as a tk.StringVar or tk.DoubleVar.
+        :param levels: For fractions between 0 and 1, the number of steps the widget can show,
+                       e.g. the height in pixels of a progress bar. None pushes values as they are.
+        """
+        self.variable = variable
+        self.levels = levels
+        self.pushed = 0
+        self.suppressed = 0
+        self._value = None
+        self._stale = True
+
+
+
+
+    # Private Methods:
+    def _quantize(self, value):
+        """Rounds value to the nearest step the widget can show."""
+        if self.levels:
+            return round(value * self.levels) / self.levels
+        return value
+
+
+
+
+    # Public Methods:
+    def set(self, value):
+        """Pushes value to the variable unless the widget already shows it. Returns True if it was pushed."""
+        value = self._quantize(value)
+        if not self._stale and value == self._value:
+            self.suppressed += 1
+            return False
+
+        self.variable.set(value)
+        self._value = value
+        self._stale = False
+        self.pushed += 1
+        return True
+
+
+
+
+    def get(self):
+        """Returns the last value pushed, or None if nothing has been pushed yet."""
+        return self._value
+
+
+
+
+    def invalidate(self):
+        """Forces the next set() through, for instance after the variable was set elsewhere."""
+        self._stale = True
+
+
+
+
+    def set_levels(self, levels):
+        """Changes the number of steps the widget can show, e.g. after it was resized."""
+        if levels != self.levels:
+            self.levels = levels
+            self.invalidate()
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#--------------------------------------
+# Exterior Functions:
+#--------------------------------------
+def counters(bindings):
+    """Returns {name: (pushed, suppressed)} for a dict of named Bindings, plus their 'total'."""
+    result = {name: (binding.pushed, binding.suppressed) for name, binding in bindings.items()}
+    result['total'] = (sum(pushed for pushed, _ in result.values()),
+                       sum(suppressed for _, suppressed in result.values()))
+    return result
+#--------------------------------------
+
+
+
+
+#--------------------------------------------------------------------------------------------------
+# Ideas for Improvements:
+#--------------------------------------------------------------------------------------------------
+"""
+* Bind widget options such as colours as well as variables, for the desperation scale colours in Ideas.md.
+"""
+#--------------------------------------------------------------------------------------------------
+
+
+
+
+#--------------------------------------------------------------------------------------------------
+# References:
+#--------------------------------------------------------------------------------------------------
+"""
+* https://tkdocs.com/tutorial/widgets.html#label
+"""
+#--------------------------------------------------------------------------------------------------
@@ -0,0 +1,380 @@
+#----------------------------
+# File Headers:
+#----------------------------
+# Shebang:
+#!/usr/bin/env python
+
+
+# Encoding:
+# -*- coding: utf-8 -*-
+
+
+# Docstring:
+"""
+Filename: chart.py
+Authors: Tsukiko
+Date: 18/10/2026
+Version: 1.0.0
+Description:
+    A live chart of the bladder over the session, with the capacity line and a marker for
+    every drink, pee and accident, drawn on a Tk canvas.
+
+    The chart asks for samples of the model in batches, every SAMPLE_INTERVAL since the last
+    batch, and the app answers them with Drinker.bladder_curve() on the model service thread.
+    Each new batch is drawn as one short line segment appended to the canvas, downsampled to
+    the pixels it covers. Only a resize, a zoom, the session outgrowing the time axis or the
+    bladder outgrowing the volume axis re-lays the chart out, which downsamples every sample
+    in view to the canvas width with Largest-Triangle-Three-Buckets (LTTB).
+
+    Times are in minutes, like omo.py, and volumes in mL.
+
+License: MIT License
+Contact: tsukiko1701@gmail.com
+Dependencies: array, bisect, math
+"""
+
+
+# Dunders:
+__author__ = "Tsukiko"
+__copyright__ = "Copyright (c) 2025 Tsukiko-030"
+__credits__ = ["Tsukiko"]
+__license__ = "The MIT License (MIT)"
+__version__ = "1.0.0"
+__maintainer__ = "Tsukiko"
+__email__ = "tsukiko1701@gmail.com"
+__status__ = "Production"
+#----------------------------
+
+
+
+
+#----------------------------
+# Import Statements:
+#----------------------------
+from array import array
+import bisect
+import math
+#----------------------------
+
+
+
+
+#--------------------------------------
+# Exterior Variables:
+#--------------------------------------
+SAMPLE_INTERVAL = 5 / 60.0 # Minutes between samples, a day is 17,280 of them.
+INITIAL_SPAN = 60.0 # Minutes shown at first, doubled whenever the session outgrows it.
+HEADROOM = 1.1 # The volume axis reaches this much above the capacity or the fullest bladder.
+MAX_SEGMENTS = 64 # Appended segments are merged into one canvas item once there are this many.
+PAD = 2 # Pixels kept clear around the plot.
+COLORS = {'bladder': "#fb928e", 'capacity': "#fff177", 'drink': "#ffb8bf", 'pee': "#00ff00", 'accident': "#ff0000"}
+#--------------------------------------
+
+
+
+
+#--------------------------------------
+# Exterior Functions:
+#--------------------------------------
+def lttb(xs, ys, threshold):
+    """
+    Downsamples the points (xs, ys), sorted by x, to threshold points with Largest-Triangle-Three-Buckets:
+    the first and last points are kept, and from each bucket in between the point forming the largest
+    triangle with the point kept before it and the average of the next bucket. Returns (xs, ys) lists.
+    """
+    n = len(xs)
+    if threshold >= n:
+        return list(xs), list(ys)
+    if threshold < 3:
+        return ([xs[0], xs[-1]], [ys[0], ys[-1]]) if n > 1 else (list(xs), list(ys))
+
+    every = (n - 2) / (threshold - 2)
+    kept = 0
+    out_x = [xs[0]]
+    out_y = [ys[0]]
+    for i in range(threshold - 2):
+        # Average of the next bucket, the last point standing in for the bucket after the final one:
+        next_start = int((i + 1) * every) + 1
+        next_stop = min(int((i + 2) * every) + 1, n)
+        count = next_stop - next_start
+        average_x = sum(xs[next_start:next_stop]) / count
+        average_y = sum(ys[next_start:next_stop]) / count
+
+        ax = xs[kept]
+        ay = ys[kept]
+        largest = -1.0
+        for j in range(int(i * every) + 1, next_start):
+            area = abs((ax - average_x) * (ys[j] - ay) - (ax - xs[j]) * (average_y - ay))
+            if area > largest:
+                largest = area
+                chosen = j
+        out_x.append(xs[chosen])
+        out_y.append(ys[chosen])
+        kept = chosen
+    out_x.append(xs[-1])
+    out_y.append(ys[-1])
+    return out_x, out_y
+#--------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Chart Class:
+#----------------------------------------------------------------------------------------------------------------------
+class Chart():
+    # Constructor:
+    def __init__(self, canvas, span=None, sample_interval=SAMPLE_INTERVAL):
+        """
+        Initializes the Chart Class.
+        :param canvas: tk.Canvas to draw on. Call resize() from its <Configure> binding.
+        :param span: Minutes in view, or None for the whole session, see zoom().
+        """
+        self.canvas = canvas
+        self.span = span
+        self.sample_interval = sample_interval
+        self.width = 0
+        self.height = 0
+        self.start = None
+        self.capacity = None
+        self.times = array('d')
+        self.volumes = array('d')
+        self.marker_times = array('d')
+        self.marker_kinds = []
+        self._requested_until = None
+        self._x0 = self._x1 = 0.0
+        self._y_max = 0.0
+        self._peak = 0.0
+        self._drawn = 0
+        self._segments = []
+        self.layouts = 0
+        self.appends = 0
+
+
+
+
+    # Private Methods:
+    def _x(self, t):
+        return PAD + (t - self._x0) / (self._x1 - self._x0) * (self.width - 2 * PAD)
+
+
+
+
+    def _y(self, volume):
+        return self.height - PAD - volume / self._y_max * (self.height - 2 * PAD)
+
+
+
+
+    def _visible(self):
+        return self.start is not None and self.width > 2 * PAD and self.height > 2 * PAD
+
+
+
+
+    def _fit_time(self, now):
+        """Moves the time axis so now fits. Returns True if it moved."""
+        if self._x0 < self._x1 and now <= self._x1:
+            return False
+        if self.span is None:
+            # Whole session: double the axis until it reaches now
+            span = max(self._x1 - self._x0, INITIAL_SPAN)
+            while self.start + span < now:
+                span *= 2
+            self._x0, self._x1 = self.start, self.start + span
+        else:
+            # Fixed span: jump forward, leaving the later half of the axis free
+            self._x0 = max(self.start, now - self.span / 2)
+            self._x1 = self._x0 + self.span
+        return True
+
+
+
+
+    def _fit_volume(self, rescale=False):
+        """Grows the volume axis to fit the capacity and the fullest bladder, or fits it exactly if rescale.
+        Returns True if it changed."""
+        y_max = max(self.capacity or 0.0, self._peak, 1.0) * HEADROOM
+        if y_max > self._y_max or (rescale and y_max != self._y_max):
+            self._y_max = y_max
+            return True
+        return False
+
+
+
+
+    def _line(self, xs, ys):
+        coords = []
+        for t, volume in zip(xs, ys):
+            coords += (self._x(t), self._y(volume))
+        return self.canvas.create_line(*coords, fill=COLORS['bladder'], width=2, tags=('bladder',))
+
+
+
+
+    def _marker(self, t, kind):
+        x = self._x(t)
+        self.canvas.create_line(x, PAD, x, self.height - PAD, fill=COLORS[kind], tags=('marker',))
+
+
+
+
+    def _merge_segments(self):
+        """Replaces the appended segments with a single canvas item, so their number stays bounded."""
+        coords = []
+        for item in self._segments:
+            points = self.canvas.coords(item)
+            coords += points[2:] if coords else points
+            self.canvas.delete(item)
+        self._segments = [self.canvas.create_line(*coords, fill=COLORS['bladder'], width=2, tags=('bladder',))]
+
+
+
+
+    # Public Methods:
+    def set_start(self, start, now=None):
+        """Starts the session at start, in minutes. now defaults to start."""
+        self.start = start
+        self._requested_until = start - self.sample_interval
+        self._x0 = self._x1 = 0.0
+        self._fit_time(start if now is None else now)
+        self._fit_volume()
+        self.layout()
+
+
+
+
+    def set_capacity(self, capacity):
+        """Moves the capacity line, re-laying the chart out if the capacity changed."""
+        if capacity != self.capacity:
+            self.capacity = capacity
+            self._fit_volume(rescale=True)
+            self.layout()
+
+
+
+
+    def resize(self, width, height):
+        """Fits the chart to a canvas of width by height pixels."""
+        if (width, height) != (self.width, self.height):
+            self.width, self.height = width, height
+            self.layout()
+
+
+
+
+    def zoom(self, span):
+        """Shows the last span minutes, or the whole session if span is None."""
+        self.span = span
+        if self.start is not None:
+            self._x0 = self._x1 = 0.0
+            self._fit_time(self.times[-1] if self.times else self.start)
+        self.layout()
+
+
+
+
+    def due(self, now):
+        """Returns the times to sample next, a batch up to now, or [] if no sample is due yet."""
+        if self.start is None:
+            return []
+        count = math.floor((now - self._requested_until) / self.sample_interval)
+        if count <= 0:
+            return []
+        first = self._requested_until + self.sample_interval
+        times = [first + i * self.sample_interval for i in range(count)]
+        self._requested_until = times[-1]
+        return times
+
+
+
+
+    def add_marker(self, t, kind):
+        """Marks a 'drink', 'pee' or 'accident' at time t."""
+        index = bisect.bisect_right(self.marker_times, t)
+        self.marker_times.insert(index, t)
+        self.marker_kinds.insert(index, kind)
+        if self._visible() and self._x0 <= t <= self._x1:
+            self._marker(t, kind)
+
+
+
+
+    def extend(self, times, volumes):
+        """Adds sampled volumes at times after the ones so far, appending a segment to the line."""
+        if not len(times):
+            return
+        self.times.extend(times)
+        self.volumes.extend(volumes)
+        self._peak = max(self._peak, max(volumes))
+        moved = self._fit_volume()
+        if self.start is not None and self._fit_time(self.times[-1]) or moved:
+            self.layout()
+            return
+        if not self._visible():
+            return
+
+        # The new segment starts from the last point drawn, and is downsampled to the pixels it covers:
+        first = max(self._drawn - 1, bisect.bisect_left(self.times, self._x0))
+        xs = self.times[first:]
+        ys = self.volumes[first:]
+        pixels = math.ceil(self._x(xs[-1]) - self._x(xs[0])) + 1
+        self._drawn = len(self.times)
+        if len(xs) < 2:
+            return
+        self._segments.append(self._line(*lttb(xs, ys, max(2, pixels))))
+        self.appends += 1
+        if len(self._segments) >= MAX_SEGMENTS:
+            self._merge_segments()
+
+
+
+
+    def layout(self):
+        """Redraws everything: the capacity line, the markers and the samples in view downsampled to the width."""
+        self.canvas.delete('all')
+        self._segments = []
+        self._drawn = len(self.times)
+        if not self._visible():
+            return
+        self.layouts += 1
+
+        if self.capacity:
+            y = self._y(self.capacity)
+            self.canvas.create_line(PAD, y, self.width - PAD, y, fill=COLORS['capacity'], dash=(4, 2),
+                                    tags=('capacity',))
+
+        first = bisect.bisect_left(self.marker_times, self._x0)
+        last = bisect.bisect_right(self.marker_times, self._x1)
+        for i in range(first, last):
+            self._marker(self.marker_times[i], self.marker_kinds[i])
+
+        first = bisect.bisect_left(self.times, self._x0)
+        if len(self.times) - first >= 2:
+            xs, ys = lttb(self.times[first:], self.volumes[first:], max(3, self.width - 2 * PAD))
+            self._segments.append(self._line(xs, ys))
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#--------------------------------------------------------------------------------------------------
+# Ideas for Improvements:
+#--------------------------------------------------------------------------------------------------
+"""
+* Label the axes with clock times and volumes.
+* Drop samples long out of view when zoomed in on a session that has run for days.
+"""
+#--------------------------------------------------------------------------------------------------
+
+
+
+
+#--------------------------------------------------------------------------------------------------
+# References:
+#--------------------------------------------------------------------------------------------------
+"""
+* Sveinn Steinarsson, Downsampling Time Series for Visual Representation, University of Iceland, 2013.
+* https://tcl.tk/man/tcl8.6/TkCmd/canvas.htm
+"""
+#--------------------------------------------------------------------------------------------------
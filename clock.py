@@ -0,0 +1,247 @@
+#----------------------------
+# File Headers:
+#----------------------------
+# Shebang:
+#!/usr/bin/env python
+
+
+# Encoding:
+# -*- coding: utf-8 -*-
+
+
+# Docstring:
+"""
+Filename: clock.py
+Authors: Tsukiko
+Date: 18/10/2026
+Version: 1.0.0
+Description:
+    One monotonic nanosecond clock and a heap of deadlines on it, shared by any number of
+    timer.Timer and stopwatch.Stopwatch instances. Timers schedule their expiry and
+    stopwatches their next whole second as callbacks, rather than being polled. Scheduling
+    and firing each cost O(log n), so thousands of hold timers stay cheap.
+
+    Nothing fires by itself: whoever owns the scheduler calls run_due(), for instance from
+    Tk's after() using seconds_until_next() as the delay, or from an asyncio loop.
+    Pausing the scheduler stops its clock, so every timer on it pauses and resumes together
+    with no drift and without touching the heap.
+
+License: MIT License
+Contact: tsukiko1701@gmail.com
+Dependencies: heapq, itertools, time
+"""
+
+
+# Dunders:
+__author__ = "Tsukiko"
+__copyright__ = "Copyright (c) 2025 Tsukiko-030"
+__credits__ = ["Tsukiko"]
+__license__ = "The MIT License (MIT)"
+__version__ = "1.0.0"
+__maintainer__ = "Tsukiko"
+__email__ = "tsukiko1701@gmail.com"
+__status__ = "Production"
+#----------------------------
+
+
+
+
+#----------------------------
+# Import Statements:
+#----------------------------
+import heapq
+import itertools
+import time
+#----------------------------
+
+
+
+
+#--------------------------------------
+# Exterior Variables:
+#--------------------------------------
+NS_PER_SECOND = 1000000000
+#--------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Handle Class:
+#----------------------------------------------------------------------------------------------------------------------
+class Handle():
+    """A scheduled callback, returned by ClockScheduler.call_at() so it can be cancelled."""
+    __slots__ = ('deadline', 'callback', 'args', 'cancelled')
+
+    def __init__(self, deadline, callback, args):
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# ClockScheduler Class:
+#----------------------------------------------------------------------------------------------------------------------
+class ClockScheduler():
+    # Constructor:
+    def __init__(self, clock_ns=time.monotonic_ns):
+        """
+        Initializes the ClockScheduler Class.
+        :param clock_ns: Monotonic source of integer nanoseconds, time.monotonic_ns by default.
+        """
+        self._clock_ns = clock_ns
+        self._heap = [] # (deadline, sequence, Handle)
+        self._sequence = itertools.count()
+        self._cancelled = 0
+        self._offset = clock_ns() # Scheduler time starts at 0 and excludes time spent paused
+        self._paused_at = None
+        self.fired = 0
+
+
+
+
+    # Private Methods:
+    def _compact(self):
+        """Drops cancelled handles once they make up half the heap, so cancelling stays O(1) and memory bounded."""
+        if self._cancelled > 64 and self._cancelled * 2 > len(self._heap):
+            self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+            heapq.heapify(self._heap)
+            self._cancelled = 0
+
+
+
+
+    # Public Methods:
+    def now_ns(self):
+        """Returns the scheduler's time in nanoseconds. It stands still while the scheduler is paused."""
+        if self._paused_at is not None:
+            return self._paused_at
+        return self._clock_ns() - self._offset
+
+
+
+
+    def is_paused(self):
+        return self._paused_at is not None
+
+
+
+
+    def pause(self):
+        """Stops the clock, and with it every timer and stopwatch on this scheduler."""
+        if self._paused_at is None:
+            self._paused_at = self.now_ns()
+
+
+
+
+    def resume(self):
+        """Restarts the clock where it stopped. Deadlines keep their distance from now, so nothing drifts."""
+        if self._paused_at is not None:
+            self._offset = self._clock_ns() - self._paused_at
+            self._paused_at = None
+
+
+
+
+    def call_at(self, deadline_ns, callback, *args):
+        """Schedules callback(*args) for when now_ns() reaches deadline_ns. Returns a Handle."""
+        handle = Handle(deadline_ns, callback, args)
+        heapq.heappush(self._heap, (deadline_ns, next(self._sequence), handle))
+        return handle
+
+
+
+
+    def call_later(self, delay_ns, callback, *args):
+        """Schedules callback(*args) delay_ns nanoseconds from now. Returns a Handle."""
+        return self.call_at(self.now_ns() + delay_ns, callback, *args)
+
+
+
+
+    def cancel(self, handle):
+        """Cancels a scheduled callback. Cancelling twice, or after it fired, does nothing."""
+        if handle is not None and not handle.cancelled:
+            handle.cancelled = True
+            self._cancelled += 1
+            self._compact()
+
+
+
+
+    def next_deadline_ns(self):
+        """Returns the earliest pending deadline, or None if nothing is scheduled."""
+        heap = self._heap
+        while heap and heap[0][2].cancelled:
+            heapq.heappop(heap)
+            self._cancelled -= 1
+        return heap[0][0] if heap else None
+
+
+
+
+    def seconds_until_next(self):
+        """Returns the seconds until the earliest deadline, for sleeping or after(). None if nothing is
+        scheduled or the scheduler is paused."""
+        deadline = self.next_deadline_ns()
+        if deadline is None or self._paused_at is not None:
+            return None
+        return max(0, deadline - self.now_ns()) / NS_PER_SECOND
+
+
+
+
+    def run_due(self):
+        """Fires, in deadline order, every callback that is due. Returns how many fired."""
+        if self._paused_at is not None:
+            return 0
+        heap = self._heap
+        count = 0
+        now = self.now_ns()
+        while heap and heap[0][0] <= now:
+            handle = heapq.heappop(heap)[2]
+            if handle.cancelled:
+                self._cancelled -= 1
+                continue
+            handle.cancelled = True # Fired, so cancelling it later is a no-op
+            handle.callback(*handle.args)
+            count += 1
+            now = self.now_ns()
+        self.fired += count
+        return count
+
+
+
+
+    def __len__(self):
+        """Number of callbacks still scheduled."""
+        return len(self._heap) - self._cancelled
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#--------------------------------------------------------------------------------------------------
+# Ideas for Improvements:
+#--------------------------------------------------------------------------------------------------
+"""
+* Switch to a hierarchical timing wheel if it ever has to hold millions of timers.
+"""
+#--------------------------------------------------------------------------------------------------
+
+
+
+
+#--------------------------------------------------------------------------------------------------
+# References:
+#--------------------------------------------------------------------------------------------------
+"""
+* https://docs.python.org/3/library/heapq.html
+* https://docs.python.org/3/library/time.html#time.monotonic_ns
+"""
+#--------------------------------------------------------------------------------------------------
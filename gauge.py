@@ -0,0 +1,287 @@
+#----------------------------
+# File Headers:
+#----------------------------
+# Shebang:
+#!/usr/bin/env python
+
+
+# Encoding:
+# -*- coding: utf-8 -*-
+
+
+# Docstring:
+"""
+Filename: gauge.py
+Authors: Tsukiko
+Date: 18/10/2026
+Version: 1.0.0
+Description:
+    The pixel-art bladder gauge. Desperation is mapped onto the 11 frames in B_Guage_Pixel_Art,
+    0.png (empty) to 10.png (full). Every frame is decoded and scaled once, when the gauge is
+    warmed at startup, into a bounded cache keyed by (frame, scale, theme). After that, polls
+    and resizes only look images up in the cache, and the label's image is swapped only when
+    the frame or scale actually changes.
+
+    Scales are integer subsample factors of the 1079 px source frames. Tk's subsample() picks
+    every n-th pixel, which is nearest-neighbour scaling and keeps the pixel art crisp.
+    A theme is a directory of frames, so alternative art sets can be dropped in.
+
+License: MIT License
+Contact: tsukiko1701@gmail.com
+Dependencies: collections, math, os, tkinter
+"""
+
+
+# Dunders:
+__author__ = "Tsukiko"
+__copyright__ = "Copyright (c) 2025 Tsukiko-030"
+__credits__ = ["Tsukiko"]
+__license__ = "The MIT License (MIT)"
+__version__ = "1.0.0"
+__maintainer__ = "Tsukiko"
+__email__ = "tsukiko1701@gmail.com"
+__status__ = "Production"
+#----------------------------
+
+
+
+
+#----------------------------
+# Import Statements:
+#----------------------------
+import collections
+import math
+import os
+import tkinter as tk
+#----------------------------
+
+
+
+
+#--------------------------------------
+# Exterior Variables:
+#--------------------------------------
+FRAME_COUNT = 11
+SOURCE_SIZE = 1079 # Width and height of the source frames, in pixels.
+# Subsample factors the gauge can be shown at, largest image first:
+SUBSAMPLES = (2, 3, 4, 6, 8)
+# Frame directories by theme name:
+THEMES = {'default': os.path.join(os.path.dirname(os.path.abspath(__file__)), 'B_Guage_Pixel_Art')}
+#--------------------------------------
+
+
+
+
+#--------------------------------------
+# Exterior Functions:
+#--------------------------------------
+def level_index(desperation, frames=FRAME_COUNT):
+    """Returns the frame showing desperation, 0 for empty up to frames - 1 once capacity is reached."""
+    return min(frames - 1, max(0, math.floor(desperation * (frames - 1))))
+
+
+
+
+def best_subsample(available, subsamples=SUBSAMPLES, size=SOURCE_SIZE):
+    """Returns the subsample factor giving the largest gauge that fits in available pixels, or the smallest gauge."""
+    for subsample in sorted(subsamples):
+        if math.ceil(size / subsample) <= available:
+            return subsample
+    return max(subsamples)
+
+
+
+
+def _decode(path):
+    """Decodes a PNG frame into a Tk image."""
+    return tk.PhotoImage(file=path)
+
+
+
+
+def _scale(image, subsample):
+    """Scales a Tk image down by subsample, nearest-neighbour."""
+    return image.subsample(subsample, subsample)
+#--------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# SpriteCache Class:
+#----------------------------------------------------------------------------------------------------------------------
+class SpriteCache():
+    # Constructor:
+    def __init__(self, max_size=FRAME_COUNT * len(SUBSAMPLES), themes=None, decode=_decode, scale=_scale):
+        """
+        Initializes the SpriteCache Class.
+        :param max_size: Most scaled frames kept, the least recently used are dropped first.
+                         The default holds every scale of one theme.
+        :param themes: {theme: directory of 0.png to 10.png}, THEMES by default.
+        :param decode: Function turning a path into an image, tk.PhotoImage by default.
+        :param scale: Function scaling an image down by an integer factor.
+        """
+        self.max_size = max_size
+        self.themes = THEMES if themes is None else themes
+        self._decode = decode
+        self._scale = scale
+        self._sprites = collections.OrderedDict()
+        self.decodes = 0
+        self.hits = 0
+        self.misses = 0
+
+
+
+
+    # Public Methods:
+    def warm(self, theme='default', subsamples=SUBSAMPLES, frames=FRAME_COUNT):
+        """
+        Decodes each frame of theme once and caches it at every subsample factor. Call this, or
+        warm_frame() for each frame, at startup: they are the only places frames are decoded.
+        """
+        for frame in range(frames):
+            self.warm_frame(frame, theme, subsamples)
+
+
+
+
+    def warm_frame(self, frame, theme='default', subsamples=SUBSAMPLES):
+        """Decodes one frame of theme, if it is not cached yet, and caches it at every subsample factor."""
+        missing = [s for s in subsamples if (frame, s, theme) not in self._sprites]
+        if not missing:
+            return
+        source = self._decode(os.path.join(self.themes[theme], str(frame) + '.png'))
+        self.decodes += 1
+        for subsample in missing:
+            self.put((frame, subsample, theme), self._scale(source, subsample))
+
+
+
+
+    def put(self, key, sprite):
+        """Caches sprite under key, a (frame, scale, theme) tuple, evicting the least recently used."""
+        self._sprites[key] = sprite
+        self._sprites.move_to_end(key)
+        while len(self._sprites) > self.max_size:
+            self._sprites.popitem(last=False)
+
+
+
+
+    def get(self, frame, scale, theme='default'):
+        """Returns the cached sprite, or None if it was never warmed or has been evicted. Never decodes."""
+        sprite = self._sprites.get((frame, scale, theme))
+        if sprite is None:
+            self.misses += 1
+            return None
+        self._sprites.move_to_end((frame, scale, theme))
+        self.hits += 1
+        return sprite
+
+
+
+
+    def scales(self, theme='default', frames=FRAME_COUNT):
+        """Returns the subsample factors at which every frame of theme is cached."""
+        cached = collections.Counter(scale for frame, scale, name in self._sprites if name == theme and frame < frames)
+        return tuple(sorted(scale for scale, count in cached.items() if count == frames))
+
+
+
+
+    def __len__(self):
+        return len(self._sprites)
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Gauge Class:
+#----------------------------------------------------------------------------------------------------------------------
+class Gauge():
+    # Constructor:
+    def __init__(self, label, sprites, theme='default', frames=FRAME_COUNT):
+        """
+        Initializes the Gauge Class.
+        :param label: Widget showing the gauge, anything with configure(image=...) such as a tk.Label.
+        :param sprites: A SpriteCache warmed for theme.
+        """
+        self.label = label
+        self.sprites = sprites
+        self.theme = theme
+        self.frames = frames
+        self.levels = frames - 1 # Steps between empty and full, for refresh.next_level_volume().
+        self.swaps = 0
+        self.suppressed = 0
+        self._frame = 0
+        self._scale = None
+        self._shown = None
+
+
+
+
+    # Private Methods:
+    def _show(self):
+        """Swaps the label's image if the frame or scale changed. Returns True if it was swapped."""
+        if self._scale is None or (self._frame, self._scale) == self._shown:
+            self.suppressed += 1
+            return False
+        sprite = self.sprites.get(self._frame, self._scale, self.theme)
+        if sprite is None:
+            return False
+        self.label.configure(image=sprite)
+        self._shown = (self._frame, self._scale)
+        self.swaps += 1
+        return True
+
+
+
+
+    # Public Methods:
+    def set(self, desperation):
+        """Shows the frame for desperation."""
+        self._frame = level_index(desperation, self.frames)
+        return self._show()
+
+
+
+
+    def fit(self, available):
+        """Shows the largest cached scale that fits in available pixels, e.g. after a resize."""
+        scales = self.sprites.scales(self.theme, self.frames)
+        if scales:
+            self._scale = best_subsample(available, scales)
+        return self._show()
+
+
+
+
+    @property
+    def frame(self):
+        """The frame currently selected, 0 to frames - 1."""
+        return self._frame
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#--------------------------------------------------------------------------------------------------
+# Ideas for Improvements:
+#--------------------------------------------------------------------------------------------------
+"""
+* Let the user pick their own art set as a theme, see "Allow the user to provide images" in Ideas.md.
+* Warm the scales the screen cannot show lazily, instead of all at startup.
+"""
+#--------------------------------------------------------------------------------------------------
+
+
+
+
+#--------------------------------------------------------------------------------------------------
+# References:
+#--------------------------------------------------------------------------------------------------
+"""
+* https://www.tcl.tk/man/tcl8.6/TkCmd/photo.htm
+"""
+#--------------------------------------------------------------------------------------------------
@@ -0,0 +1,320 @@
+#----------------------------
+# File Headers:
+#----------------------------
+# Shebang:
+#!/usr/bin/env python
+
+
+# Encoding:
+# -*- coding: utf-8 -*-
+
+
+# Docstring:
+"""
+Filename: hold_store.py
+Authors: Tsukiko
+Date: 18/10/2026
+Version: 1.0.0
+Description:
+    The hold history: every hold's number, start, end, duration, peak volume and outcome,
+    kept in an SQLite database in WAL mode. Holds are handed to a background writer thread
+    (batch_writer.py) which commits them in groups, so ending a hold never waits on the disk. Queries for the
+    latest holds, the longest holds and the holds in a date range are answered from indexes,
+    in about a millisecond however many holds have been stored.
+
+    Times are in minutes since the epoch, like omo.py, and durations in seconds, like the
+    hold stopwatch. The peak is the bladder volume at the end of the hold in mL, and the
+    outcome is 'pee' or 'accident'.
+
+    Usage:
+        python hold_store.py --benchmark
+
+License: MIT License
+Contact: tsukiko1701@gmail.com
+Dependencies: collections, os, random, sqlite3, sys, tempfile, threading, time, batch_writer.py
+"""
+
+
+# Dunders:
+__author__ = "Tsukiko"
+__copyright__ = "Copyright (c) 2025 Tsukiko-030"
+__credits__ = ["Tsukiko"]
+__license__ = "The MIT License (MIT)"
+__version__ = "1.0.0"
+__maintainer__ = "Tsukiko"
+__email__ = "tsukiko1701@gmail.com"
+__status__ = "Production"
+#----------------------------
+
+
+
+
+#----------------------------
+# Import Statements:
+#----------------------------
+import collections
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import batch_writer
+#----------------------------
+
+
+
+
+#--------------------------------------
+# Exterior Variables:
+#--------------------------------------
+OUTCOMES = ('pee', 'accident')
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS holds ("
+    " number INTEGER PRIMARY KEY,"
+    " start_time REAL NOT NULL,"
+    " end_time REAL NOT NULL,"
+    " duration REAL NOT NULL,"
+    " peak REAL NOT NULL,"
+    " outcome TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS holds_by_start ON holds (start_time)",
+    "CREATE INDEX IF NOT EXISTS holds_by_duration ON holds (duration)",
+    "CREATE INDEX IF NOT EXISTS holds_by_outcome ON holds (outcome, start_time)",
+    "CREATE INDEX IF NOT EXISTS holds_by_outcome_number ON holds (outcome, number)",
+    "CREATE INDEX IF NOT EXISTS holds_by_outcome_duration ON holds (outcome, duration)",
+)
+COLUMNS = "number, start_time, end_time, duration, peak, outcome"
+# Hold counts reported by the benchmark:
+BENCHMARK_SIZES = (10**3, 10**5)
+#--------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Hold Class:
+#----------------------------------------------------------------------------------------------------------------------
+class Hold(collections.namedtuple('Hold', ['number', 'start', 'end', 'duration', 'peak', 'outcome'])):
+    """One stored hold. number counts the holds from 1, in the order they were recorded."""
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# HoldStoreError Class:
+#----------------------------------------------------------------------------------------------------------------------
+class HoldStoreError(Exception):
+    """This custom exception is used to report errors in the use of the HoldStore class."""
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# HoldStore Class:
+#----------------------------------------------------------------------------------------------------------------------
+class HoldStore():
+    # Constructor:
+    def __init__(self, path, commit_interval = 0.25):
+        """
+        Opens the hold history at path and starts its writer thread.
+        :param path: Database file, created along with its directory if missing.
+        :param commit_interval: Seconds the writer waits to gather holds into one commit.
+        Queries may be made from any thread, they only see holds that have been committed.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._reader = self._connect()
+        with self._reader:
+            for statement in SCHEMA:
+                self._reader.execute(statement)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._connection = self._connect() # Only used by the writer thread.
+        self._batches = batch_writer.BatchWriter(self._write, commit_interval, "hold-store-writer",
+                                                 HoldStoreError, "the hold history")
+
+
+
+
+    # Private Methods:
+    def _connect(self):
+        """Opens a connection in WAL mode, so reads never wait for the writer and commits skip most fsyncs."""
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+
+
+
+    def _write(self, rows):
+        """Writer thread: inserts a group of holds in one transaction."""
+        with self._connection:
+            self._connection.executemany(
+                "INSERT INTO holds (start_time, end_time, duration, peak, outcome) VALUES (?, ?, ?, ?, ?)", rows)
+
+
+
+
+    def _select(self, where = "", order = "number DESC", limit = None, parameters = ()):
+        """Returns the Holds matching an SQL where clause, in order."""
+        if self._closed:
+            raise HoldStoreError("The hold store is closed.")
+        query = "SELECT " + COLUMNS + " FROM holds"
+        if where:
+            query += " WHERE " + where
+        query += " ORDER BY " + order
+        if limit is not None:
+            query += " LIMIT ?"
+            parameters = tuple(parameters) + (int(limit),)
+        with self._lock:
+            return [Hold(*row) for row in self._reader.execute(query, parameters)]
+
+
+
+
+    # Public Methods:
+    def record(self, start, end, duration, peak, outcome):
+        """Queues a finished hold. Never blocks on the disk."""
+        if self._closed:
+            raise HoldStoreError("The hold store is closed.")
+        if outcome not in OUTCOMES:
+            raise HoldStoreError("A hold ends with one of " + ", ".join(OUTCOMES) + ", not " + repr(outcome) + ".")
+        self._batches.put((float(start), float(end), float(duration), float(peak), outcome))
+
+
+
+
+    def latest(self, count, outcome = None):
+        """Returns the last count holds recorded, newest first."""
+        if outcome is None:
+            return self._select(limit = count)
+        return self._select("outcome = ?", "number DESC", count, (outcome,))
+
+
+
+
+    def longest(self, count, outcome = None):
+        """Returns the count longest holds, longest first."""
+        if outcome is None:
+            return self._select(order = "duration DESC", limit = count)
+        return self._select("outcome = ?", "duration DESC", count, (outcome,))
+
+
+
+
+    def between(self, first, last, outcome = None, limit = None):
+        """Returns the holds that started from first up to last, in minutes since the epoch, oldest first."""
+        if outcome is None:
+            return self._select("start_time >= ? AND start_time <= ?", "start_time", limit, (first, last))
+        return self._select("outcome = ? AND start_time >= ? AND start_time <= ?", "start_time", limit,
+                            (outcome, first, last))
+
+
+
+
+    def count(self, outcome = None):
+        """Returns the number of holds stored."""
+        if self._closed:
+            raise HoldStoreError("The hold store is closed.")
+        with self._lock:
+            if outcome is None:
+                return self._reader.execute("SELECT count(*) FROM holds").fetchone()[0]
+            return self._reader.execute("SELECT count(*) FROM holds WHERE outcome = ?", (outcome,)).fetchone()[0]
+
+
+
+
+    def flush(self):
+        """Blocks until every queued hold has been committed."""
+        self._batches.flush()
+
+
+
+
+    def close(self):
+        """Commits any queued holds, stops the writer thread and closes the database."""
+        if self._closed:
+            return
+        self._closed = True
+        self._batches.stop()
+        self._connection.close()
+        with self._lock:
+            self._reader.close()
+        self._batches.raise_error()
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#--------------------------------------
+# Exterior Functions:
+#--------------------------------------
+def benchmark(sizes=BENCHMARK_SIZES, out=sys.stdout):
+    """Fills throwaway stores with synthetic holds and reports the query times in ms."""
+    results = {}
+    rng = random.Random(0)
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            store = HoldStore(os.path.join(directory, 'holds.sqlite3'), commit_interval = 0.0)
+            t = 0.0
+            for _ in range(size):
+                duration = rng.uniform(600, 6 * 3600)
+                store.record(t, t + duration / 60.0, duration, rng.uniform(200, 900), rng.choice(OUTCOMES))
+                t += duration / 60.0 + rng.uniform(0, 30)
+            store.flush()
+
+            queries = {
+                'latest': lambda: store.latest(50),
+                'longest': lambda: store.longest(50),
+                'longest accidents': lambda: store.longest(50, 'accident'),
+                'between': lambda: store.between(t / 2, t / 2 + 7 * 24 * 60),
+            }
+            results[size] = {}
+            for name, query in queries.items():
+                start = time.perf_counter()
+                query()
+                results[size][name] = (time.perf_counter() - start) * 1000.0
+                out.write(f"{size:>9} holds: {name:<18} {results[size][name]:8.3f} ms\n")
+            store.close()
+    return results
+#--------------------------------------
+
+
+
+
+#--------------------------------------------------------------------------------------------------
+# Ideas for Improvements:
+#--------------------------------------------------------------------------------------------------
+"""
+* Store the drinks taken during each hold, for the scrollable hold log in Ideas.md.
+"""
+#--------------------------------------------------------------------------------------------------
+
+
+
+
+#--------------------------------------------------------------------------------------------------
+# References:
+#--------------------------------------------------------------------------------------------------
+"""
+* https://www.sqlite.org/wal.html
+* https://www.sqlite.org/queryplanner.html
+"""
+#--------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------
+# Main Loop
+#----------------------------
+if __name__ == "__main__":
+    if len(sys.argv) == 2 and sys.argv[1] == '--benchmark':
+        benchmark()
+    else:
+        sys.exit("Usage: python hold_store.py --benchmark")
+#----------------------------
@@ -0,0 +1,241 @@
+#----------------------------
+# File Headers:
+#----------------------------
+# Shebang:
+#!/usr/bin/env python
+
+
+# Encoding:
+# -*- coding: utf-8 -*-
+
+
+# Docstring:
+"""
+Filename: journal.py
+Authors: Tsukiko
+Date: 18/10/2026
+Version: 1.0.0
+Description:
+    A crash-safe, append-only journal of the current session's Drink, Release and Permission
+    events. Events are handed to a background writer thread (batch_writer.py) which commits
+    them in groups, with one fsync per group, so the UI thread never waits on the disk. After
+    a crash, kill or power cut the session can be rebuilt from the journal on the next start.
+
+    Each event is one CSV row:
+        D,time,amount
+        R,time,amount,permission
+        P,time,permission
+
+    A row only counts once its line ending is on disk. A crash mid-write can leave a torn
+    final row without one, which load() ignores and opening the Journal cuts off.
+
+License: MIT License
+Contact: tsukiko1701@gmail.com
+Dependencies: csv, os, batch_writer.py, omo.py
+"""
+
+
+# Dunders:
+__author__ = "Tsukiko"
+__copyright__ = "Copyright (c) 2025 Tsukiko-030"
+__credits__ = ["Tsukiko"]
+__license__ = "The MIT License (MIT)"
+__version__ = "1.0.0"
+__maintainer__ = "Tsukiko"
+__email__ = "tsukiko1701@gmail.com"
+__status__ = "Production"
+#----------------------------
+
+
+
+
+#----------------------------
+# Import Statements:
+#----------------------------
+import csv
+import os
+import batch_writer
+import omo
+#----------------------------
+
+
+
+
+#--------------------------------------
+# Exterior Functions:
+#--------------------------------------
+def encode(event):
+    """Returns the CSV row for a Drink, Release or Permission event."""
+    if isinstance(event, omo.Drink):
+        return ['D', repr(float(event.time)), repr(float(event.amount))]
+    elif isinstance(event, omo.Release):
+        return ['R', repr(float(event.time)), repr(float(event.amount)), int(bool(event.permission))]
+    elif isinstance(event, omo.Permission):
+        return ['P', repr(float(event.time)), int(bool(event.permission))]
+    raise JournalError("Cannot journal " + repr(event))
+
+
+
+
+def decode(row):
+    """Returns the event for a CSV row written by encode()."""
+    if row[0] == 'D':
+        return omo.Drink(float(row[1]), float(row[2]))
+    elif row[0] == 'R':
+        return omo.Release(float(row[1]), float(row[2]), row[3] == '1')
+    elif row[0] == 'P':
+        return omo.Permission(float(row[1]), row[2] == '1')
+    raise ValueError("Unknown journal record " + repr(row[0]))
+
+
+
+
+def load(path):
+    """Returns the events stored in the journal at path, or an empty list if there is none.
+    A final row torn by a crash mid-write has no line ending and is skipped, even where what
+    is left of it would parse, such as D,2.0,25 cut from D,2.0,250.0."""
+    events = []
+    if os.path.exists(path):
+        with open(path, 'r', newline='') as f:
+            # Only the last line can be missing its line ending:
+            for row in csv.reader(line for line in f if line.endswith('\n')):
+                try:
+                    events.append(decode(row))
+                except (ValueError, IndexError):
+                    continue
+    return events
+
+
+
+
+def repair(path, block_size=4096):
+    """Cuts a final row torn by a crash mid-write off the journal at path, so that new rows
+    start on a line of their own. Returns the number of bytes cut off."""
+    if not os.path.exists(path):
+        return 0
+    with open(path, 'rb+') as f:
+        size = end = f.seek(0, os.SEEK_END)
+        while end > 0:
+            start = max(0, end - block_size)
+            f.seek(start)
+            newline = f.read(end - start).rfind(b'\n')
+            if newline != -1:
+                end = start + newline + 1
+                break
+            end = start
+        if end < size:
+            f.truncate(end)
+            f.flush()
+            os.fsync(f.fileno())
+    return size - end
+
+
+
+
+def rebuild(path):
+    """Returns a Drinker restored from the journal at path."""
+    drinker = omo.Drinker()
+    drinker.load_events(load(path))
+    return drinker
+#--------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# JournalError Class:
+#----------------------------------------------------------------------------------------------------------------------
+class JournalError(Exception):
+    """This custom exception is used to report errors in the use of the Journal class."""
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Journal Class:
+#----------------------------------------------------------------------------------------------------------------------
+class Journal():
+    # Constructor:
+    def __init__(self, path, commit_interval = 0.25):
+        """
+        Opens the journal at path for appending, after cutting off any torn final row, and starts
+        its writer thread.
+        :param path: Journal file, created along with its directory if missing.
+        :param commit_interval: Seconds the writer waits to gather events into one fsync.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        repair(path)
+        self._file = open(path, 'a', newline='')
+        self._writer = csv.writer(self._file)
+        self._closed = False
+        self._batches = batch_writer.BatchWriter(self._write, commit_interval, "journal-writer",
+                                                 JournalError, "the journal")
+
+
+
+
+    # Private Methods:
+    def _write(self, events):
+        """Writer thread: writes a group of events and fsyncs them once."""
+        self._writer.writerows(encode(event) for event in events)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+
+
+
+    # Public Methods:
+    def record(self, event):
+        """Queues a Drink, Release or Permission event. Never blocks on the disk."""
+        if self._closed:
+            raise JournalError("The journal is closed.")
+        self._batches.put(event)
+
+
+
+
+    def flush(self):
+        """Blocks until every queued event has been written and fsynced."""
+        self._batches.flush()
+
+
+
+
+    def close(self, discard=False):
+        """
+        Commits any queued events and stops the writer thread.
+        :param discard: Delete the journal afterwards, for a session that was saved cleanly.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._batches.stop()
+        self._file.close()
+        if discard and os.path.exists(self.path):
+            os.remove(self.path)
+        self._batches.raise_error()
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#--------------------------------------------------------------------------------------------------
+# Ideas for Improvements:
+#--------------------------------------------------------------------------------------------------
+"""
+* Rotate or compact very long journals, for sessions that are left open for weeks.
+"""
+#--------------------------------------------------------------------------------------------------
+
+
+
+
+#--------------------------------------------------------------------------------------------------
+# References:
+#--------------------------------------------------------------------------------------------------
+"""
+* https://www.postgresql.org/docs/current/wal-intro.html
+"""
+#--------------------------------------------------------------------------------------------------
@@ -0,0 +1,322 @@
+#----------------------------
+# File Headers:
+#----------------------------
+# Shebang:
+#!/usr/bin/env python
+
+
+# Encoding:
+# -*- coding: utf-8 -*-
+
+
+# Docstring:
+"""
+Filename: loadgen.py
+Authors: Tsukiko
+Date: 18/10/2026
+Version: 1.0.0
+Description:
+    Load generator for server.py. It starts many sessions, then has a number of concurrent
+    clients fire drink, pee, accident, permission and state requests at random sessions over
+    keep-alive connections. Event stream subscribers run alongside. It reports the p50 and p99
+    request latency for each kind of request and the push rate the subscribers saw.
+
+    Usage:
+        python loadgen.py --spawn --sessions 2000 --requests 20000
+        python loadgen.py --port 8080 --subscribers 500 --interval 0.5
+
+    --spawn runs the server in this process, on a free localhost port, so nothing else is
+    needed. Client and server then share one event loop, so latencies are pessimistic.
+
+License: MIT License
+Contact: tsukiko1701@gmail.com
+Dependencies: argparse, asyncio, collections, json, math, random, time, server.py
+"""
+
+
+# Dunders:
+__author__ = "Tsukiko"
+__copyright__ = "Copyright (c) 2025 Tsukiko-030"
+__credits__ = ["Tsukiko"]
+__license__ = "The MIT License (MIT)"
+__version__ = "1.0.0"
+__maintainer__ = "Tsukiko"
+__email__ = "tsukiko1701@gmail.com"
+__status__ = "Production"
+#----------------------------
+
+
+
+
+#----------------------------
+# Import Statements:
+#----------------------------
+import argparse
+import asyncio
+import collections
+import json
+import math
+import random
+import time
+import server
+#----------------------------
+
+
+
+
+#--------------------------------------
+# Exterior Variables:
+#--------------------------------------
+# Share of requests of each kind:
+MIX = (('drink', 0.45), ('pee', 0.1), ('accident', 0.05), ('permission', 0.15), ('state', 0.25))
+#--------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# HttpClient Class:
+#----------------------------------------------------------------------------------------------------------------------
+class HttpClient():
+    # Constructor:
+    def __init__(self, host, port):
+        """Initializes the HttpClient Class, a keep-alive JSON client for one connection."""
+        self.host = host
+        self.port = port
+        self._reader = None
+        self._writer = None
+
+
+
+
+    # Public Methods:
+    async def request(self, method, path, payload=None):
+        """Sends a request and returns (status, decoded JSON response)."""
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        body = json.dumps(payload).encode() if payload is not None else b''
+        self._writer.write(f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                           f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+
+        status = int((await self._reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self._reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            if name.strip().lower() == 'content-length':
+                length = int(value)
+        return status, json.loads(await self._reader.readexactly(length))
+
+
+
+
+    async def subscribe(self, path, count):
+        """Opens an event stream and returns the arrival time, by time.perf_counter(), of its first count events."""
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: {self.host}\r\n\r\n".encode())
+        arrivals = []
+        try:
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+            while len(arrivals) < count:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.startswith(b'data: '):
+                    arrivals.append(time.perf_counter())
+        finally:
+            writer.close()
+        return arrivals
+
+
+
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#--------------------------------------
+# Exterior Functions:
+#--------------------------------------
+def percentile(values, q):
+    """Returns the q-th percentile of values by the nearest-rank method, or None if there are none."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100.0 * len(ordered)) - 1)]
+
+
+
+
+async def _client(host, port, session_ids, requests, rng, latencies, statuses):
+    """One connection firing requests until the shared budget runs out."""
+    client = HttpClient(host, port)
+    kinds = [kind for kind, _ in MIX]
+    weights = [weight for _, weight in MIX]
+    try:
+        while requests[0] > 0:
+            requests[0] -= 1
+            kind = rng.choices(kinds, weights)[0]
+            session_id = rng.choice(session_ids)
+            start = time.perf_counter()
+            if kind == 'state':
+                status, _ = await client.request('GET', '/sessions/' + session_id)
+            elif kind == 'drink':
+                status, _ = await client.request('POST', f'/sessions/{session_id}/drink', {'amount': rng.choice((100, 250, 500))})
+            else:
+                status, _ = await client.request('POST', f'/sessions/{session_id}/{kind}', {})
+            latencies[kind].append(time.perf_counter() - start)
+            statuses[status] += 1
+    finally:
+        await client.close()
+
+
+
+
+async def _timed(awaitable):
+    """Awaits awaitable and returns (its result, the seconds it took)."""
+    start = time.perf_counter()
+    result = await awaitable
+    return result, time.perf_counter() - start
+
+
+
+
+async def run_load(host, port, sessions=1000, clients=50, requests=10000, subscribers=0, interval=1.0,
+                   pushes=5, seed=0):
+    """
+    Runs the load against a server and returns a report dict: latencies in ms per request kind,
+    HTTP status counts, request throughput and the pushes the subscribers received. Throughput
+    covers the request clients alone; stream_seconds is how long the subscribers took to
+    receive their pushes.
+    """
+    rng = random.Random(seed)
+    setup = HttpClient(host, port)
+    session_ids = []
+    for _ in range(sessions):
+        status, response = await setup.request('POST', '/sessions', {})
+        session_ids.append(response['id'])
+    await setup.close()
+
+    latencies = collections.defaultdict(list)
+    statuses = collections.Counter()
+    budget = [requests]
+    streams = [HttpClient(host, port).subscribe(f'/sessions/{rng.choice(session_ids)}/events?interval={interval}', pushes)
+               for _ in range(subscribers)]
+
+    requesters = asyncio.gather(*(_client(host, port, session_ids, budget, random.Random(rng.random()), latencies,
+                                          statuses) for _ in range(clients)))
+    # Timed apart, so the request rate does not include waiting out the pushes:
+    (_, elapsed), (arrivals, delivery) = await asyncio.gather(_timed(requesters), _timed(asyncio.gather(*streams)))
+
+    every = [value for values in latencies.values() for value in values]
+    report = {
+        'sessions': sessions,
+        'requests': len(every),
+        'request_seconds': elapsed,
+        'requests_per_second': len(every) / elapsed if elapsed else None,
+        'statuses': {str(status): count for status, count in sorted(statuses.items())},
+        'latency_ms': {kind: {'p50': percentile(values, 50) * 1e3, 'p99': percentile(values, 99) * 1e3}
+                       for kind, values in sorted(latencies.items())},
+    }
+    if every:
+        report['latency_ms']['all'] = {'p50': percentile(every, 50) * 1e3, 'p99': percentile(every, 99) * 1e3}
+    if subscribers:
+        gaps = [b - a for times in arrivals for a, b in zip(times, times[1:])]
+        report['subscribers'] = subscribers
+        report['pushes_received'] = sum(len(times) for times in arrivals)
+        report['stream_seconds'] = delivery
+        report['push_interval_ms'] = {'p50': (percentile(gaps, 50) or 0.0) * 1e3,
+                                      'p99': (percentile(gaps, 99) or 0.0) * 1e3}
+    return report
+
+
+
+
+async def run_spawned(**options):
+    """Runs the load against a server started in this process on a free localhost port."""
+    session_server = server.SessionServer()
+    port = await session_server.start('127.0.0.1', 0)
+    try:
+        report = await run_load('127.0.0.1', port, **options)
+        report['server_stats'] = session_server.handle('GET', '/stats', {})[1]
+        return report
+    finally:
+        await session_server.stop()
+
+
+
+
+def print_report(report):
+    print(f"{report['requests']} requests to {report['sessions']} sessions in {report['request_seconds']:.2f} s, "
+          f"{report['requests_per_second']:,.0f} requests/sec, statuses {report['statuses']}")
+    for kind, latency in report['latency_ms'].items():
+        print(f"{kind:>12}: p50 {latency['p50']:8.3f} ms   p99 {latency['p99']:8.3f} ms")
+    if 'subscribers' in report:
+        interval = report['push_interval_ms']
+        print(f"{report['subscribers']} subscribers received {report['pushes_received']} pushes "
+              f"in {report['stream_seconds']:.2f} s, interval p50 {interval['p50']:.1f} ms, p99 {interval['p99']:.1f} ms")
+#--------------------------------------
+
+
+
+
+#--------------------------------------------------------------------------------------------------
+# Ideas for Improvements:
+#--------------------------------------------------------------------------------------------------
+"""
+* Spread clients over several processes, so one machine can saturate the server.
+"""
+#--------------------------------------------------------------------------------------------------
+
+
+
+
+#--------------------------------------------------------------------------------------------------
+# References:
+#--------------------------------------------------------------------------------------------------
+"""
+* https://en.wikipedia.org/wiki/Percentile#The_nearest-rank_method
+"""
+#--------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------
+# Main Loop
+#----------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the Omo Tracker session server.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--spawn', action='store_true', help="run the server in this process")
+    parser.add_argument('--sessions', type=int, default=1000)
+    parser.add_argument('--clients', type=int, default=50, help="concurrent connections")
+    parser.add_argument('--requests', type=int, default=10000)
+    parser.add_argument('--subscribers', type=int, default=100, help="event streams held open")
+    parser.add_argument('--interval', type=float, default=1.0, help="seconds between pushes")
+    parser.add_argument('--pushes', type=int, default=5, help="pushes each subscriber waits for")
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    args = parser.parse_args()
+
+    options = dict(sessions=args.sessions, clients=args.clients, requests=args.requests,
+                   subscribers=args.subscribers, interval=args.interval, pushes=args.pushes)
+    if args.spawn:
+        report = asyncio.run(run_spawned(**options))
+    else:
+        report = asyncio.run(run_load(args.host, args.port, **options))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+#----------------------------
@@ -0,0 +1,391 @@
+#----------------------------
+# File Headers:
+#----------------------------
+# Shebang:
+#!/usr/bin/env python
+
+
+# Encoding:
+# -*- coding: utf-8 -*-
+
+
+# Docstring:
+"""
+Filename: model_service.py
+Authors: Tsukiko
+Date: 18/10/2026
+Version: 1.0.0
+Description:
+    Runs the omo.Drinker on a worker thread of its own, so the GUI's main loop never computes
+    model state. The GUI sends commands (add a drink, add a release, set permission, refresh)
+    which are queued and applied in order. After each one the service publishes a State, an
+    immutable picture of the model at the command's time.
+
+    Thread-safety contract:
+    * The Drinker is only ever touched on the worker thread: by load(), by the commands and by
+      functions passed to submit(). Nothing else may keep or use a reference to it.
+    * Every public method of ModelService may be called from any thread. Commands never block
+      the caller. submit() returns a concurrent.futures.Future for its result.
+    * States are namedtuples of plain values, safe to read from any thread.
+    * publish and on_error are called on the worker thread, and so are the done callbacks of the
+      futures submit() returns. They should only hand the value over to the main loop with
+      Inbox.put(), and must not call back into the service or touch any Tk object themselves.
+      Inbox.put() wakes the main loop with root.event_generate(), which from another thread waits
+      for the main loop to take the event. That is safe because of the next rule.
+    * The main loop never waits on a future. Work that depends on one is chained with
+      future.add_done_callback() and handed back through the Inbox.
+
+License: MIT License
+Contact: tsukiko1701@gmail.com
+Dependencies: collections, concurrent.futures, queue, threading, omo.py
+"""
+
+
+# Dunders:
+__author__ = "Tsukiko"
+__copyright__ = "Copyright (c) 2025 Tsukiko-030"
+__credits__ = ["Tsukiko"]
+__license__ = "The MIT License (MIT)"
+__version__ = "1.0.0"
+__maintainer__ = "Tsukiko"
+__email__ = "tsukiko1701@gmail.com"
+__status__ = "Production"
+#----------------------------
+
+
+
+
+#----------------------------
+# Import Statements:
+#----------------------------
+import collections
+import concurrent.futures
+import queue
+import threading
+#----------------------------
+
+
+
+
+#--------------------------------------
+# Exterior Variables:
+#--------------------------------------
+INBOX_EVENT = '<<Inbox>>' # Virtual event that wakes the main loop to drain the Inbox.
+#--------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# State Class:
+#----------------------------------------------------------------------------------------------------------------------
+class State(collections.namedtuple('State', ['time', 'bladder', 'absorbed', 'desperation', 'capacity', 'eta',
+                                             'roll_allowed', 'permission', 'projection', 'version'])):
+    """
+    The model at time, as published by the ModelService. permission is the latest omo.Permission,
+    projection an omo.Projection for working out when the bladder reaches a volume, and version
+    counts the States published so far.
+    """
+    def time_to_reach(self, volume):
+        """Returns the time at which the bladder will hold volume, assuming no further events, or None."""
+        return self.projection.time_to_reach(volume)
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# ModelService Class:
+#----------------------------------------------------------------------------------------------------------------------
+class ModelService():
+    # Constructor:
+    def __init__(self, load=None, publish=None, on_error=None):
+        """
+        Initializes the ModelService Class. Call start() to start the worker thread.
+        :param load: Called on the worker thread before any command, returns the Drinker to own.
+                     By default a new omo.Drinker, omo being imported on the worker thread too.
+        :param publish: Called on the worker thread with each new State.
+        :param on_error: Called on the worker thread with any exception raised by load() or a command.
+                         If load() fails the worker stops. By default exceptions are re-raised.
+        """
+        self._load = load
+        self._publish = publish
+        self._on_error = on_error
+        self._commands = queue.Queue()
+        self._thread = None
+        self._drinker = None
+        self._version = 0
+        self.loaded = threading.Event()
+        self.published = 0
+
+
+
+
+    # Private Methods:
+    def _state(self, t):
+        """Builds the State at time t. Worker thread only."""
+        drinker = self._drinker
+        snapshot = drinker.snapshot(t)
+        self._version += 1
+        return State(*snapshot, drinker.permission, drinker.projection(), self._version)
+
+
+
+
+    def _error(self, error):
+        if self._on_error is None:
+            raise error
+        self._on_error(error)
+
+
+
+
+    def _run(self):
+        """The worker thread: loads the Drinker, then applies commands until stop()."""
+        try:
+            load = self._load
+            if load is None:
+                import omo
+                load = omo.Drinker
+            self._drinker = load()
+        except Exception as error:
+            self._error(error)
+            return
+        self.loaded.set()
+
+        while True:
+            command = self._commands.get()
+            if command is None:
+                return
+            name, t, args, future = command
+
+            # Only the latest of several queued refreshes is worth publishing:
+            if name == 'refresh' and self._pending_refresh():
+                continue
+
+            try:
+                if name == 'submit':
+                    function, args = args[0], args[1:]
+                    if future.set_running_or_notify_cancel():
+                        future.set_result(function(self._drinker, *args))
+                    continue
+                if name != 'refresh':
+                    getattr(self._drinker, name)(t, *args)
+                state = self._state(t)
+            except Exception as error:
+                if future is not None:
+                    future.set_exception(error)
+                else:
+                    self._error(error)
+                continue
+
+            if self._publish is not None:
+                self._publish(state)
+            self.published += 1
+
+
+
+
+    def _pending_refresh(self):
+        """Returns True if another refresh is queued right behind this one."""
+        with self._commands.mutex:
+            return bool(self._commands.queue) and self._commands.queue[0] is not None \
+                   and self._commands.queue[0][0] == 'refresh'
+
+
+
+
+    def _send(self, name, t, *args):
+        self._commands.put((name, t, args, None))
+
+
+
+
+    # Public Methods:
+    def start(self):
+        """Starts the worker thread, which begins by calling load()."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="Model Service", daemon=True)
+            self._thread.start()
+
+
+
+
+    def stop(self, timeout=None):
+        """Lets the worker finish the commands already queued, then stops it."""
+        if self._thread is not None:
+            self._commands.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+
+
+
+
+    def add_drink(self, t, amount):
+        """Queues Drinker.add_drink(t, amount), then publishes the State at t."""
+        self._send('add_drink', t, amount)
+
+
+
+
+    def add_release(self, t, permission):
+        """Queues Drinker.add_release(t, permission), then publishes the State at t."""
+        self._send('add_release', t, permission)
+
+
+
+
+    def set_permission(self, t, answer):
+        """Queues Drinker.set_permission(t, answer), then publishes the State at t."""
+        self._send('set_permission', t, answer)
+
+
+
+
+    def refresh(self, t):
+        """Queues publishing the State at t."""
+        self._send('refresh', t)
+
+
+
+
+    def submit(self, function, *args):
+        """
+        Queues function(drinker, *args) to run on the worker thread, for anything the commands
+        don't cover, such as saving. Returns a concurrent.futures.Future of its result.
+        """
+        future = concurrent.futures.Future()
+        self._commands.put(('submit', None, (function,) + args, future))
+        return future
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Inbox Class:
+#----------------------------------------------------------------------------------------------------------------------
+class Inbox():
+    # Constructor:
+    def __init__(self, root, sequence=INBOX_EVENT):
+        """
+        Initializes the Inbox Class: hands calls over from the worker thread to the Tk main loop.
+        put() may be called from any thread, the calls are made on the main loop, in order, by
+        drain(). Once start() is called, put() wakes the main loop with the virtual event sequence
+        whenever the inbox goes from empty to not, so an idle inbox costs the main loop nothing.
+        :param root: The Tk root, the virtual event is generated and bound on it.
+        """
+        self.root = root
+        self.sequence = sequence
+        self._calls = collections.deque()
+        self._lock = threading.Lock()
+        self._signalled = False # A wakeup is on its way to the main loop.
+        self._binding = None
+        self.running = False
+
+
+
+
+    # Private Methods:
+    def _signal(self):
+        """Wakes the main loop to drain, unless a wakeup is already on its way."""
+        with self._lock:
+            if self._signalled or not self.running:
+                return
+            self._signalled = True
+        try:
+            self.root.event_generate(self.sequence, when='tail')
+        except Exception:
+            # The main loop has ended, or the window is gone. The next put() tries again:
+            with self._lock:
+                self._signalled = False
+
+
+
+
+    def _on_event(self, event=None):
+        self.drain()
+
+
+
+
+    # Public Methods:
+    def put(self, function, *args):
+        """Queues function(*args) to be called on the main loop. Any thread."""
+        self._calls.append((function, args))
+        self._signal()
+
+
+
+
+    def drain(self):
+        """
+        Makes the queued calls. Main loop only. A call that raises or stops the inbox ends the
+        drain, the calls behind it wait in the queue, and after a raise the main loop is woken
+        again for them. Returns the number of calls made.
+        """
+        with self._lock:
+            self._signalled = False
+        running = self.running
+        made = 0
+        try:
+            while self.running == running:
+                try:
+                    function, args = self._calls.popleft()
+                except IndexError:
+                    break
+                made += 1
+                function(*args)
+        except BaseException:
+            if self._calls:
+                self._signal()
+            raise
+        return made
+
+
+
+
+    def start(self):
+        """
+        Starts waking the main loop for queued calls. Main loop only, it may be called before the
+        main loop runs. Calls queued until then are drained once it does.
+        """
+        if not self.running:
+            self.running = True
+            self._binding = self.root.bind(self.sequence, self._on_event, '+')
+            # Queued from the main thread, so put() never waits on a main loop that isn't running yet:
+            self._signal()
+
+
+
+
+    def stop(self):
+        """Stops waking the main loop. Calls still queued stay there. Main loop only."""
+        self.running = False
+        if self._binding is not None:
+            self.root.unbind(self.sequence, self._binding)
+            self._binding = None
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#--------------------------------------------------------------------------------------------------
+# Ideas for Improvements:
+#--------------------------------------------------------------------------------------------------
+"""
+* Serve the same States to other front ends, for example a web view of the session.
+"""
+#--------------------------------------------------------------------------------------------------
+
+
+
+
+#--------------------------------------------------------------------------------------------------
+# References:
+#--------------------------------------------------------------------------------------------------
+"""
+* https://docs.python.org/3/library/queue.html
+* https://tkdocs.com/tutorial/eventloop.html#threads
+"""
+#--------------------------------------------------------------------------------------------------
@@ -25,7 +25,7 @@ Description:
 
 License: The MIT License (MIT)
 Contact: https://github.com/perv-asive
-Dependencies: collections, statistics, random, math
+Dependencies: array, bisect, collections, random, math, numpy (optional)
 """
 
 
@@ -46,10 +46,18 @@ __status__ = "Production"
 #----------------------------
 #Import Statements:
 #----------------------------
+import bisect
 import collections
-import statistics
+import collections.abc
 import random
 from math import log2
+from array import array
+
+# NumPy is optional, it only speeds up Drinker.bladder_curve
+try:
+    import numpy
+except ImportError:
+    numpy = None
 #----------------------------
 
 
@@ -65,6 +73,23 @@ default_capacity = 500
 # after asking permission, we cannot ask again until bladder has increased
 # by capacity/fullness_quantum. This method is balanced between large and small bladders.
 fullness_quantum = 5.0
+# events older than compaction_horizon minutes before the latest one are folded away,
+# see Drinker.compact. A day is over 30 half-lives, so those drinks are fully absorbed.
+compaction_horizon = 24*60.0
+# the history is checked for compaction every compaction_batch events
+compaction_batch = 4096
+#------------------------------------------------------------------------------------------------------------
+
+
+
+
+#------------------------------------------------------------------------------------------------------------
+#Exterior Functions:
+#------------------------------------------------------------------------------------------------------------
+def grants_permission(roll, desperation):
+    # The dice game: roll is uniform on [0, 1).
+    # 10% chance of guaranteed yes or no
+    return roll*1.2 - 0.1 > desperation
 #------------------------------------------------------------------------------------------------------------
 
 
@@ -104,70 +129,517 @@ class Release(collections.namedtuple('Release', ['time', 'amount', 'permission']
 
 
 
+#------------------------------------------------------------------------------------------------------------
+#Curve Class:
+#------------------------------------------------------------------------------------------------------------
+class Curve(collections.namedtuple('Curve', ['times', 'bladder', 'absorbed', 'desperation'])):
+    pass
+#------------------------------------------------------------------------------------------------------------
+
+
+
+
+#------------------------------------------------------------------------------------------------------------
+#Snapshot Class:
+#------------------------------------------------------------------------------------------------------------
+class Snapshot(collections.namedtuple('Snapshot', ['time', 'bladder', 'absorbed', 'desperation',
+                                                   'capacity', 'eta', 'roll_allowed'])):
+    pass
+#------------------------------------------------------------------------------------------------------------
+
+
+
+
+#------------------------------------------------------------------------------------------------------------
+#Projection Class:
+#------------------------------------------------------------------------------------------------------------
+class Projection(collections.namedtuple('Projection', ['anchor', 'unabsorbed', 'latent'])):
+    # Where the bladder is heading if nothing else happens: at the latest drink (anchor) there
+    # is unabsorbed water left, which is absorbed with half life h until the bladder holds latent.
+    # It holds no reference to the history, so it can be handed to other threads.
+    def time_to_reach(self, volume):
+        # Same as Drinker.time_to_reach at the time the projection was taken
+        excess_latent_water = self.latent - volume
+        if excess_latent_water > 0 and self.unabsorbed > 0:
+            return self.anchor + h*log2(self.unabsorbed / excess_latent_water)
+        else:
+            return None
+#------------------------------------------------------------------------------------------------------------
+
+
+
+
+#------------------------------------------------------------------------------------------------------------
+#History View Class:
+#------------------------------------------------------------------------------------------------------------
+class HistoryView(collections.abc.Sequence):
+    # Read-only window onto a Drinker's events or event columns, handed out instead of a
+    # defensive copy. Concatenation returns a plain list so that `drinker.history += [...]`
+    # still works.
+    def __init__(self, events):
+        self._events = events
+
+    def __len__(self):
+        return len(self._events)
+
+    def __getitem__(self, index):
+        return self._events[index]
+
+    def __iter__(self):
+        return iter(self._events)
+
+    def __reversed__(self):
+        return reversed(self._events)
+
+    def __add__(self, other):
+        return list(self._events) + list(other)
+
+    def __repr__(self):
+        return 'HistoryView(' + repr(list(self._events)) + ')'
+#------------------------------------------------------------------------------------------------------------
+
+
+
+
+#------------------------------------------------------------------------------------------------------------
+#Event Columns Class:
+#------------------------------------------------------------------------------------------------------------
+class EventColumns(object):
+    # One kind of event stored as parallel, time-ordered array('d') columns. Drink and
+    # Release tuples are only built when an event is read back, so holding hundreds of
+    # thousands of events costs a few dozen bytes each instead of a namedtuple apiece.
+    #
+    # The columns double as a prefix-sum index: cumulative holds the running total of
+    # amounts, and for drinks unabsorbed holds the unabsorbed total as it stood at each
+    # drink's time. Every drink decays with the same half-life, so the unabsorbed part of
+    # all drinks up to row k is unabsorbed[k] * 2 ** ((times[k] - t) / h) for any t after
+    # it. Each row is anchored at its own time, which rebases the sum on every drink and
+    # keeps the exponent from overflowing in sessions of any length.
+    #
+    # Because every row is self-contained, the oldest rows can be dropped without changing
+    # any answer from the rows kept. fold() does so, keeping the last dropped row as the
+    # baseline; floor is then its time, and times before it can no longer be answered.
+    def __init__(self, factory):
+        self._factory = factory
+        self.floor = None
+        self.times = array('d')
+        self.amounts = array('d')
+        self.permissions = array('b')
+        self.cumulative = array('d')
+        self.unabsorbed = array('d')
+
+    def __len__(self):
+        return len(self.times)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._event(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('event index out of range')
+        return self._event(index)
+
+    def __iter__(self):
+        if self._factory is Release:
+            for t, amount, permission in zip(self.times, self.amounts, self.permissions):
+                yield Release(t, amount, bool(permission))
+        else:
+            for t, amount in zip(self.times, self.amounts):
+                yield Drink(t, amount)
+
+    def _event(self, index):
+        if self._factory is Release:
+            return Release(self.times[index], self.amounts[index], bool(self.permissions[index]))
+        else:
+            return Drink(self.times[index], self.amounts[index])
+
+    def _update_prefix(self, start):
+        # Recompute the prefix columns from row start onwards
+        total = self.cumulative[start - 1] if start else 0.0
+        for i in range(start, len(self.times)):
+            total += self.amounts[i]
+            self.cumulative[i] = total
+        if self._factory is Drink:
+            decayed = self.unabsorbed[start - 1] if start else 0.0
+            previous = self.times[start - 1] if start else None
+            for i in range(start, len(self.times)):
+                if previous is not None:
+                    decayed *= 2 ** ((previous - self.times[i]) / h)
+                decayed += self.amounts[i]
+                self.unabsorbed[i] = decayed
+                previous = self.times[i]
+
+    def insert(self, t, amount, permission = False):
+        # O(1) append for events in order, bisect insert after equal times otherwise.
+        # A back-dated event also rewrites the prefix columns after it.
+        if not self.times or t >= self.times[-1]:
+            # Appending only needs the previous row of the prefix columns
+            if self.times:
+                self.cumulative.append(self.cumulative[-1] + amount)
+                if self._factory is Drink:
+                    self.unabsorbed.append(self.unabsorbed[-1] * 2 ** ((self.times[-1] - t) / h) + amount)
+            else:
+                self.cumulative.append(amount)
+                if self._factory is Drink:
+                    self.unabsorbed.append(amount)
+            self.times.append(t)
+            self.amounts.append(amount)
+            self.permissions.append(bool(permission))
+            return len(self.times) - 1
+        else:
+            index = bisect.bisect_right(self.times, t)
+            self.times.insert(index, t)
+            self.amounts.insert(index, amount)
+            self.permissions.insert(index, bool(permission))
+            self.cumulative.insert(index, 0.0)
+            if self._factory is Drink:
+                self.unabsorbed.insert(index, 0.0)
+            self._update_prefix(index)
+            return index
+
+    def count_until(self, t):
+        # Number of events at or before t, O(1) for the common case of t after them all
+        if not self.times or t >= self.times[-1]:
+            return len(self.times)
+        if self.floor is not None and t < self.floor:
+            raise ValueError('time %r is before the compacted history, which starts at %r' % (t, self.floor))
+        return bisect.bisect_right(self.times, t)
+
+    def fold(self, cutoff):
+        # Drop the rows at or before cutoff, except the last, which becomes the baseline.
+        # Returns the number of rows dropped.
+        count = bisect.bisect_right(self.times, cutoff) - 1
+        if count <= 0:
+            return 0
+        for column in (self.times, self.amounts, self.permissions, self.cumulative):
+            del column[:count]
+        if self._factory is Drink:
+            del self.unabsorbed[:count]
+        self.floor = self.times[0]
+        return count
+
+    def total(self):
+        return self.cumulative[-1] if self.cumulative else 0.0
+
+    def total_until(self, t):
+        k = self.count_until(t)
+        return self.cumulative[k - 1] if k else 0.0
+
+    def absorbed_until(self, t):
+        # Absorbed part of the drinks at or before t, as seen at time t
+        k = self.count_until(t)
+        if not k:
+            return 0.0
+        return self.cumulative[k - 1] - self.unabsorbed[k - 1] * 2 ** ((self.times[k - 1] - t) / h)
+
+    def view(self):
+        return HistoryView(self)
+#------------------------------------------------------------------------------------------------------------
+
+
+
+
+#------------------------------------------------------------------------------------------------------------
+#Event Log Class:
+#------------------------------------------------------------------------------------------------------------
+class EventLog(object):
+    # Time-ordered store of Drink and Release events, kept as per-kind EventColumns.
+    # Accidents get their own columns as well, so capacity never has to filter releases.
+    # The merged order is recorded as a kind flag per event plus its index into that
+    # kind's columns. Events nearly always arrive in order, making insert an O(1) append;
+    # back-dated events are placed after any existing events with the same time, which
+    # matches a stable sort.
+    def __init__(self, events = ()):
+        self.drinks = EventColumns(Drink)
+        self.releases = EventColumns(Release)
+        self.accidents = EventColumns(Release)
+        self._kinds = array('b')
+        self._slots = array('l')
+        for event in sorted(events, key = lambda el: el.time):
+            self.insert(event)
+
+    def __len__(self):
+        return len(self._kinds)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        columns = self.releases if self._kinds[index] else self.drinks
+        return columns[self._slots[index]]
+
+    def __iter__(self):
+        drinks = iter(self.drinks)
+        releases = iter(self.releases)
+        for kind in self._kinds:
+            yield next(releases) if kind else next(drinks)
+
+    def _place(self, kind, t, slot, in_order):
+        if in_order:
+            self._kinds.append(kind)
+            self._slots.append(slot)
+        else:
+            position = self.drinks.count_until(t) + self.releases.count_until(t) - 1
+            for i in range(position, len(self._kinds)):
+                if self._kinds[i] == kind:
+                    self._slots[i] += 1
+            self._kinds.insert(position, kind)
+            self._slots.insert(position, slot)
+
+    def insert_drink(self, t, amount):
+        self._check_compacted(t)
+        in_order = self._in_order(t)
+        self._place(0, t, self.drinks.insert(t, amount), in_order)
+
+    def insert_release(self, t, amount, permission):
+        self._check_compacted(t)
+        in_order = self._in_order(t)
+        self._place(1, t, self.releases.insert(t, amount, permission), in_order)
+        if not permission:
+            self.accidents.insert(t, amount, permission)
+
+    def insert(self, event):
+        if isinstance(event, Drink):
+            self.insert_drink(event.time, event.amount)
+        else:
+            self.insert_release(event.time, event.amount, event.permission)
+
+    def _in_order(self, t):
+        return (not self.drinks.times or t >= self.drinks.times[-1]) and \
+            (not self.releases.times or t >= self.releases.times[-1])
+
+    def _check_compacted(self, t):
+        compacted_until = self.compacted_until
+        if compacted_until is not None and t < compacted_until:
+            raise ValueError('cannot insert at %r, the history is compacted until %r' % (t, compacted_until))
+
+    @property
+    def compacted_until(self):
+        # Earliest time the log still answers queries for, None if nothing was folded
+        floors = [columns.floor for columns in (self.drinks, self.releases) if columns.floor is not None]
+        return max(floors) if floors else None
+
+    def compact(self, cutoff):
+        # Fold drinks and releases at or before cutoff into baseline rows, then drop them
+        # from the merged order too. Accidents are kept whole, capacity is learned from them.
+        dropped = (self.drinks.fold(cutoff), self.releases.fold(cutoff))
+        if not any(dropped):
+            return 0
+        kinds = array('b')
+        slots = array('l')
+        for kind, slot in zip(self._kinds, self._slots):
+            slot -= dropped[kind]
+            if slot >= 0:
+                kinds.append(kind)
+                slots.append(slot)
+        self._kinds = kinds
+        self._slots = slots
+        return sum(dropped)
+
+    def view(self):
+        return HistoryView(self)
+#------------------------------------------------------------------------------------------------------------
+
+
+
+
 #------------------------------------------------------------------------------------------------------------
 #Drinker Class:
 #------------------------------------------------------------------------------------------------------------
 class Drinker(object):
-    def __init__(self):
-        random.seed()
-        self._history = []
+    def __init__(self, journal = None, rng = None):
+        # rng, if given, is a random.Random used for the dice game instead of the global one
+        if rng is None:
+            random.seed()
+            rng = random
+        self._rng = rng
+        # journal, if given, is sent every Drink, Release and Permission as it happens
+        self.journal = journal
+        self._history = EventLog()
         self.old_accidents = []
         self._permission = Permission(None, False)
+        # compaction_horizon, in minutes, bounds the history kept in memory in long
+        # sessions, see compact(). None keeps every event. The journal keeps them all anyway.
+        self.compaction_horizon = compaction_horizon
+        # _version counts changes to the history, for caching derived values
+        self._version = 0
+        self._reset_accumulators()
 
     @property
     def history(self):
-        return self._history[:]
+        return self._history.view()
 
     @history.setter
     def history(self, value):
-        self._history = sorted(value, key = lambda el: el.time)
+        self._history = EventLog(value)
+        self._reset_accumulators()
+        releases = self._history.releases
+        for amount, permission in zip(releases.amounts, releases.permissions):
+            self._count_accident(amount, permission)
+
+    @property
+    def permission(self):
+        # The latest permission decision
+        return self._permission
 
     @property
     def drinks(self):
-        return [el for el in self._history if isinstance(el, Drink)]
+        return self._history.drinks.view()
 
     @property
     def releases(self):
-        return [el for el in self._history if isinstance(el, Release)]
+        return self._history.releases.view()
 
     @property
     def accidents(self):
-        return [el for el in self._history if isinstance(el, Release) and not el.permission]
+        return self._history.accidents.view()
+
+    @property
+    def old_accidents(self):
+        return self._old_accidents
+
+    @old_accidents.setter
+    def old_accidents(self, value):
+        # Accident amounts from earlier sessions. Their count and total are taken once
+        # here, so assign a new sequence rather than mutating this one in place.
+        if not isinstance(value, collections.abc.Sized):
+            value = list(value)
+        self._old_accidents = value
+        self._old_accident_count = len(value)
+        self._old_accident_total = float(sum(value))
 
     @property
     def capacity(self):
-        all_accidents = [el.amount for el in self.accidents] + self.old_accidents
-        if all_accidents:
-            new_cap = statistics.mean(all_accidents)
+        # Mean of all accident amounts, kept as a running count and total
+        count = self._accident_count + self._old_accident_count
+        if count:
+            new_cap = (self._accident_total + self._old_accident_total) / count
             return new_cap if new_cap else default_capacity
         else:
             return default_capacity
 
     @property
     def eta(self):
-        excess_latent_water = \
-            sum(el.amount for el in self.drinks) - sum(el.amount for el in self.releases) - self.capacity
-        if excess_latent_water > 0:
-            start_time = min(el.time for el in self.drinks)
+        # Only changes when an event is added or capacity moves, so it is cached on both
+        capacity = self.capacity
+        key = (self._version, capacity)
+        if self._eta_key != key:
+            self._eta = self.time_to_reach(capacity)
+            self._eta_key = key
+        return self._eta
+
+    def time_to_reach(self, volume):
+        # Time at which the bladder will hold volume, assuming no further events
+        drinks = self._history.drinks
+        excess_latent_water = drinks.total() - self._history.releases.total() - volume
+        if excess_latent_water > 0 and len(drinks) and drinks.unabsorbed[-1] > 0:
             # Inverse function of sum(unabsorbed), must be solved by hand algebraically
             # Result will change if additional drinks after ETA is reached
-            return start_time + \
-                h*log2(sum(el.amount * 2 ** ((el.time - start_time) / h) for el in self.drinks) / excess_latent_water)
+            return drinks.times[-1] + h*log2(drinks.unabsorbed[-1] / excess_latent_water)
         else:
             return None
 
+    def projection(self):
+        # The inputs of time_to_reach, frozen, for answering it without the history
+        drinks = self._history.drinks
+        latent = drinks.total() - self._history.releases.total()
+        if len(drinks):
+            return Projection(drinks.times[-1], drinks.unabsorbed[-1], latent)
+        else:
+            return Projection(None, 0.0, latent)
+
+    # The running totals live in the prefix columns of the event log (see EventColumns),
+    # so queries at or after the latest event are O(1) and queries into the past are a
+    # bisect. Only accident statistics and cache keys are tracked here.
+    def _reset_accumulators(self):
+        self._version += 1
+        self._eta_key = None
+        self._eta = None
+        self._accident_count = 0
+        self._accident_total = 0.0
+        self._permission_absorbed = None
+        self._compact_at = compaction_batch
+
+    def _count_accident(self, amount, permission):
+        if not permission:
+            self._accident_count += 1
+            self._accident_total += amount
+
     def absorbed(self, t):
-        return sum(el.amount - el.unabsorbed(t) for el in self.drinks)
+        return self._history.drinks.absorbed_until(t)
+
+    def released(self, t):
+        return self._history.releases.total_until(t)
 
     def bladder(self, t):
-        return self.absorbed(t) - sum(el.amount for el in
-                                      self.releases if el.time <= t)
+        return self.absorbed(t) - self.released(t)
 
     def add_drink(self, t, amount):
-        self.history += [Drink(t, amount)]
+        self._history.insert_drink(t, amount)
+        self._version += 1
+        if self.journal is not None:
+            self.journal.record(Drink(t, amount))
+        # A back-dated drink changes what had been absorbed when permission was asked
+        if self._permission.time is not None and t < self._permission.time:
+            self._permission_absorbed = None
+        self._maybe_compact()
 
     def add_release(self, t, permission):
-        self.history += [Release(t, self.bladder(t), permission)]
+        # Returns the amount released, which is whatever the bladder held at time t
+        amount = self.bladder(t)
+        self._history.insert_release(t, amount, permission)
+        self._version += 1
+        self._count_accident(amount, permission)
+        if self.journal is not None:
+            self.journal.record(Release(t, amount, permission))
+        self._maybe_compact()
+        return amount
+
+    def load_events(self, events):
+        # Restore a recorded stream of Drink, Release and Permission events, such as a
+        # journal, without recomputing release amounts or re-recording anything
+        events = list(events)
+        self.history = [el for el in events if not isinstance(el, Permission)]
+        for el in events:
+            if isinstance(el, Permission):
+                self._permission = el
+        self._permission_absorbed = None
+        self._maybe_compact()
+
+    @property
+    def compacted_until(self):
+        # Earliest time absorbed, released, bladder and friends can still be asked about,
+        # or None if nothing has been compacted away
+        return self._history.compacted_until
+
+    def compact(self, horizon = None):
+        # Fold drinks and releases more than horizon minutes older than the latest event
+        # into baseline rows (see EventColumns.fold), so memory stays bounded however long
+        # the session runs. Answers at or after compacted_until are unchanged, to the bit;
+        # earlier times raise ValueError. history then only lists the events kept, so
+        # assigning it back loses the baseline. Returns the number of events folded away.
+        if horizon is None:
+            horizon = self.compaction_horizon
+        drinks = self._history.drinks
+        releases = self._history.releases
+        if horizon is None or not (len(drinks) or len(releases)):
+            return 0
+        latest = max(columns.times[-1] for columns in (drinks, releases) if len(columns))
+        # Remember what had been absorbed when permission was asked, while it can be answered
+        compacted_until = self.compacted_until
+        if self._permission.time is not None and self._permission_absorbed is None and \
+                (compacted_until is None or self._permission.time >= compacted_until):
+            self._permission_absorbed = self.absorbed(self._permission.time)
+        dropped = self._history.compact(latest - horizon)
+        if dropped:
+            self._version += 1
+        return dropped
+
+    def _maybe_compact(self):
+        # Amortized: a pass over the history at most once every compaction_batch events
+        if self.compaction_horizon is not None and len(self._history) >= self._compact_at:
+            self.compact()
+            self._compact_at = len(self._history) + compaction_batch
 
     def desperation(self, t):
         # Normalize holding over capacity down to 1.0
@@ -175,16 +647,76 @@ class Drinker(object):
         fullness = self.bladder(t)/float(self.capacity)
         return 1.0 if fullness > 1.0 else fullness
 
-    def roll_allowed(self, t):
+    def bladder_curve(self, times):
+        # Batch evaluation of absorbed, bladder and desperation at many times at once,
+        # e.g. for charts and reports. Uses NumPy when it is installed and returns NumPy
+        # arrays, otherwise falls back to bisecting per time and returns array('d') columns.
+        drinks = self._history.drinks
+        releases = self._history.releases
+        capacity = float(self.capacity)
+        if numpy is not None:
+            times = numpy.asarray(times, dtype = float)
+            compacted_until = self.compacted_until
+            if compacted_until is not None and len(times) and times.min() < compacted_until:
+                raise ValueError('time %r is before the compacted history, which starts at %r'
+                                 % (float(times.min()), compacted_until))
+            # Index 0 stands for "no events yet": its time is -inf so that 0 * 2 ** -inf = 0
+            drink_times = numpy.concatenate(([-numpy.inf], numpy.array(drinks.times, dtype = float)))
+            drunk = numpy.concatenate(([0.0], numpy.array(drinks.cumulative, dtype = float)))
+            unabsorbed = numpy.concatenate(([0.0], numpy.array(drinks.unabsorbed, dtype = float)))
+            released = numpy.concatenate(([0.0], numpy.array(releases.cumulative, dtype = float)))
+            k = numpy.searchsorted(drink_times[1:], times, side = 'right')
+            j = numpy.searchsorted(numpy.array(releases.times, dtype = float), times, side = 'right')
+            absorbed = drunk[k] - unabsorbed[k] * numpy.exp2((drink_times[k] - times) / h)
+            bladder = absorbed - released[j]
+            desperation = numpy.minimum(bladder / capacity, 1.0)
+            return Curve(times, bladder, absorbed, desperation)
+        else:
+            times = array('d', times)
+            absorbed = array('d')
+            bladder = array('d')
+            desperation = array('d')
+            for t in times:
+                absorbed_t = drinks.absorbed_until(t)
+                bladder_t = absorbed_t - releases.total_until(t)
+                fullness = bladder_t / capacity
+                absorbed.append(absorbed_t)
+                bladder.append(bladder_t)
+                desperation.append(1.0 if fullness > 1.0 else fullness)
+            return Curve(times, bladder, absorbed, desperation)
+
+    def _roll_allowed(self, absorbed, capacity):
         if not self._permission.time:
             return True
         else:
-            return self.absorbed(t) - self.absorbed(self._permission.time) > self.capacity / fullness_quantum
+            if self._permission_absorbed is None:
+                self._permission_absorbed = self.absorbed(self._permission.time)
+            return absorbed - self._permission_absorbed > capacity / fullness_quantum
 
-    def roll_for_permission(self, t):
-        # 10% chance of guaranteed yes or no
-        roll = random.random()*1.2 - 0.1
-        answer = roll > self.desperation(t)
+    def roll_allowed(self, t):
+        return self._roll_allowed(self.absorbed(t), self.capacity)
+
+    def snapshot(self, t):
+        # Everything the GUI shows at time t, computed together
+        capacity = self.capacity
+        absorbed = self.absorbed(t)
+        bladder = absorbed - self.released(t)
+        fullness = bladder/float(capacity)
+        return Snapshot(t, bladder, absorbed, 1.0 if fullness > 1.0 else fullness,
+                        capacity, self.eta, self._roll_allowed(absorbed, capacity))
+
+    def set_permission(self, t, answer):
+        # Record a permission decision made at time t, as the dice game does below.
+        # Like add_drink and add_release, refuses times before compacted_until, whose
+        # absorbed amount roll_allowed could no longer answer
+        self._history._check_compacted(t)
         self._permission = Permission(t, answer)
+        self._permission_absorbed = None
+        if self.journal is not None:
+            self.journal.record(self._permission)
+
+    def roll_for_permission(self, t):
+        answer = grants_permission(self._rng.random(), self.desperation(t))
+        self.set_permission(t, answer)
         return answer
 #------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,494 @@
+#----------------------------
+# File Headers:
+#----------------------------
+# Shebang:
+#!/usr/bin/env python
+
+
+# Encoding:
+# -*- coding: utf-8 -*-
+
+
+# Docstring:
+"""
+Filename: profiling.py
+Authors: Tsukiko
+Date: 18/10/2026
+Version: 1.0.0
+Description:
+    Opt-in profiling of the running app. While enabled, the hot paths (App.poll, the Drink,
+    Pee and Accident handlers and the Drinker methods) are timed with perf_counter_ns into
+    HDR-style latency histograms, and a Tk after() callback measures how late the main loop
+    runs its timers. The histograms can be exported as a JSON report, along with counters such
+    as how many Tk variable writes bindings.py pushed and suppressed, and a cProfile of the
+    main thread can be recorded and dumped for pstats or snakeviz.
+
+    Profiling is switched on by the OMO_PROFILE environment variable or from the Profiling
+    menu. Set to 1 it only enables profiling, set to a file name it also writes the JSON
+    report there when the app closes.
+
+    Usage:
+        OMO_PROFILE=1 python app.py
+        OMO_PROFILE=profile.json Omo_Tracker.exe
+
+    When disabled, functions decorated with timed() cost one attribute check per call, and
+    instrumented classes are left untouched.
+
+    The Profiler may be used from any thread: the table of histograms and the instrumented
+    classes are guarded by a lock, so the main loop can export a report while the model
+    service creates histograms. Recording into a histogram is not locked: each one should only
+    be recorded into from one thread, which holds as long as the App methods run on the main
+    loop and the Drinker on the model service.
+
+License: MIT License
+Contact: tsukiko1701@gmail.com
+Dependencies: functools, os, threading, time, cProfile, json and platform (imported when first needed)
+"""
+
+
+# Dunders:
+__author__ = "Tsukiko"
+__copyright__ = "Copyright (c) 2025 Tsukiko-030"
+__credits__ = ["Tsukiko"]
+__license__ = "The MIT License (MIT)"
+__version__ = "1.0.0"
+__maintainer__ = "Tsukiko"
+__email__ = "tsukiko1701@gmail.com"
+__status__ = "Production"
+#----------------------------
+
+
+
+
+#----------------------------
+# Import Statements:
+#----------------------------
+import functools
+import os
+import threading
+import time
+# Not needed until profiling is used, imported later so importing this module stays cheap:
+# cProfile, json and platform.
+#----------------------------
+
+
+
+
+#--------------------------------------
+# Exterior Variables:
+#--------------------------------------
+ENVIRONMENT_VARIABLE = 'OMO_PROFILE'
+# Histogram buckets are exact below 2 ** PRECISION_BITS ns and within 1 / 2 ** (PRECISION_BITS - 1) above:
+PRECISION_BITS = 7
+# Percentiles in the report:
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+# The interval of the after() lateness probe, in ms:
+DRIFT_INTERVAL = 500
+#--------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Histogram Class:
+#----------------------------------------------------------------------------------------------------------------------
+class Histogram():
+    # Constructor:
+    def __init__(self, precision_bits=PRECISION_BITS):
+        """
+        Initializes the Histogram Class: a log-linear histogram of non-negative integers, such as
+        latencies in ns. Recording is O(1) and the memory grows with the log of the largest value.
+        """
+        self._bits = precision_bits
+        self._half = 1 << (precision_bits - 1)
+        self.counts = []
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+
+
+
+    # Private Methods:
+    def _index(self, value):
+        """Returns the bucket of value. Below 2 ** bits each value has its own bucket, above that each
+        doubling is split into 2 ** (bits - 1) buckets."""
+        shift = value.bit_length() - self._bits
+        if shift <= 0:
+            return value
+        return shift * self._half + (value >> shift)
+
+
+
+
+    def _bounds(self, index):
+        """Returns the lowest and highest values in bucket index."""
+        if index < 2 * self._half:
+            return index, index
+        shift = index // self._half - 1
+        top = index - shift * self._half
+        return top << shift, ((top + 1) << shift) - 1
+
+
+
+
+    # Public Methods:
+    def record(self, value):
+        value = max(0, int(value))
+        index = self._index(value)
+        if index >= len(self.counts):
+            self.counts.extend([0] * (index + 1 - len(self.counts)))
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+
+
+
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+
+
+
+    def percentile(self, percent):
+        """Returns the highest value equivalent to the percent percentile, like HdrHistogram, or None if empty."""
+        if not self.count:
+            return None
+        rank = max(1, -(-self.count * percent // 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self._bounds(index)[1], self.max)
+        return self.max
+
+
+
+
+    def buckets(self):
+        """Returns [low, high, count] for every bucket holding anything."""
+        return [[*self._bounds(index), count] for index, count in enumerate(self.counts) if count]
+
+
+
+
+    def to_dict(self):
+        summary = {'count': self.count, 'min': self.min, 'max': self.max, 'mean': self.mean()}
+        for percent in PERCENTILES:
+            summary['p' + format(percent, 'g').replace('.', '_')] = self.percentile(percent)
+        summary['buckets'] = self.buckets()
+        return summary
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Profiler Class:
+#----------------------------------------------------------------------------------------------------------------------
+class Profiler():
+    # Constructor:
+    def __init__(self, enabled=False, destination=None, clock=time.perf_counter_ns):
+        """
+        Initializes the Profiler Class.
+        :param enabled: Whether to profile from the start, see enable().
+        :param destination: File the JSON report is written to by close(), or None.
+        :param clock: Nanosecond clock.
+        """
+        self.enabled = False
+        self.destination = destination
+        self._clock = clock
+        self._lock = threading.Lock() # Guards histograms, _targets and _originals
+        self.histograms = {}
+        self._targets = [] # (class, method names, prefix)
+        self._originals = [] # (class, name, original attribute), while enabled
+        self._cprofile = None
+        self._drift_root = None
+        self._drift_interval = DRIFT_INTERVAL
+        self._drift_job = None
+        self._drift_due = None
+        self._counters = {} # name: function returning JSON-ready counts
+        self.started = None
+        if enabled:
+            self.enable()
+
+
+
+
+    # Private Methods:
+    def _wrap(self, function, name):
+        """Returns function timed into the histogram name."""
+        clock = self._clock
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.histogram(name).record(clock() - start)
+        return wrapper
+
+
+
+
+    def _instrument(self, cls, methods, prefix):
+        for method in methods:
+            original = cls.__dict__[method]
+            self._originals.append((cls, method, original))
+            setattr(cls, method, self._wrap(original, prefix + '.' + method))
+
+
+
+
+    def _drift_tick(self):
+        """after() callback: records how late it ran, then schedules itself again."""
+        now = self._clock()
+        self.histogram('tk.after(%d) lateness' % self._drift_interval).record(now - self._drift_due)
+        self._schedule_drift()
+
+
+
+
+    def _schedule_drift(self):
+        self._drift_due = self._clock() + self._drift_interval * 1000000
+        self._drift_job = self._drift_root.after(self._drift_interval, self._drift_tick)
+
+
+
+
+    # Public Methods:
+    def histogram(self, name):
+        """Returns the histogram called name, creating it if needed."""
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.get(name)
+                if histogram is None:
+                    histogram = self.histograms[name] = Histogram()
+        return histogram
+
+
+
+
+    def record(self, name, ns):
+        """Records a latency of ns nanoseconds under name, if enabled."""
+        if self.enabled:
+            self.histogram(name).record(ns)
+
+
+
+
+    def timed(self, name):
+        """
+        Decorator timing each call into the histogram name while profiling is enabled. While
+        disabled the call goes straight through, after one attribute check.
+        """
+        def decorate(function):
+            clock = self._clock
+
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                start = clock()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.histogram(name).record(clock() - start)
+            return wrapper
+        return decorate
+
+
+
+
+    def instrument(self, cls, methods, prefix=None):
+        """
+        Times methods of cls, a class whose code should stay free of profiling such as omo.Drinker,
+        into histograms named prefix.method. The class is only patched while profiling is enabled.
+        """
+        prefix = prefix or cls.__module__ + '.' + cls.__name__
+        with self._lock:
+            self._targets.append((cls, tuple(methods), prefix))
+            if self.enabled:
+                self._instrument(cls, methods, prefix)
+
+
+
+
+    def add_counters(self, name, function):
+        """Reports function(), JSON-ready counts kept by other code such as bindings.counters(), under name."""
+        self._counters[name] = function
+
+
+
+
+    def watch_drift(self, root, interval=DRIFT_INTERVAL):
+        """Measures how late root.after(interval) callbacks run while profiling is enabled."""
+        self.stop_drift()
+        self._drift_root = root
+        self._drift_interval = interval
+        if self.enabled:
+            self._schedule_drift()
+
+
+
+
+    def stop_drift(self):
+        if self._drift_job is not None:
+            self._drift_root.after_cancel(self._drift_job)
+            self._drift_job = None
+
+
+
+
+    def enable(self):
+        """Starts profiling: patches the instrumented classes and starts the drift probe."""
+        if self.enabled:
+            return
+        if self.started is None:
+            self.started = time.time()
+        with self._lock:
+            self.enabled = True
+            for cls, methods, prefix in self._targets:
+                self._instrument(cls, methods, prefix)
+        if self._drift_root is not None:
+            self._schedule_drift()
+
+
+
+
+    def disable(self):
+        """Stops profiling and restores the instrumented classes. The histograms are kept."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.enabled = False
+            for cls, method, original in reversed(self._originals):
+                setattr(cls, method, original)
+            self._originals = []
+        self.stop_drift()
+        self.stop_cprofile()
+
+
+
+
+    def reset(self):
+        """Empties the histograms."""
+        with self._lock:
+            self.histograms = {}
+
+
+
+
+    def start_cprofile(self):
+        """Starts a cProfile of the calling thread, the main loop's in the app. It slows everything down."""
+        if self._cprofile is None:
+            import cProfile
+            self._cprofile = cProfile.Profile()
+        self._cprofile.enable()
+
+
+
+
+    def stop_cprofile(self):
+        if self._cprofile is not None:
+            self._cprofile.disable()
+
+
+
+
+    def dump_cprofile(self, path):
+        """Writes the cProfile recorded so far to path, for pstats or snakeviz. Returns False if there is none."""
+        if self._cprofile is None:
+            return False
+        self._cprofile.dump_stats(path)
+        return True
+
+
+
+
+    def report(self):
+        """Returns the histograms and counters as a JSON-ready dict, latencies in ns."""
+        import platform
+        with self._lock:
+            histograms = sorted(self.histograms.items())
+        return {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'started': self.started and time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started)),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'unit': 'ns',
+            'histograms': {name: histogram.to_dict() for name, histogram in histograms},
+            'counters': {name: function() for name, function in sorted(self._counters.items())},
+        }
+
+
+
+
+    def write_report(self, path):
+        """Writes report() to path as JSON."""
+        import json
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+
+
+
+
+    def close(self):
+        """Writes the report to the destination, if there is one and anything was profiled, and disables profiling."""
+        if self.destination and self.histograms:
+            self.write_report(self.destination)
+        self.disable()
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#--------------------------------------
+# Exterior Functions:
+#--------------------------------------
+def from_environment():
+    """Returns a Profiler configured by OMO_PROFILE: unset or 0 disables it, 1 enables it and anything
+    else is also the file to write the JSON report to on close()."""
+    setting = os.environ.get(ENVIRONMENT_VARIABLE, '')
+    return Profiler(setting not in ('', '0'), None if setting in ('', '0', '1') else setting)
+#--------------------------------------
+
+
+
+
+#----------------------------
+# Profiler of this run:
+#----------------------------
+profiler = from_environment()
+#----------------------------
+
+
+
+
+#--------------------------------------------------------------------------------------------------
+# Ideas for Improvements:
+#--------------------------------------------------------------------------------------------------
+"""
+* Show the histograms in a window, rather than only exporting them.
+"""
+#--------------------------------------------------------------------------------------------------
+
+
+
+
+#--------------------------------------------------------------------------------------------------
+# References:
+#--------------------------------------------------------------------------------------------------
+"""
+* http://hdrhistogram.org/
+* https://docs.python.org/3/library/profile.html
+"""
+#--------------------------------------------------------------------------------------------------
@@ -0,0 +1,201 @@
+#----------------------------
+# File Headers:
+#----------------------------
+# Shebang:
+#!/usr/bin/env python
+
+
+# Encoding:
+# -*- coding: utf-8 -*-
+
+
+# Docstring:
+"""
+Filename: refresh.py
+Authors: Tsukiko
+Date: 18/10/2026
+Version: 1.0.0
+Description:
+    An adaptive refresh scheduler for the GUI. Rather than redrawing on a fixed timer, the app
+    works out when each widget's displayed value will next change: the hold time on the next
+    whole second, the ETA text on the next whole minute, the bladder text on the next mL and
+    the desperation bar on its next pixel. The scheduler then sleeps until the earliest of them,
+    or straight away when wake() is called for a Drink, Pee or Accident.
+
+License: MIT License
+Contact: tsukiko1701@gmail.com
+Dependencies: math
+"""
+
+
+# Dunders:
+__author__ = "Tsukiko"
+__copyright__ = "Copyright (c) 2025 Tsukiko-030"
+__credits__ = ["Tsukiko"]
+__license__ = "The MIT License (MIT)"
+__version__ = "1.0.0"
+__maintainer__ = "Tsukiko"
+__email__ = "tsukiko1701@gmail.com"
+__status__ = "Production"
+#----------------------------
+
+
+
+
+#----------------------------
+# Import Statements:
+#----------------------------
+import math
+#----------------------------
+
+
+
+
+#--------------------------------------
+# Exterior Variables:
+#--------------------------------------
+# Bounds on the delay between refreshes, in seconds. The maximum is a safety net that also
+# paces refreshes while the window is minimized.
+MIN_DELAY = 0.05
+MAX_DELAY = 60.0
+# Wake this long after a computed change, so the refresh lands after the boundary, in seconds:
+MARGIN = 0.005
+#--------------------------------------
+
+
+
+
+#--------------------------------------
+# Exterior Functions:
+#--------------------------------------
+def seconds_until_volume(drinker, volume, t):
+    """Returns the seconds from t (in minutes) until the bladder holds volume, or None if it never will.
+    drinker can be an omo.Drinker or anything else with time_to_reach(), such as a model_service.State."""
+    if volume is None:
+        return None
+    reached = drinker.time_to_reach(volume)
+    if reached is None or reached <= t:
+        return None
+    return (reached - t) * 60.0
+
+
+
+
+def seconds_until_eta_text_changes(eta, t):
+    """Returns the seconds until the whole minutes left to eta, rounded up, next change, or None if they won't."""
+    if eta is None:
+        return None
+    remaining = eta - t
+    if remaining <= 0:
+        return None
+    return (remaining - (math.ceil(remaining) - 1)) * 60.0
+
+
+
+
+def next_rounded_volume(volume):
+    """Returns the volume at which round(volume) next goes up."""
+    return math.floor(volume + 0.5) + 0.5
+
+
+
+
+def next_level_volume(fullness, capacity, levels):
+    """Returns the volume at which a display with levels steps between empty and full shows its next step,
+    or None if it is already full."""
+    if levels <= 0 or fullness >= 1.0:
+        return None
+    return capacity * (math.floor(max(fullness, 0.0) * levels) + 1) / levels
+#--------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# RefreshScheduler Class:
+#----------------------------------------------------------------------------------------------------------------------
+class RefreshScheduler():
+    # Constructor:
+    def __init__(self, root, callback, min_delay=MIN_DELAY, max_delay=MAX_DELAY):
+        """
+        Initializes the RefreshScheduler Class.
+        :param root: Tk root window, used for after() and after_cancel().
+        :param callback: Refresh function, which should end by calling schedule().
+        """
+        self._root = root
+        self._callback = callback
+        self._min_delay = min_delay
+        self._max_delay = max_delay
+        self._job = None
+        self.wakeups = 0
+
+
+
+
+    # Private Methods:
+    def _run(self):
+        """Runs the refresh callback from a scheduled wakeup."""
+        self._job = None
+        self.wakeups += 1
+        self._callback()
+
+
+
+
+    # Public Methods:
+    def next_delay(self, *seconds):
+        """Returns the delay until the earliest of seconds, ignoring None, clamped to the bounds and in seconds."""
+        pending = [delay for delay in seconds if delay is not None]
+        if not pending:
+            return self._max_delay
+        return min(max(min(pending) + MARGIN, self._min_delay), self._max_delay)
+
+
+
+
+    def schedule(self, *seconds):
+        """Schedules the next refresh for the earliest of seconds, replacing any pending one. Returns the delay."""
+        delay = self.next_delay(*seconds)
+        self.cancel()
+        self._job = self._root.after(int(math.ceil(delay * 1000)), self._run)
+        return delay
+
+
+
+
+    def wake(self):
+        """Refreshes immediately, for instance after the user logs an event."""
+        self.cancel()
+        self._callback()
+
+
+
+
+    def cancel(self):
+        """Cancels the pending refresh, if any."""
+        if self._job is not None:
+            self._root.after_cancel(self._job)
+            self._job = None
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#--------------------------------------------------------------------------------------------------
+# Ideas for Improvements:
+#--------------------------------------------------------------------------------------------------
+"""
+* Skip refreshing widgets that are covered or scrolled out of view, not just a minimized window.
+"""
+#--------------------------------------------------------------------------------------------------
+
+
+
+
+#--------------------------------------------------------------------------------------------------
+# References:
+#--------------------------------------------------------------------------------------------------
+"""
+* https://tcl.tk/man/tcl8.6/TclCmd/after.htm
+"""
+#--------------------------------------------------------------------------------------------------
@@ -0,0 +1,214 @@
+#----------------------------
+# File Headers:
+#----------------------------
+# Shebang:
+#!/usr/bin/env python
+
+
+# Encoding:
+# -*- coding: utf-8 -*-
+
+
+# Docstring:
+"""
+Filename: replay.py
+Authors: Tsukiko
+Date: 18/10/2026
+Version: 1.0.0
+Description:
+    Replays a recorded session of Drink, Release and Permission events through an omo.Drinker
+    and streams out the derived timeline: bladder, desperation, ETA and permission state after
+    every event. Sessions can come from a journal file or any iterable of events.
+
+    Usage:
+        python replay.py session.journal > timeline.csv
+        python replay.py --benchmark
+
+License: MIT License
+Contact: tsukiko1701@gmail.com
+Dependencies: collections, csv, random, sys, time, omo.py, journal.py
+"""
+
+
+# Dunders:
+__author__ = "Tsukiko"
+__copyright__ = "Copyright (c) 2025 Tsukiko-030"
+__credits__ = ["Tsukiko"]
+__license__ = "The MIT License (MIT)"
+__version__ = "1.0.0"
+__maintainer__ = "Tsukiko"
+__email__ = "tsukiko1701@gmail.com"
+__status__ = "Production"
+#----------------------------
+
+
+
+
+#----------------------------
+# Import Statements:
+#----------------------------
+import collections
+import csv
+import random
+import sys
+import time
+import omo
+import journal
+#----------------------------
+
+
+
+
+#--------------------------------------
+# Exterior Variables:
+#--------------------------------------
+# Session sizes reported by the benchmark, in events:
+BENCHMARK_SIZES = (10**3, 10**5, 10**6)
+#--------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Frame Class:
+#----------------------------------------------------------------------------------------------------------------------
+class Frame(collections.namedtuple('Frame', ['event', 'bladder', 'desperation', 'eta', 'roll_allowed'])):
+    """The model's state straight after an event was applied. For a Release event, the
+    recorded amount is replaced by the amount the model says was released."""
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#--------------------------------------
+# Exterior Functions:
+#--------------------------------------
+def replay(events, drinker=None):
+    """
+    Applies events in order and yields one Frame per event.
+    :param events: Iterable of Drink, Release and Permission events, in time order.
+    :param drinker: Drinker to replay into, a fresh one by default.
+    """
+    if drinker is None:
+        drinker = omo.Drinker()
+
+    # Bound methods are looked up once, this loop is the whole cost of a replay:
+    add_drink = drinker.add_drink
+    add_release = drinker.add_release
+    set_permission = drinker.set_permission
+    snapshot = drinker.snapshot
+    Drink = omo.Drink
+    Release = omo.Release
+
+    for event in events:
+        t = event.time
+        if isinstance(event, Drink):
+            add_drink(t, event.amount)
+        elif isinstance(event, Release):
+            event = Release(t, add_release(t, event.permission), event.permission)
+        else:
+            set_permission(t, event.permission)
+        state = snapshot(t)
+        yield Frame(event, state.bladder, state.desperation, state.eta, state.roll_allowed)
+
+
+
+
+def replay_file(path):
+    """Replays the session recorded in a journal file, yielding one Frame per event."""
+    return replay(journal.load(path))
+
+
+
+
+def synthetic_session(count, seed=0, start=0.0):
+    """
+    Generates a plausible session of count events for testing and benchmarking: a drink
+    every 10-40 minutes, asking permission once desperate, and a pee or an accident after.
+    """
+    rng = random.Random(seed)
+    t = start
+    stage = 0
+    for _ in range(count):
+        t += rng.uniform(10, 40)
+        if stage < 4:
+            yield omo.Drink(t, float(rng.choice(range(100, 800, 50))))
+            stage += 1
+        elif stage == 4:
+            yield omo.Permission(t, rng.random() < 0.5)
+            stage += 1
+        else:
+            yield omo.Release(t, 0.0, rng.random() < 0.9)
+            stage = 0
+
+
+
+
+def benchmark(sizes=BENCHMARK_SIZES, out=sys.stdout):
+    """Replays synthetic sessions of each size and reports the throughput in events/sec."""
+    results = {}
+    for size in sizes:
+        events = list(synthetic_session(size))
+        start = time.perf_counter()
+        for _ in replay(events):
+            pass
+        elapsed = time.perf_counter() - start
+        results[size] = size / elapsed
+        out.write(f"{size:>9} events: {elapsed:8.3f} s, {results[size]:12,.0f} events/sec\n")
+    return results
+
+
+
+
+def write_timeline(frames, out=sys.stdout):
+    """Writes frames as CSV: time, kind, amount, bladder, desperation, eta, roll_allowed."""
+    writer = csv.writer(out)
+    writer.writerow(['time', 'kind', 'amount', 'bladder', 'desperation', 'eta', 'roll_allowed'])
+    for frame in frames:
+        event = frame.event
+        if isinstance(event, omo.Drink):
+            kind, amount = 'drink', event.amount
+        elif isinstance(event, omo.Release):
+            kind, amount = 'pee' if event.permission else 'accident', event.amount
+        else:
+            kind, amount = 'permission granted' if event.permission else 'permission denied', ''
+        writer.writerow([event.time, kind, amount, frame.bladder, frame.desperation,
+                         '' if frame.eta is None else frame.eta, frame.roll_allowed])
+#--------------------------------------
+
+
+
+
+#--------------------------------------------------------------------------------------------------
+# Ideas for Improvements:
+#--------------------------------------------------------------------------------------------------
+"""
+* Replay a session with a different half-life or capacity, to compare against what happened.
+"""
+#--------------------------------------------------------------------------------------------------
+
+
+
+
+#--------------------------------------------------------------------------------------------------
+# References:
+#--------------------------------------------------------------------------------------------------
+"""
+*
+"""
+#--------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------
+# Main Loop
+#----------------------------
+if __name__ == "__main__":
+    if len(sys.argv) == 2 and sys.argv[1] == '--benchmark':
+        benchmark()
+    elif len(sys.argv) == 2:
+        write_timeline(replay_file(sys.argv[1]))
+    else:
+        sys.exit("Usage: python replay.py SESSION_JOURNAL | --benchmark")
+#----------------------------
@@ -0,0 +1,480 @@
+#----------------------------
+# File Headers:
+#----------------------------
+# Shebang:
+#!/usr/bin/env python
+
+
+# Encoding:
+# -*- coding: utf-8 -*-
+
+
+# Docstring:
+"""
+Filename: server.py
+Authors: Tsukiko
+Date: 18/10/2026
+Version: 1.0.0
+Description:
+    A headless asyncio server hosting many independent omo.Drinker sessions at once, one per
+    person, over a small HTTP/JSON API. Clients can subscribe to a Server-Sent Events stream
+    of their session's state, pushed at a rate of their choosing.
+
+    All pushes are driven by one shared timer loop. Subscribers sit in a timing wheel keyed by
+    the tick they are next due on, so each tick only touches the streams that are due. A
+    session's state after its latest event is O(1) to compute, so a push costs O(1) however
+    long the session has run.
+
+    API, all bodies and responses JSON:
+        POST   /sessions                     Start a session, returns {"id": ..., "state": ...}
+        GET    /sessions/<id>                The session's state
+        DELETE /sessions/<id>                End the session
+        POST   /sessions/<id>/drink          {"amount": mL}, 250 mL by default
+        POST   /sessions/<id>/pee            Release with permission
+        POST   /sessions/<id>/accident       Release without permission
+        POST   /sessions/<id>/permission     Ask permission, 409 if it is too soon to ask again
+        GET    /sessions/<id>/events?interval=<seconds>   text/event-stream of states
+        GET    /stats                        Session, subscriber and push counts
+
+    Usage:
+        python server.py --port 8080
+        python loadgen.py --port 8080 --sessions 1000
+
+License: MIT License
+Contact: tsukiko1701@gmail.com
+Dependencies: argparse, asyncio, collections, itertools, json, random, time, urllib.parse, omo.py
+"""
+
+
+# Dunders:
+__author__ = "Tsukiko"
+__copyright__ = "Copyright (c) 2025 Tsukiko-030"
+__credits__ = ["Tsukiko"]
+__license__ = "The MIT License (MIT)"
+__version__ = "1.0.0"
+__maintainer__ = "Tsukiko"
+__email__ = "tsukiko1701@gmail.com"
+__status__ = "Production"
+#----------------------------
+
+
+
+
+#----------------------------
+# Import Statements:
+#----------------------------
+import argparse
+import asyncio
+import collections
+import itertools
+import json
+import random
+import time
+import urllib.parse
+import omo
+#----------------------------
+
+
+
+
+#--------------------------------------
+# Exterior Variables:
+#--------------------------------------
+# Length of one tick of the shared timer loop, the finest push interval, in seconds:
+TICK = 0.1
+# Push interval used when a subscriber asks for none, in seconds:
+DEFAULT_INTERVAL = 1.0
+# Pushes are skipped for a subscriber with more than this many bytes waiting to be sent:
+MAX_BACKLOG = 64 * 1024
+# Largest request body accepted, in bytes:
+MAX_BODY = 64 * 1024
+DEFAULT_DRINK = 250
+
+REASONS = {200: 'OK', 201: 'Created', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           409: 'Conflict', 413: 'Payload Too Large'}
+#--------------------------------------
+
+
+
+
+#--------------------------------------
+# Exterior Functions:
+#--------------------------------------
+def minutes_now():
+    """The model's clock: wall time in minutes, as in app.py."""
+    return time.time() / 60.0
+
+
+
+
+def state_dict(drinker, t):
+    """Returns the JSON-ready state of drinker at time t."""
+    snapshot = drinker.snapshot(t)
+    permission = drinker.permission
+    return {
+        'time': t,
+        'bladder': snapshot.bladder,
+        'absorbed': snapshot.absorbed,
+        'desperation': snapshot.desperation,
+        'capacity': snapshot.capacity,
+        'eta': snapshot.eta,
+        'roll_allowed': snapshot.roll_allowed,
+        'permission': None if permission.time is None else permission.permission,
+    }
+
+
+
+
+def encode_response(status, payload, keep_alive=True):
+    """Returns an HTTP/1.1 response carrying payload as JSON."""
+    body = json.dumps(payload).encode()
+    head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode() + body
+
+
+
+
+async def read_request(reader):
+    """
+    Reads one HTTP/1.1 request. Returns (method, target, headers, body), or None once the
+    client has closed the connection. Raises ValueError for a malformed request.
+    """
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, _ = line.decode('latin-1').split(' ', 2)
+    except ValueError:
+        raise ValueError("Malformed request line.")
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    length = int(headers.get('content-length', 0) or 0)
+    if length > MAX_BODY:
+        raise OverflowError("Request body too large.")
+    body = await reader.readexactly(length) if length else b''
+    return method.upper(), target, headers, body
+#--------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Subscriber Class:
+#----------------------------------------------------------------------------------------------------------------------
+class Subscriber():
+    """One client's event stream: the session it watches and how many ticks apart to push."""
+    __slots__ = ('session_id', 'writer', 'ticks', 'closed', 'pushes', 'skipped')
+
+    def __init__(self, session_id, writer, ticks):
+        self.session_id = session_id
+        self.writer = writer
+        self.ticks = ticks
+        self.closed = False
+        self.pushes = 0
+        self.skipped = 0
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# SessionServer Class:
+#----------------------------------------------------------------------------------------------------------------------
+class SessionServer():
+    # Constructor:
+    def __init__(self, tick=TICK, clock=minutes_now, seed=None):
+        """
+        Initializes the SessionServer Class. Call start() from inside a running event loop.
+        :param tick: Seconds per tick of the shared timer loop.
+        :param clock: Model time in minutes, wall time by default.
+        :param seed: Seeds the dice of every session, for reproducible runs. Random by default.
+        """
+        self.tick = tick
+        self.clock = clock
+        self.sessions = {}
+        self.subscribers = 0
+        self.ticks = 0
+        self.pushes = 0
+        self._ids = itertools.count(1)
+        self._seeds = random.Random(seed)
+        self._wheel = collections.defaultdict(list) # tick -> Subscribers due then
+        self._server = None
+        self._timer = None
+
+
+
+
+    # Private Methods:
+    async def _tick_loop(self):
+        """The one timer loop behind every push. Each tick only visits the subscribers due on it."""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        while True:
+            self.ticks += 1
+            await asyncio.sleep(max(0.0, start + self.ticks * self.tick - loop.time()))
+            due = self._wheel.pop(self.ticks, None)
+            if due:
+                self._push(due, self.ticks)
+
+
+
+
+    def _push(self, due, tick):
+        """Pushes the state to each due subscriber and files it under its next tick."""
+        t = self.clock()
+        states = {} # Subscribers watching the same session share one encoded state
+        for subscriber in due:
+            if subscriber.closed:
+                continue
+            drinker = self.sessions.get(subscriber.session_id)
+            if drinker is None:
+                self._close(subscriber)
+                continue
+            if subscriber.writer.transport.get_write_buffer_size() > MAX_BACKLOG:
+                subscriber.skipped += 1 # A slow client gets fewer pushes rather than a growing backlog
+            else:
+                message = states.get(subscriber.session_id)
+                if message is None:
+                    message = b'data: ' + json.dumps(state_dict(drinker, t)).encode() + b'\n\n'
+                    states[subscriber.session_id] = message
+                subscriber.writer.write(message)
+                subscriber.pushes += 1
+                self.pushes += 1
+            self._wheel[tick + subscriber.ticks].append(subscriber)
+
+
+
+
+    def _close(self, subscriber):
+        if not subscriber.closed:
+            subscriber.closed = True
+            self.subscribers -= 1
+            subscriber.writer.close()
+
+
+
+
+    def _session(self, session_id):
+        drinker = self.sessions.get(session_id)
+        if drinker is None:
+            raise KeyError(session_id)
+        return drinker
+
+
+
+
+    def handle(self, method, path, payload):
+        """
+        Handles one API call, other than event streams. Returns (status, response payload).
+        Plain function, so the API can be tested and reused without any networking.
+        """
+        parts = [part for part in path.split('/') if part]
+        t = self.clock()
+        try:
+            if parts == ['stats']:
+                return 200, {'sessions': len(self.sessions), 'subscribers': self.subscribers,
+                             'ticks': self.ticks, 'pushes': self.pushes}
+
+            if parts == ['sessions']:
+                if method != 'POST':
+                    return 405, {'error': "Use POST to start a session."}
+                session_id = str(next(self._ids))
+                drinker = omo.Drinker(rng=random.Random(self._seeds.random()))
+                self.sessions[session_id] = drinker
+                return 201, {'id': session_id, 'state': state_dict(drinker, t)}
+
+            if len(parts) == 2 and parts[0] == 'sessions':
+                if method == 'GET':
+                    return 200, state_dict(self._session(parts[1]), t)
+                if method == 'DELETE':
+                    self._session(parts[1])
+                    del self.sessions[parts[1]]
+                    return 200, {'id': parts[1]}
+                return 405, {'error': "Use GET or DELETE."}
+
+            if len(parts) == 3 and parts[0] == 'sessions':
+                drinker = self._session(parts[1])
+                action = parts[2]
+                if method != 'POST':
+                    return 405, {'error': "Use POST."}
+                if action == 'drink':
+                    amount = float(payload.get('amount', DEFAULT_DRINK))
+                    if not amount > 0:
+                        return 400, {'error': "amount must be a positive number of mL."}
+                    drinker.add_drink(t, amount)
+                    return 200, state_dict(drinker, t)
+                if action in ('pee', 'accident'):
+                    released = drinker.add_release(t, action == 'pee')
+                    return 200, dict(state_dict(drinker, t), released=released)
+                if action == 'permission':
+                    if not drinker.roll_allowed(t):
+                        return 409, {'error': "Too soon to ask again.", 'state': state_dict(drinker, t)}
+                    granted = drinker.roll_for_permission(t)
+                    return 200, dict(state_dict(drinker, t), granted=granted)
+        except KeyError:
+            return 404, {'error': "No such session."}
+        except (TypeError, ValueError):
+            return 400, {'error': "Invalid request."}
+        return 404, {'error': "No such endpoint."}
+
+
+
+
+    async def _stream(self, session_id, query, reader, writer):
+        """Serves an event stream until the client disconnects."""
+        try:
+            interval = float(query.get('interval', [DEFAULT_INTERVAL])[0])
+        except ValueError:
+            interval = 0.0
+        if session_id not in self.sessions or not interval > 0:
+            status = 404 if session_id not in self.sessions else 400
+            writer.write(encode_response(status, {'error': "No such session." if status == 404 else "Invalid interval."}, False))
+            await writer.drain()
+            return
+
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n"
+                     b"Connection: keep-alive\r\n\r\n")
+        subscriber = Subscriber(session_id, writer, max(1, round(interval / self.tick)))
+        self.subscribers += 1
+        # Push once straight away, then on the subscriber's own beat:
+        self._push([subscriber], self.ticks)
+        try:
+            while await reader.read(1024):
+                pass
+        finally:
+            self._close(subscriber)
+
+
+
+
+    async def _serve_client(self, reader, writer):
+        """Serves one connection, with keep-alive, until the client closes it."""
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except OverflowError:
+                    writer.write(encode_response(413, {'error': "Request body too large."}, False))
+                    break
+                except (ValueError, asyncio.IncompleteReadError):
+                    writer.write(encode_response(400, {'error': "Malformed request."}, False))
+                    break
+                if request is None:
+                    break
+                method, target, headers, body = request
+
+                url = urllib.parse.urlsplit(target)
+                parts = [part for part in url.path.split('/') if part]
+                if method == 'GET' and len(parts) == 3 and parts[0] == 'sessions' and parts[2] == 'events':
+                    await self._stream(parts[1], urllib.parse.parse_qs(url.query), reader, writer)
+                    return
+
+                try:
+                    payload = json.loads(body) if body else {}
+                    if not isinstance(payload, dict):
+                        raise ValueError
+                except ValueError:
+                    status, response = 400, {'error': "Body must be a JSON object."}
+                else:
+                    status, response = self.handle(method, url.path, payload)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                writer.write(encode_response(status, response, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+
+
+    # Public Methods:
+    async def start(self, host='127.0.0.1', port=0):
+        """Starts listening and the shared timer loop. Returns the port, useful with port=0."""
+        self._server = await asyncio.start_server(self._serve_client, host, port)
+        self._timer = asyncio.get_running_loop().create_task(self._tick_loop())
+        return self._server.sockets[0].getsockname()[1]
+
+
+
+
+    async def serve_forever(self, host='127.0.0.1', port=0):
+        """Starts the server and runs until cancelled."""
+        port = await self.start(host, port)
+        print(f"Serving Omo Tracker sessions on http://{host}:{port}")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.stop()
+
+
+
+
+    async def stop(self):
+        """Stops the timer loop and the listener, and closes every event stream."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        for due in self._wheel.values():
+            for subscriber in due:
+                self._close(subscriber)
+        self._wheel.clear()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#--------------------------------------------------------------------------------------------------
+# Ideas for Improvements:
+#--------------------------------------------------------------------------------------------------
+"""
+* Journal each session to disk, as the app does, so the server can be restarted mid-session.
+* Expire sessions that have been idle for a day.
+"""
+#--------------------------------------------------------------------------------------------------
+
+
+
+
+#--------------------------------------------------------------------------------------------------
+# References:
+#--------------------------------------------------------------------------------------------------
+"""
+* https://docs.python.org/3/library/asyncio-stream.html
+* https://html.spec.whatwg.org/multipage/server-sent-events.html
+"""
+#--------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------
+# Main Loop
+#----------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Host many Omo Tracker sessions over HTTP.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--tick', type=float, default=TICK, help="seconds per tick of the push loop")
+    args = parser.parse_args()
+    try:
+        asyncio.run(SessionServer(args.tick).serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+#----------------------------
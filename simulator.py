@@ -0,0 +1,350 @@
+#----------------------------
+# File Headers:
+#----------------------------
+# Shebang:
+#!/usr/bin/env python
+
+
+# Encoding:
+# -*- coding: utf-8 -*-
+
+
+# Docstring:
+"""
+Filename: simulator.py
+Authors: Tsukiko
+Date: 18/10/2026
+Version: 1.0.0
+Description:
+    A headless Monte Carlo simulator for the permission dice game. Each virtual session is a
+    player with a drinking pattern and a true bladder capacity who asks for permission once
+    desperate enough, pees when allowed and has an accident when the bladder overflows.
+    Sessions are independent and individually seeded, so they are spread across a process
+    pool and the results are identical however many workers are used, and with or without
+    NumPy. Each session's seed is split into independent streams for the drink timing and
+    the dice rolls, so the two are not correlated.
+
+    Sessions are event driven: between events the model's time_to_reach() gives the exact
+    time of the next accident or permission request, so a session costs O(events), not
+    O(minutes).
+
+    Usage:
+        python simulator.py --sessions 100000 --capacity 650 --threshold 0.7
+
+License: MIT License
+Contact: tsukiko1701@gmail.com
+Dependencies: argparse, collections, concurrent.futures, os, random, omo.py, numpy (optional)
+"""
+
+
+# Dunders:
+__author__ = "Tsukiko"
+__copyright__ = "Copyright (c) 2025 Tsukiko-030"
+__credits__ = ["Tsukiko"]
+__license__ = "The MIT License (MIT)"
+__version__ = "1.0.0"
+__maintainer__ = "Tsukiko"
+__email__ = "tsukiko1701@gmail.com"
+__status__ = "Production"
+#----------------------------
+
+
+
+
+#----------------------------
+# Import Statements:
+#----------------------------
+import argparse
+import collections
+import concurrent.futures
+import os
+import random
+import omo
+
+# NumPy is optional, it only speeds up drawing the dice rolls, which are the same either way
+try:
+    import numpy
+except ImportError:
+    numpy = None
+#----------------------------
+
+
+
+
+#--------------------------------------
+# Exterior Variables:
+#--------------------------------------
+# Dice rolls are drawn this many at a time:
+ROLL_BATCH = 256
+#--------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Pattern Class:
+#----------------------------------------------------------------------------------------------------------------------
+class Pattern(collections.namedtuple('Pattern', ['drink_amount', 'drink_interval', 'true_capacity',
+                                                 'ask_threshold', 'duration', 'old_accidents'])):
+    """
+    How a virtual player behaves during a session.
+    drink_amount: mL per drink. drink_interval: mean minutes between drinks, jittered by +/-50%.
+    true_capacity: mL the player can really hold before an accident.
+    ask_threshold: desperation at which the player asks for permission.
+    duration: session length in minutes. old_accidents: accident amounts the app has already learned.
+    """
+Pattern.__new__.__defaults__ = (250.0, 30.0, 700.0, 0.6, 16 * 60.0, ())
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Totals Class:
+#----------------------------------------------------------------------------------------------------------------------
+class Totals(collections.namedtuple('Totals', ['sessions', 'sessions_with_accident', 'accidents', 'pees',
+                                               'asks', 'denials', 'hold_time', 'holds'])):
+    """Additive counts over sessions, so results from different workers can simply be summed."""
+    def __add__(self, other):
+        return Totals(*(a + b for a, b in zip(self, other)))
+Totals.__new__.__defaults__ = (0, 0, 0, 0, 0, 0, 0.0, 0)
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Summary Class:
+#----------------------------------------------------------------------------------------------------------------------
+class Summary(collections.namedtuple('Summary', ['sessions', 'accident_probability', 'accidents_per_session',
+                                                 'pees_per_session', 'denials_per_session', 'permission_rate',
+                                                 'mean_hold_time'])):
+    """Aggregate statistics. accident_probability is the share of sessions with at least one
+    accident, mean_hold_time is in minutes between releases."""
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Rolls Class:
+#----------------------------------------------------------------------------------------------------------------------
+class Rolls():
+    # Constructor:
+    def __init__(self, seed):
+        """
+        Initializes a seeded stream of dice rolls, uniform on [0, 1), drawn in batches. The rolls
+        are those of random.Random(seed), with or without NumPy: seeded with the same 32-bit words,
+        NumPy's legacy Mersenne Twister produces the same stream as the random module's.
+        """
+        if numpy is not None:
+            seed = abs(seed) # As random.Random does.
+            words = [seed & 0xffffffff]
+            while seed >> 32 * len(words):
+                words.append(seed >> 32 * len(words) & 0xffffffff)
+            generator = numpy.random.RandomState(words)
+            self._draw = lambda: generator.random_sample(ROLL_BATCH).tolist()
+        else:
+            generator = random.Random(seed)
+            self._draw = lambda: [generator.random() for _ in range(ROLL_BATCH)]
+        self._batch = []
+        self._index = 0
+
+
+
+
+    # Public Methods:
+    def next(self):
+        """Returns the next roll."""
+        if self._index == len(self._batch):
+            self._batch = self._draw()
+            self._index = 0
+        self._index += 1
+        return self._batch[self._index - 1]
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#--------------------------------------
+# Exterior Functions:
+#--------------------------------------
+def _next_ask(drinker, pattern, t):
+    """Returns the earliest time from t on when the player will ask, or None if they never will."""
+    capacity = drinker.capacity
+    # Desperate enough to ask:
+    desperate = drinker.time_to_reach(pattern.ask_threshold * capacity)
+    if desperate is None:
+        return None
+    candidate = max(t, desperate)
+
+    # And allowed to ask again, i.e. enough has been absorbed since the last request.
+    # Between events absorbed(t) is bladder(t) plus everything released so far.
+    permission = drinker.permission
+    if permission.time:
+        threshold = drinker.absorbed(permission.time) + capacity / omo.fullness_quantum
+        allowed = drinker.time_to_reach(threshold - drinker.released(t))
+        if allowed is None:
+            return None
+        candidate = max(candidate, allowed)
+
+    # time_to_reach() lands exactly on the boundary, step past it:
+    for nudge in (0.0, 1e-9, 1e-6):
+        if drinker.roll_allowed(candidate + nudge):
+            return candidate + nudge
+    return None
+
+
+
+
+def session_seeds(seed):
+    """Splits a session's seed into independent seeds for the drink timing and the dice rolls."""
+    seeder = random.Random(seed)
+    return seeder.getrandbits(64), seeder.getrandbits(64)
+
+
+
+
+def run_session(pattern, seed):
+    """Plays one session and returns its Totals."""
+    timing_seed, roll_seed = session_seeds(seed)
+    rng = random.Random(timing_seed)
+    rolls = Rolls(roll_seed)
+    drinker = omo.Drinker(rng=rng)
+    drinker.old_accidents = list(pattern.old_accidents)
+
+    t = 0.0
+    next_drink = 0.0
+    last_release = 0.0
+    accidents = pees = asks = denials = holds = 0
+    hold_time = 0.0
+
+    while True:
+        # Ties go to the accident, then the request, then the drink:
+        accident = drinker.time_to_reach(pattern.true_capacity)
+        ask = _next_ask(drinker, pattern, t)
+        candidates = [(max(t, accident), 0)] if accident is not None else []
+        candidates += [(ask, 1)] if ask is not None else []
+        candidates.append((next_drink, 2))
+        t, kind = min(candidates)
+        if t > pattern.duration:
+            break
+
+        if kind == 2:
+            drinker.add_drink(t, pattern.drink_amount)
+            next_drink = t + pattern.drink_interval * rng.uniform(0.5, 1.5)
+            continue
+
+        if kind == 0:
+            accidents += 1
+            drinker.add_release(t, False)
+        else:
+            asks += 1
+            granted = omo.grants_permission(rolls.next(), drinker.desperation(t))
+            drinker.set_permission(t, granted)
+            if not granted:
+                denials += 1
+                continue
+            pees += 1
+            drinker.add_release(t, True)
+        holds += 1
+        hold_time += t - last_release
+        last_release = t
+
+    return Totals(1, 1 if accidents else 0, accidents, pees, asks, denials, hold_time, holds)
+
+
+
+
+def run_sessions(pattern, seeds):
+    """Plays a chunk of sessions, one per seed, and returns their summed Totals."""
+    totals = Totals()
+    for seed in seeds:
+        totals += run_session(pattern, seed)
+    return totals
+
+
+
+
+def summarize(totals):
+    """Turns summed Totals into a Summary."""
+    sessions = totals.sessions or 1
+    return Summary(totals.sessions,
+                   totals.sessions_with_accident / sessions,
+                   totals.accidents / sessions,
+                   totals.pees / sessions,
+                   totals.denials / sessions,
+                   (totals.asks - totals.denials) / totals.asks if totals.asks else None,
+                   totals.hold_time / totals.holds if totals.holds else None)
+
+
+
+
+def simulate(pattern, sessions, seed=0, workers=None, chunks_per_worker=4):
+    """
+    Runs sessions virtual sessions and returns a Summary.
+    :param seed: Session i is seeded with seed + i, so results are reproducible.
+    :param workers: Worker processes, os.cpu_count() by default. 1 runs everything in this process.
+    """
+    workers = workers or os.cpu_count() or 1
+    seeds = range(seed, seed + sessions)
+    if workers == 1:
+        return summarize(run_sessions(pattern, seeds))
+
+    # Contiguous chunks of seeds, a few per worker to even out the load:
+    chunk_count = min(sessions, workers * chunks_per_worker) or 1
+    size = -(-sessions // chunk_count)
+    chunks = [seeds[i:i + size] for i in range(0, sessions, size)]
+    totals = Totals()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        for result in pool.map(run_sessions, [pattern] * len(chunks), chunks):
+            totals += result
+    return summarize(totals)
+#--------------------------------------
+
+
+
+
+#--------------------------------------------------------------------------------------------------
+# Ideas for Improvements:
+#--------------------------------------------------------------------------------------------------
+"""
+* Let virtual players leak before a full accident, see "Track leaks" in Ideas.md.
+"""
+#--------------------------------------------------------------------------------------------------
+
+
+
+
+#--------------------------------------------------------------------------------------------------
+# References:
+#--------------------------------------------------------------------------------------------------
+"""
+* https://docs.python.org/3/library/concurrent.futures.html#processpoolexecutor
+"""
+#--------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------
+# Main Loop
+#----------------------------
+if __name__ == "__main__":
+    defaults = Pattern()
+    parser = argparse.ArgumentParser(description="Monte Carlo simulation of the Omo Tracker dice game.")
+    parser.add_argument('--sessions', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--amount', type=float, default=defaults.drink_amount, help="mL per drink")
+    parser.add_argument('--interval', type=float, default=defaults.drink_interval, help="minutes between drinks")
+    parser.add_argument('--capacity', type=float, default=defaults.true_capacity, help="true bladder capacity, mL")
+    parser.add_argument('--threshold', type=float, default=defaults.ask_threshold, help="desperation when asking")
+    parser.add_argument('--duration', type=float, default=defaults.duration, help="session length, minutes")
+    args = parser.parse_args()
+
+    pattern = Pattern(args.amount, args.interval, args.capacity, args.threshold, args.duration, ())
+    summary = simulate(pattern, args.sessions, seed=args.seed, workers=args.workers)
+    for field, value in zip(summary._fields, summary):
+        print(f"{field:>22}: {value}")
+#----------------------------
@@ -0,0 +1,229 @@
+#----------------------------
+# File Headers:
+#----------------------------
+# Shebang:
+#!/usr/bin/env python
+
+
+# Encoding:
+# -*- coding: utf-8 -*-
+
+
+# Docstring:
+"""
+Filename: startup.py
+Authors: Tsukiko
+Date: 18/10/2026
+Version: 1.0.0
+Description:
+    Startup profiling for app.py. When the OMO_PROFILE_STARTUP environment variable is set,
+    every first-time import is timed, like python -X importtime, and so is each startup
+    phase up to the first frame on screen. The report is printed to stderr, or written to
+    the file OMO_PROFILE_STARTUP names, which is useful for the windowed PyInstaller build
+    that has no console.
+
+    Usage:
+        OMO_PROFILE_STARTUP=1 python app.py
+        OMO_PROFILE_STARTUP=startup.txt Omo_Tracker.exe
+
+    Import this module before anything else, so its clock starts as early as possible.
+    Only imports made on the main thread are timed, the background loader's are not.
+
+License: MIT License
+Contact: tsukiko1701@gmail.com
+Dependencies: builtins, os, sys, threading, time
+"""
+
+
+# Dunders:
+__author__ = "Tsukiko"
+__copyright__ = "Copyright (c) 2025 Tsukiko-030"
+__credits__ = ["Tsukiko"]
+__license__ = "The MIT License (MIT)"
+__version__ = "1.0.0"
+__maintainer__ = "Tsukiko"
+__email__ = "tsukiko1701@gmail.com"
+__status__ = "Production"
+#----------------------------
+
+
+
+
+#----------------------------
+# Import Statements:
+#----------------------------
+import builtins
+import os
+import sys
+import threading
+import time
+#----------------------------
+
+
+
+
+#--------------------------------------
+# Exterior Variables:
+#--------------------------------------
+ENVIRONMENT_VARIABLE = 'OMO_PROFILE_STARTUP'
+#--------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# StartupProfile Class:
+#----------------------------------------------------------------------------------------------------------------------
+class StartupProfile():
+    # Constructor:
+    def __init__(self, enabled=False, destination=None, clock=time.perf_counter):
+        """
+        Initializes the StartupProfile Class.
+        :param enabled: Whether to record anything at all, a disabled profile costs nothing.
+        :param destination: File to write the report to, stderr if None.
+        """
+        self.enabled = enabled
+        self.destination = destination
+        self._clock = clock
+        self.start = clock()
+        self.phases = [] # (name, seconds since start)
+        self.imports = [] # (depth, module, self seconds, cumulative seconds), in completion order
+        self._original_import = None
+        self._thread = threading.get_ident()
+        self._depth = 0
+        self._reported = False
+
+
+
+
+    # Private Methods:
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        """Wraps builtins.__import__, timing imports of modules that are not loaded yet."""
+        if level or name in sys.modules or threading.get_ident() != self._thread:
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        depth = self._depth
+        self._depth += 1
+        index = len(self.imports)
+        start = self._clock()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            cumulative = self._clock() - start
+            self._depth = depth
+            # Time spent in nested imports, which were recorded after index, is not this module's own:
+            nested = sum(entry[3] for entry in self.imports[index:] if entry[0] == depth + 1)
+            self.imports.append((depth, name, cumulative - nested, cumulative))
+
+
+
+
+    # Public Methods:
+    def install(self):
+        """Starts timing imports. Does nothing if the profile is disabled or already installed."""
+        if self.enabled and self._original_import is None:
+            self._original_import = builtins.__import__
+            builtins.__import__ = self._import
+
+
+
+
+    def uninstall(self):
+        """Stops timing imports."""
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+
+
+
+    def mark(self, phase):
+        """Records that phase finished now."""
+        if self.enabled:
+            self.phases.append((phase, self._clock() - self.start))
+
+
+
+
+    def elapsed(self, phase):
+        """Returns the seconds from start to phase, or None if it was not marked."""
+        for name, seconds in self.phases:
+            if name == phase:
+                return seconds
+        return None
+
+
+
+
+    def format_report(self):
+        """Returns the report: imports in -X importtime layout, then the startup phases."""
+        lines = ["import time: self [us] | cumulative | imported package"]
+        for depth, name, own, cumulative in self.imports:
+            lines.append(f"import time: {own * 1e6:9.0f} | {cumulative * 1e6:10.0f} | {'  ' * depth}{name}")
+        lines.append("")
+        lines.append("startup phase: elapsed [ms] | phase")
+        for name, seconds in self.phases:
+            lines.append(f"startup phase: {seconds * 1e3:12.1f} | {name}")
+        return "\n".join(lines) + "\n"
+
+
+
+
+    def report(self):
+        """Writes the report once and stops timing imports."""
+        if not self.enabled or self._reported:
+            return
+        self._reported = True
+        self.uninstall()
+        if self.destination:
+            with open(self.destination, 'w') as f:
+                f.write(self.format_report())
+        else:
+            sys.stderr.write(self.format_report())
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#--------------------------------------
+# Exterior Functions:
+#--------------------------------------
+def from_environment():
+    """Returns a StartupProfile configured by OMO_PROFILE_STARTUP: unset or 0 disables it, 1 reports
+    to stderr and anything else is a file to write the report to."""
+    setting = os.environ.get(ENVIRONMENT_VARIABLE, '')
+    enabled = setting not in ('', '0')
+    return StartupProfile(enabled, None if setting in ('', '0', '1') else setting)
+#--------------------------------------
+
+
+
+
+#----------------------------
+# Profile of this run:
+#----------------------------
+profile = from_environment()
+profile.install()
+#----------------------------
+
+
+
+
+#--------------------------------------------------------------------------------------------------
+# Ideas for Improvements:
+#--------------------------------------------------------------------------------------------------
+"""
+* Add a menu entry to show the report of the last start.
+"""
+#--------------------------------------------------------------------------------------------------
+
+
+
+
+#--------------------------------------------------------------------------------------------------
+# References:
+#--------------------------------------------------------------------------------------------------
+"""
+* https://docs.python.org/3/using/cmdline.html#cmdoption-X
+"""
+#--------------------------------------------------------------------------------------------------
@@ -20,9 +20,12 @@ Description:
     consequently it is only designed to track time for hours, not days or beyond
     and it's precision is limited to seconds.
 
+    Time is kept in nanoseconds and only rounded down to whole seconds when read, so pausing
+    and resuming does not lose time. Stopwatches can share one clock.ClockScheduler.
+
 License: MIT License
 Contact: tsukiko1701@gmail.com
-Dependencies: time
+Dependencies: time, clock.py
 """
 
 
@@ -44,6 +47,7 @@ __status__ = "Production"
 # Import Statements:
 #----------------------------
 import time
+from clock import NS_PER_SECOND
 #----------------------------
 
 
@@ -71,10 +75,20 @@ class StopwatchError(Exception):
 #----------------------------------------------------------------------------------------------------------------------
 class Stopwatch():
     # Constructor:
-    def __init__(self):
-        """Initializes the Stopwatch Class."""
+    def __init__(self, scheduler=None, on_tick=None):
+        """
+        Initializes the Stopwatch Class.
+        :param scheduler: A clock.ClockScheduler to run on, so many stopwatches share one clock.
+                          By default the stopwatch reads time.perf_counter_ns() itself.
+        :param on_tick: With a scheduler, called with the stopwatch each time the elapsed whole
+                        seconds go up while it is running.
+        """
+        self._scheduler = scheduler
+        self._now_ns = scheduler.now_ns if scheduler is not None else time.perf_counter_ns
+        self._on_tick = on_tick
+        self._tick_handle = None
         self._start_time = None
-        self._elapsed_time = 0
+        self._elapsed_time = 0 # Nanoseconds, whole seconds are only taken when reporting
         self._running = False
 
 
@@ -84,8 +98,43 @@ class Stopwatch():
     def _update_elapsed_time(self):
         """Updates the _elapsed_time variable. To be used for stopping and resuming the stopwatch."""
         if self.is_running():
-            self._elapsed_time += int(time.perf_counter()) - self._start_time
-            self._start_time = int(time.perf_counter())  # Reset start time for ongoing tracking
+            now = self._now_ns()
+            self._elapsed_time += now - self._start_time
+            self._start_time = now  # Reset start time for ongoing tracking
+
+
+
+
+    def _elapsed_ns(self):
+        """Returns the total elapsed time in nanoseconds."""
+        if self.is_running():
+            return self._elapsed_time + (self._now_ns() - self._start_time)
+        return self._elapsed_time
+
+
+
+
+    def _schedule_tick(self):
+        """Schedules on_tick for the next whole second, if there is a scheduler and a callback."""
+        if self._scheduler is not None and self._on_tick is not None:
+            self._tick_handle = self._scheduler.call_at(
+                self._now_ns() + NS_PER_SECOND - self._elapsed_ns() % NS_PER_SECOND, self._tick)
+
+
+
+
+    def _cancel_tick(self):
+        if self._tick_handle is not None:
+            self._scheduler.cancel(self._tick_handle)
+            self._tick_handle = None
+
+
+
+
+    def _tick(self):
+        """Scheduler callback for each whole second."""
+        self._schedule_tick()
+        self._on_tick(self)
     
 
 
@@ -104,8 +153,9 @@ class Stopwatch():
             raise StopwatchError("The stopwatch is running. Use .stop_stopwatch() to stop the stopwatch.")
         
 
-        self._start_time = int(time.perf_counter())
+        self._start_time = self._now_ns()
         self._running = True
+        self._schedule_tick()
     
 
 
@@ -119,6 +169,7 @@ class Stopwatch():
         # Update elapsed time before stopping:
         self._update_elapsed_time()
         self._running = False
+        self._cancel_tick()
 
 
 
@@ -131,6 +182,7 @@ class Stopwatch():
         
         self._update_elapsed_time()
         self._running = False
+        self._cancel_tick()
 
 
 
@@ -141,8 +193,9 @@ class Stopwatch():
             raise StopwatchError("Cannot resume a running stopwatch.")
         
         
-        self._start_time = int(time.perf_counter())
+        self._start_time = self._now_ns()
         self._running = True
+        self._schedule_tick()
 
 
 
@@ -160,14 +213,19 @@ class Stopwatch():
 
 
     def get_elapsed_time(self):
-        """Returns the total time since the stopwatch was started."""
-        if self.is_running():
-            # Calculate elapsed time without modifying the stored value:
-            return self._elapsed_time + (int(time.perf_counter()) - self._start_time)
-       
-       
-        return self._elapsed_time
+        """Returns the total time since the stopwatch was started, in whole seconds."""
+        return self._elapsed_ns() // NS_PER_SECOND
+
+
+
 
+    def seconds_until_next_change(self):
+        """Returns the seconds until get_elapsed_time() next changes, or None if the stopwatch is not running."""
+        if not self.is_running():
+            return None
+        
+        
+        return (NS_PER_SECOND - self._elapsed_ns() % NS_PER_SECOND) / NS_PER_SECOND
 
 
 
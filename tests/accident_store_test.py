@@ -0,0 +1,134 @@
+#----------------------------
+# Import Statements:
+#----------------------------
+import math
+import os
+import tempfile
+import unittest
+
+import accident_store
+import omo
+#----------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Accident Store Tests:
+#----------------------------------------------------------------------------------------------------------------------
+class AccidentStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'saves', 'accidents.bin')
+        self.store = accident_store.AccidentStore(self.path)
+
+
+
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+
+
+
+    def test_missing_store_is_empty(self):
+        self.assertEqual(len(self.store.amounts()), 0)
+
+
+
+
+    def test_append_and_load(self):
+        self.store.append([(10.0, 600.0), (20.0, 700.0)])
+        self.store.append([(30.0, 800.0)])
+        self.assertEqual(list(self.store.amounts()), [600.0, 700.0, 800.0])
+        self.assertEqual(list(self.store.times()), [10.0, 20.0, 30.0])
+        self.assertEqual(os.path.getsize(self.path), accident_store.HEADER.size + 3 * accident_store.RECORD.size)
+
+
+
+
+    def test_capacity_from_mapped_store(self):
+        self.store.append((i, 500.0 + i) for i in range(1001))
+        drinker = omo.Drinker()
+        drinker.old_accidents = self.store.amounts()
+        self.assertAlmostEqual(drinker.capacity, 1000.0)
+        # Appending releases the mapping, the drinker keeps its statistic
+        self.store.append([(2000.0, 1000.0)])
+        self.assertAlmostEqual(drinker.capacity, 1000.0)
+
+
+
+
+    def test_one_view_per_mapping(self):
+        self.store.append([(1.0, 600.0)])
+        amounts = self.store.amounts()
+        for _ in range(100):
+            self.assertIs(self.store.amounts(), amounts)
+            self.store.times()
+        self.assertEqual(len(self.store._columns), 2)
+        # Remapped on append, the old view is released rather than kept:
+        self.store.append([(2.0, 700.0)])
+        with self.assertRaises(ValueError):
+            amounts[0]
+        self.assertEqual(self.store._columns, {})
+        self.assertEqual(list(self.store.amounts()), [600.0, 700.0])
+
+
+
+
+    def test_torn_record_is_ignored_and_overwritten(self):
+        self.store.append([(1.0, 600.0)])
+        with open(self.path, 'ab') as f:
+            f.write(b'\x00\x01\x02')
+        self.assertEqual(list(self.store.amounts()), [600.0])
+        self.store.append([(2.0, 700.0)])
+        self.assertEqual(list(self.store.amounts()), [600.0, 700.0])
+
+
+
+
+    def test_rejects_other_files(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, 'wb') as f:
+            f.write(b'not an accident store at all')
+        with self.assertRaises(accident_store.AccidentStoreError):
+            self.store.amounts()
+
+
+
+
+    def test_migrate_csv(self):
+        csv_path = os.path.join(self.directory.name, 'accidents.csv')
+        with open(csv_path, 'w', newline='') as f:
+            f.write('612.5\r\n700\r\n')
+        os.makedirs(os.path.dirname(self.path))
+        self.assertEqual(accident_store.migrate_csv(csv_path, self.path), 2)
+        self.assertFalse(os.path.exists(csv_path))
+        self.assertTrue(os.path.exists(csv_path + '.migrated'))
+        self.assertEqual(list(self.store.amounts()), [612.5, 700.0])
+        self.assertTrue(all(math.isnan(t) for t in self.store.times()))
+        # Only runs once
+        self.assertEqual(accident_store.migrate_csv(csv_path, self.path), 0)
+
+
+
+
+    def test_reset(self):
+        self.store.append([(1.0, 600.0)])
+        amounts = self.store.amounts()
+        self.store.reset()
+        self.assertFalse(os.path.exists(self.path))
+        with self.assertRaises(ValueError):
+            amounts[0]
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------
+# Main Loop
+#----------------------------
+if __name__ == "__main__":
+    unittest.main()
+#----------------------------
@@ -0,0 +1,147 @@
+#----------------------------
+# Import Statements:
+#----------------------------
+import threading
+import unittest
+from unittest import mock
+
+import batch_writer
+#----------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Fakes:
+#----------------------------------------------------------------------------------------------------------------------
+class FakeStoreError(Exception):
+    pass
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# BatchWriter Tests:
+#----------------------------------------------------------------------------------------------------------------------
+class BatchWriterTest(unittest.TestCase):
+    def setUp(self):
+        self.batches = []
+        self.threads = []
+        self.writer = None
+
+
+
+
+    def tearDown(self):
+        if self.writer is not None:
+            self.writer.stop()
+
+
+
+
+    def write(self, items):
+        self.threads.append(threading.current_thread())
+        if 'fail' in items:
+            raise OSError("disk full")
+        if 'bug' in items:
+            raise TypeError("unsupported item")
+        if 'die' in items:
+            raise SystemExit
+        self.batches.append(items)
+
+
+
+
+    def start(self, commit_interval):
+        self.writer = batch_writer.BatchWriter(self.write, commit_interval, "test-writer",
+                                               FakeStoreError, "the test store")
+        return self.writer
+
+
+
+
+    def test_items_are_written_in_groups_on_the_writer_thread(self):
+        writer = self.start(60.0)
+        for i in range(10):
+            writer.put(i)
+        writer.stop()
+        self.assertEqual(self.batches, [list(range(10))])
+        self.assertEqual(self.threads[0].name, "test-writer")
+
+
+
+
+    def test_flush_waits_for_the_write(self):
+        writer = self.start(0.01)
+        writer.put(1)
+        writer.flush()
+        writer.put(2)
+        writer.flush()
+        self.assertEqual(self.batches, [[1], [2]])
+
+
+
+
+    def test_failures_are_re_raised_on_the_callers_thread(self):
+        writer = self.start(0.0)
+        writer.put('fail')
+        with self.assertRaises(FakeStoreError) as raised:
+            writer.flush()
+        self.assertEqual(str(raised.exception), "Writing the test store failed: disk full")
+        self.assertIsInstance(raised.exception.__cause__, OSError)
+        # Reported once, and the writer carries on:
+        writer.put(3)
+        writer.flush()
+        self.assertEqual(self.batches, [[3]])
+
+
+
+
+    def test_any_exception_is_re_raised_and_the_writer_carries_on(self):
+        writer = self.start(0.0)
+        writer.put('bug')
+        with self.assertRaises(FakeStoreError) as raised:
+            writer.flush()
+        self.assertIsInstance(raised.exception.__cause__, TypeError)
+        writer.put(4)
+        writer.stop()
+        self.assertEqual(self.batches, [[4]])
+
+
+
+
+    def test_dead_writer_raises_instead_of_blocking(self):
+        writer = self.start(0.0)
+        with mock.patch('threading.excepthook'): # The thread dies on purpose.
+            writer.put('die')
+            writer._thread.join(5)
+        with self.assertRaises(FakeStoreError):
+            writer.put(5)
+        # An item that slipped in as the thread died:
+        writer._queue.put(6)
+        with self.assertRaises(FakeStoreError):
+            writer.flush()
+        writer.stop()
+
+
+
+
+    def test_stop_leaves_failures_for_raise_error(self):
+        writer = self.start(60.0)
+        writer.put('fail')
+        writer.stop()
+        writer.stop()
+        with self.assertRaises(FakeStoreError):
+            writer.raise_error()
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------
+# Main Loop
+#----------------------------
+if __name__ == "__main__":
+    unittest.main()
+#----------------------------
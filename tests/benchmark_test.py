@@ -0,0 +1,71 @@
+#----------------------------
+# Import Statements:
+#----------------------------
+import io
+import unittest
+
+import benchmark
+#----------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Benchmark Tests:
+#----------------------------------------------------------------------------------------------------------------------
+class BenchmarkTest(unittest.TestCase):
+    def test_run_reports_every_operation_and_size(self):
+        results = benchmark.run(sizes=(10, 100), out=io.StringIO())
+        for operation in ('omo.add_drink', 'omo.add_release', 'omo.bladder', 'omo.desperation',
+                          'omo.capacity', 'omo.eta', 'app.poll_tick'):
+            self.assertEqual(sorted(results['ns_per_call'][operation]), ['10', '100'])
+        self.assertEqual(sorted(results['calls_per_second']),
+                         ['stopwatch.output_elapsed_time', 'timer.get_remaining_time'])
+
+
+
+
+    def test_benchmarked_history_is_a_real_session(self):
+        drinker, end = benchmark._drinker(10**4)
+        # Releases void the bladder, so it stays within reach of the capacity rather than piling up:
+        self.assertTrue(any(release.amount > 0.0 for release in drinker.releases))
+        self.assertLess(drinker.bladder(end), 2 * drinker.capacity)
+        self.assertGreater(drinker.capacity, 100.0)
+        self.assertLess(drinker.desperation(end), 1.0)
+
+
+
+
+    def test_scaling_slope(self):
+        self.assertAlmostEqual(benchmark.scaling_slope({'10': 5.0, '1000': 5.0}), 0.0)
+        self.assertAlmostEqual(benchmark.scaling_slope({'10': 10.0, '100': 100.0, '1000': 1000.0}), 1.0)
+        self.assertAlmostEqual(benchmark.scaling_slope({'10': 100.0, '100': 10**4}), 2.0)
+
+
+
+
+    def test_check_flags_super_linear_ticks_and_regressions(self):
+        results = {'ns_per_call': {'app.poll_tick': {'10': 100.0, '100': 10**4}},
+                   'calls_per_second': {'timer.get_remaining_time': 1000.0}}
+        self.assertEqual(len(benchmark.check(results)), 1)
+
+        # Linear growth fails too, a poll tick should cost the same at every size:
+        results['ns_per_call']['app.poll_tick'] = {'10': 100.0, '100': 1000.0}
+        self.assertEqual(len(benchmark.check(results)), 1)
+
+        results['ns_per_call']['app.poll_tick'] = {'10': 100.0, '100': 100.0}
+        self.assertEqual(benchmark.check(results), [])
+        baseline = {'ns_per_call': {'app.poll_tick': {'10': 50.0}},
+                    'calls_per_second': {'timer.get_remaining_time': 2000.0}}
+        self.assertEqual(len(benchmark.check(results, baseline)), 2)
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------
+# Main Loop
+#----------------------------
+if __name__ == "__main__":
+    unittest.main()
+#----------------------------
@@ -0,0 +1,86 @@
+#----------------------------
+# Import Statements:
+#----------------------------
+import unittest
+
+import bindings
+#----------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Fake Tk Variable:
+#----------------------------------------------------------------------------------------------------------------------
+class FakeVariable():
+    """Records set() calls like a tk.StringVar or tk.DoubleVar would receive them."""
+    def __init__(self):
+        self.values = []
+
+    def set(self, value):
+        self.values.append(value)
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Binding Tests:
+#----------------------------------------------------------------------------------------------------------------------
+class BindingTest(unittest.TestCase):
+    def test_skips_unchanged_values(self):
+        variable = FakeVariable()
+        binding = bindings.Binding(variable)
+        self.assertTrue(binding.set("00:00:01"))
+        self.assertFalse(binding.set("00:00:01"))
+        self.assertTrue(binding.set("00:00:02"))
+        self.assertEqual(variable.values, ["00:00:01", "00:00:02"])
+        self.assertEqual((binding.pushed, binding.suppressed), (2, 1))
+
+
+
+
+    def test_quantizes_to_display_levels(self):
+        variable = FakeVariable()
+        binding = bindings.Binding(variable, levels=100)
+        binding.set(0.501)
+        binding.set(0.502)
+        binding.set(0.506)
+        self.assertEqual(variable.values, [0.5, 0.51])
+        self.assertEqual(binding.get(), 0.51)
+
+
+
+
+    def test_resize_forces_next_update(self):
+        variable = FakeVariable()
+        binding = bindings.Binding(variable, levels=100)
+        binding.set(0.5)
+        binding.set_levels(100)
+        self.assertFalse(binding.set(0.5))
+        binding.set_levels(200)
+        self.assertTrue(binding.set(0.5))
+        binding.invalidate()
+        self.assertTrue(binding.set(0.5))
+        self.assertEqual(len(variable.values), 3)
+
+
+
+
+    def test_counters(self):
+        named = {'a': bindings.Binding(FakeVariable()), 'b': bindings.Binding(FakeVariable())}
+        for _ in range(3):
+            named['a'].set(1)
+            named['b'].set("x")
+        self.assertEqual(bindings.counters(named), {'a': (1, 2), 'b': (1, 2), 'total': (2, 4)})
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------
+# Main Loop
+#----------------------------
+if __name__ == "__main__":
+    unittest.main()
+#----------------------------
@@ -0,0 +1,202 @@
+#----------------------------
+# Import Statements:
+#----------------------------
+import math
+import random
+import unittest
+
+import chart
+import omo
+#----------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Fakes:
+#----------------------------------------------------------------------------------------------------------------------
+class FakeCanvas():
+    """Records canvas items instead of drawing them, so no display is needed."""
+    def __init__(self):
+        self.items = {}
+        self.created = 0
+
+    def create_line(self, *coords, **options):
+        self.created += 1
+        self.items[self.created] = (list(coords), options)
+        return self.created
+
+    def coords(self, item):
+        return list(self.items[item][0])
+
+    def delete(self, item):
+        if item == 'all':
+            self.items.clear()
+        else:
+            del self.items[item]
+
+    def tagged(self, tag):
+        return [coords for coords, options in self.items.values() if tag in options.get('tags', ())]
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# LTTB Tests:
+#----------------------------------------------------------------------------------------------------------------------
+class LttbTest(unittest.TestCase):
+    def test_short_series_is_unchanged(self):
+        self.assertEqual(chart.lttb([0, 1, 2], [5, 6, 7], 10), ([0, 1, 2], [5, 6, 7]))
+
+
+
+
+    def test_keeps_endpoints_and_threshold(self):
+        rng = random.Random(1)
+        xs = list(range(1000))
+        ys = [rng.random() for _ in xs]
+        out_x, out_y = chart.lttb(xs, ys, 50)
+        self.assertEqual(len(out_x), 50)
+        self.assertEqual((out_x[0], out_x[-1]), (0, 999))
+        self.assertEqual(out_x, sorted(set(out_x)))
+        self.assertEqual(out_y, [ys[x] for x in out_x])
+
+
+
+
+    def test_keeps_spikes(self):
+        xs = list(range(1000))
+        ys = [0.0] * 1000
+        ys[517] = 100.0
+        out_x, out_y = chart.lttb(xs, ys, 20)
+        self.assertIn(517, out_x)
+
+
+
+
+    def test_tiny_threshold_keeps_endpoints(self):
+        self.assertEqual(chart.lttb([0, 1, 2, 3], [1, 2, 3, 4], 2), ([0, 3], [1, 4]))
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Chart Tests:
+#----------------------------------------------------------------------------------------------------------------------
+class ChartTest(unittest.TestCase):
+    def setUp(self):
+        self.drinker = omo.Drinker()
+        self.drinker.add_drink(0.0, 500)
+        self.drinker.add_drink(40.0, 300)
+        self.canvas = FakeCanvas()
+        self.chart = chart.Chart(self.canvas)
+        self.chart.resize(400, 100)
+        self.chart.set_capacity(self.drinker.capacity)
+        self.chart.set_start(0.0)
+
+
+
+
+    def sample(self, now):
+        times = self.chart.due(now)
+        self.chart.extend(times, self.drinker.bladder_curve(times).bladder)
+
+
+
+
+    def test_samples_in_batches(self):
+        self.assertEqual(len(self.chart.due(1.0)), 13)
+        self.assertEqual(self.chart.due(1.0), [])
+        times = self.chart.due(2.0)
+        self.assertEqual(len(times), 12)
+        self.assertAlmostEqual(times[0], 13 * chart.SAMPLE_INTERVAL)
+
+
+
+
+    def test_ticks_append_segments_without_re_layout(self):
+        layouts = self.chart.layouts
+        for now in range(1, 40):
+            self.sample(float(now))
+        self.assertEqual(self.chart.layouts, layouts)
+        self.assertEqual(self.chart.appends, 39)
+        # Each segment is downsampled to the pixels it covers:
+        for coords in self.canvas.tagged('bladder'):
+            self.assertLessEqual(len(coords) // 2, 2 * math.ceil(400 / 60) + 2)
+
+
+
+
+    def test_segments_are_merged(self):
+        for now in range(1, 59):
+            self.sample(now * 0.9)
+        self.assertLess(len(self.canvas.tagged('bladder')), chart.MAX_SEGMENTS)
+        # The merged line is continuous and in time order:
+        xs = [x for coords in self.canvas.tagged('bladder') for x in coords[::2]]
+        self.assertEqual(xs, sorted(xs))
+
+
+
+
+    def test_session_outgrowing_the_axis_re_lays_out(self):
+        self.sample(30.0)
+        layouts = self.chart.layouts
+        self.sample(90.0)
+        self.assertEqual(self.chart.layouts, layouts + 1)
+        self.assertEqual((self.chart._x0, self.chart._x1), (0.0, 2 * chart.INITIAL_SPAN))
+        line, = self.canvas.tagged('bladder')
+        self.assertLessEqual(len(line) // 2, 400)
+
+
+
+
+    def test_resize_and_zoom_re_lay_out(self):
+        self.sample(50.0)
+        layouts = self.chart.layouts
+        self.chart.resize(400, 100)
+        self.assertEqual(self.chart.layouts, layouts)
+        self.chart.resize(200, 100)
+        self.chart.zoom(20.0)
+        self.assertEqual(self.chart.layouts, layouts + 2)
+        self.assertEqual((self.chart._x0, self.chart._x1), (40.0, 60.0))
+        line, = self.canvas.tagged('bladder')
+        self.assertTrue(all(x >= chart.PAD - 1e-9 for x in line[::2]))
+
+
+
+
+    def test_markers_and_capacity(self):
+        self.chart.add_marker(0.0, 'drink')
+        self.chart.add_marker(40.0, 'drink')
+        self.chart.add_marker(30.0, 'pee')
+        self.assertEqual(list(self.chart.marker_times), [0.0, 30.0, 40.0])
+        self.assertEqual(len(self.canvas.tagged('marker')), 3)
+        self.chart.set_capacity(700.0)
+        self.assertEqual(len(self.canvas.tagged('marker')), 3)
+        capacity, = self.canvas.tagged('capacity')
+        self.assertAlmostEqual(capacity[1], 100 - chart.PAD - (100 - 2 * chart.PAD) / chart.HEADROOM)
+
+
+
+
+    def test_line_follows_the_model(self):
+        self.sample(50.0)
+        self.chart.layout()
+        line, = self.canvas.tagged('bladder')
+        for x, y in zip(line[::2], line[1::2]):
+            t = (x - chart.PAD) / (400 - 2 * chart.PAD) * chart.INITIAL_SPAN
+            volume = (100 - chart.PAD - y) / (100 - 2 * chart.PAD) * self.chart._y_max
+            self.assertAlmostEqual(volume, self.drinker.bladder(t), delta=1e-6)
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------
+# Main Loop
+#----------------------------
+if __name__ == "__main__":
+    unittest.main()
+#----------------------------
@@ -0,0 +1,221 @@
+#----------------------------
+# Import Statements:
+#----------------------------
+import random
+import unittest
+
+import clock
+import stopwatch
+import timer
+#----------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Fake Clock:
+#----------------------------------------------------------------------------------------------------------------------
+class FakeClock():
+    """A nanosecond clock that only moves when told to."""
+    def __init__(self):
+        self.ns = 5 * clock.NS_PER_SECOND
+
+    def __call__(self):
+        return self.ns
+
+    def advance(self, seconds):
+        self.ns += int(seconds * clock.NS_PER_SECOND)
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# ClockScheduler Tests:
+#----------------------------------------------------------------------------------------------------------------------
+class ClockSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.time = FakeClock()
+        self.scheduler = clock.ClockScheduler(self.time)
+        self.fired = []
+
+
+
+
+    def test_fires_due_callbacks_in_deadline_order(self):
+        rng = random.Random(0)
+        delays = [rng.randrange(1, 10**6) for _ in range(10000)]
+        for delay in delays:
+            self.scheduler.call_later(delay, self.fired.append, delay)
+        self.assertEqual(self.scheduler.seconds_until_next(), min(delays) / clock.NS_PER_SECOND)
+
+        self.time.ns += 500000
+        self.scheduler.run_due()
+        self.assertEqual(self.fired, sorted(delay for delay in delays if delay <= 500000))
+        self.time.ns += 500000
+        self.scheduler.run_due()
+        self.assertEqual(self.fired, sorted(delays))
+        self.assertEqual(len(self.scheduler), 0)
+        self.assertIsNone(self.scheduler.seconds_until_next())
+
+
+
+
+    def test_cancel(self):
+        handles = [self.scheduler.call_later(i, self.fired.append, i) for i in range(1000)]
+        for handle in handles[::2]:
+            self.scheduler.cancel(handle)
+        self.scheduler.cancel(handles[0])
+        self.assertEqual(len(self.scheduler), 500)
+        self.time.ns += 1000
+        self.assertEqual(self.scheduler.run_due(), 500)
+        self.assertEqual(self.fired, list(range(1, 1000, 2)))
+        # Cancelling after firing is harmless:
+        self.scheduler.cancel(handles[1])
+        self.assertEqual(len(self.scheduler), 0)
+
+
+
+
+    def test_pause_resume_without_drift(self):
+        self.scheduler.call_later(10 * clock.NS_PER_SECOND, self.fired.append, 'expired')
+        self.time.advance(4)
+        self.scheduler.pause()
+        self.time.advance(100)
+        self.assertEqual(self.scheduler.run_due(), 0)
+        self.assertIsNone(self.scheduler.seconds_until_next())
+        self.scheduler.resume()
+        self.assertEqual(self.scheduler.now_ns(), 4 * clock.NS_PER_SECOND)
+        self.assertEqual(self.scheduler.seconds_until_next(), 6.0)
+        self.time.advance(5.999)
+        self.scheduler.run_due()
+        self.assertEqual(self.fired, [])
+        self.time.advance(0.001)
+        self.scheduler.run_due()
+        self.assertEqual(self.fired, ['expired'])
+
+
+
+
+    def test_callbacks_can_reschedule(self):
+        def again(count):
+            self.fired.append(count)
+            if count < 3:
+                self.scheduler.call_later(0, again, count + 1)
+        self.scheduler.call_later(0, again, 1)
+        self.scheduler.run_due()
+        self.assertEqual(self.fired, [1, 2, 3])
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Scheduled Timer and Stopwatch Tests:
+#----------------------------------------------------------------------------------------------------------------------
+class ScheduledTimerTest(unittest.TestCase):
+    def setUp(self):
+        self.time = FakeClock()
+        self.scheduler = clock.ClockScheduler(self.time)
+        self.expired = []
+
+
+
+
+    def test_many_timers_expire_by_callback(self):
+        countdowns = [timer.Timer(duration, self.scheduler, self.expired.append) for duration in range(1, 1001)]
+        for countdown in countdowns:
+            countdown.start_countdown()
+        self.time.advance(500)
+        self.scheduler.run_due()
+        self.assertEqual(self.expired, countdowns[:500])
+        self.assertFalse(countdowns[0].is_running())
+        self.assertEqual(countdowns[0].get_remaining_time(), 0)
+        self.assertEqual(countdowns[999].get_remaining_time(), 500)
+
+
+
+
+    def test_paused_timer_does_not_expire(self):
+        countdown = timer.Timer(10, self.scheduler, self.expired.append)
+        countdown.start_countdown()
+        self.time.advance(3.5)
+        countdown.pause_countdown()
+        self.time.advance(60)
+        self.scheduler.run_due()
+        self.assertEqual(self.expired, [])
+        self.assertEqual(countdown.get_remaining_time(), 7)
+
+        countdown.resume_countdown()
+        self.time.advance(6.4)
+        self.scheduler.run_due()
+        self.assertEqual(countdown.get_remaining_time(), 1)
+        self.time.advance(0.1)
+        self.scheduler.run_due()
+        self.assertEqual(self.expired, [countdown])
+
+
+
+
+    def test_polled_expiry_fires_once(self):
+        countdown = timer.Timer(2, self.scheduler, self.expired.append)
+        countdown.start_countdown()
+        self.time.advance(2)
+        self.assertEqual(countdown.get_remaining_time(), 0)
+        self.scheduler.run_due()
+        self.assertEqual(self.expired, [countdown])
+
+
+
+
+    def test_pause_resume_keeps_fractions_of_seconds(self):
+        hold_stopwatch = stopwatch.Stopwatch(self.scheduler)
+        hold_stopwatch.start_stopwatch()
+        for _ in range(10):
+            self.time.advance(0.5)
+            hold_stopwatch.pause_stopwatch()
+            self.time.advance(3)
+            hold_stopwatch.resume_stopwatch()
+        self.assertEqual(hold_stopwatch.get_elapsed_time(), 5)
+
+
+
+
+    def test_stopwatch_ticks_each_second(self):
+        ticks = []
+        hold_stopwatch = stopwatch.Stopwatch(self.scheduler, lambda watch: ticks.append(watch.get_elapsed_time()))
+        hold_stopwatch.start_stopwatch()
+        for _ in range(30):
+            self.time.advance(0.1)
+            self.scheduler.run_due()
+        hold_stopwatch.pause_stopwatch()
+        self.time.advance(10)
+        self.scheduler.run_due()
+        self.assertEqual(ticks, [1, 2, 3])
+
+
+
+
+    def test_pausing_the_scheduler_pauses_everything(self):
+        hold_stopwatch = stopwatch.Stopwatch(self.scheduler)
+        countdown = timer.Timer(5, self.scheduler, self.expired.append)
+        hold_stopwatch.start_stopwatch()
+        countdown.start_countdown()
+        self.time.advance(2)
+        self.scheduler.pause()
+        self.time.advance(100)
+        self.scheduler.resume()
+        self.scheduler.run_due()
+        self.assertEqual((hold_stopwatch.get_elapsed_time(), countdown.get_remaining_time()), (2, 3))
+        self.assertEqual(self.expired, [])
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------
+# Main Loop
+#----------------------------
+if __name__ == "__main__":
+    unittest.main()
+#----------------------------
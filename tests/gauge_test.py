@@ -0,0 +1,157 @@
+#----------------------------
+# Import Statements:
+#----------------------------
+import os
+import unittest
+
+import gauge
+#----------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Fakes:
+#----------------------------------------------------------------------------------------------------------------------
+def fake_sprites(max_size=gauge.FRAME_COUNT * len(gauge.SUBSAMPLES)):
+    """A SpriteCache whose images are (path, subsample) tuples, so no display is needed."""
+    return gauge.SpriteCache(max_size, themes={'default': 'art', 'night': 'night_art'},
+                             decode=lambda path: path, scale=lambda image, subsample: (image, subsample))
+
+
+
+
+class FakeLabel():
+    def __init__(self):
+        self.images = []
+
+    def configure(self, image):
+        self.images.append(image)
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Level Tests:
+#----------------------------------------------------------------------------------------------------------------------
+class LevelTest(unittest.TestCase):
+    def test_level_index(self):
+        self.assertEqual(gauge.level_index(-0.5), 0)
+        self.assertEqual(gauge.level_index(0.0), 0)
+        self.assertEqual(gauge.level_index(0.09), 0)
+        self.assertEqual(gauge.level_index(0.1), 1)
+        self.assertEqual(gauge.level_index(0.99), 9)
+        self.assertEqual(gauge.level_index(1.0), 10)
+        self.assertEqual(gauge.level_index(3.0), 10)
+
+
+
+
+    def test_best_subsample(self):
+        self.assertEqual(gauge.best_subsample(2000), 2)
+        self.assertEqual(gauge.best_subsample(540), 2)
+        self.assertEqual(gauge.best_subsample(539), 3)
+        self.assertEqual(gauge.best_subsample(300), 4)
+        self.assertEqual(gauge.best_subsample(10), 8)
+        self.assertEqual(gauge.best_subsample(10, (4, 6)), 6)
+
+
+
+
+    def test_frames_ship_with_the_app(self):
+        for frame in range(gauge.FRAME_COUNT):
+            self.assertTrue(os.path.exists(os.path.join(gauge.THEMES['default'], str(frame) + '.png')))
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# SpriteCache Tests:
+#----------------------------------------------------------------------------------------------------------------------
+class SpriteCacheTest(unittest.TestCase):
+    def test_warm_decodes_each_frame_once(self):
+        sprites = fake_sprites()
+        sprites.warm()
+        sprites.warm()
+        self.assertEqual(sprites.decodes, gauge.FRAME_COUNT)
+        self.assertEqual(len(sprites), gauge.FRAME_COUNT * len(gauge.SUBSAMPLES))
+        self.assertEqual(sprites.get(7, 3), (os.path.join('art', '7.png'), 3))
+        self.assertEqual(sprites.scales(), tuple(sorted(gauge.SUBSAMPLES)))
+
+
+
+
+    def test_get_never_decodes(self):
+        sprites = fake_sprites()
+        self.assertIsNone(sprites.get(0, 2))
+        self.assertEqual((sprites.decodes, sprites.misses), (0, 1))
+
+
+
+
+    def test_bounded_by_least_recently_used(self):
+        sprites = fake_sprites(max_size=gauge.FRAME_COUNT * len(gauge.SUBSAMPLES))
+        sprites.warm()
+        sprites.get(0, 2)
+        sprites.warm('night', subsamples=(4,))
+        self.assertEqual(len(sprites), sprites.max_size)
+        self.assertIsNotNone(sprites.get(0, 2))
+        self.assertEqual(sprites.scales('night'), (4,))
+        # The oldest entries of the default theme made room:
+        self.assertNotIn(2, sprites.scales())
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Gauge Tests:
+#----------------------------------------------------------------------------------------------------------------------
+class GaugeTest(unittest.TestCase):
+    def setUp(self):
+        self.sprites = fake_sprites()
+        self.sprites.warm()
+        self.label = FakeLabel()
+        self.gauge = gauge.Gauge(self.label, self.sprites)
+
+
+
+
+    def test_swaps_only_when_level_changes(self):
+        self.gauge.fit(600)
+        for desperation in (0.0, 0.02, 0.05, 0.11, 0.15, 0.5):
+            self.gauge.set(desperation)
+        self.assertEqual([image[0] for image in self.label.images],
+                         [os.path.join('art', name) for name in ('0.png', '1.png', '5.png')])
+        self.assertEqual(self.gauge.swaps, 3)
+        self.assertEqual(self.gauge.frame, 5)
+
+
+
+
+    def test_resize_swaps_scale(self):
+        self.gauge.set(0.3)
+        self.assertEqual(self.label.images, [])
+        self.gauge.fit(600)
+        self.gauge.fit(580)
+        self.gauge.fit(200)
+        self.assertEqual([image[1] for image in self.label.images], [2, 6])
+
+
+
+
+    def test_levels_match_refresh_steps(self):
+        self.assertEqual(self.gauge.levels, gauge.FRAME_COUNT - 1)
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------
+# Main Loop
+#----------------------------
+if __name__ == "__main__":
+    unittest.main()
+#----------------------------
@@ -0,0 +1,142 @@
+#----------------------------
+# Import Statements:
+#----------------------------
+import os
+import sqlite3
+import tempfile
+import unittest
+
+import hold_store
+#----------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Hold Store Tests:
+#----------------------------------------------------------------------------------------------------------------------
+class HoldStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'saves', 'holds.sqlite3')
+        self.store = hold_store.HoldStore(self.path, commit_interval=0.01)
+
+
+
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+
+
+
+    def record_holds(self):
+        # (start, minutes held, peak, outcome):
+        for start, minutes, peak, outcome in ((0.0, 90.0, 450.0, 'pee'), (100.0, 240.0, 720.0, 'accident'),
+                                              (400.0, 30.0, 200.0, 'pee'), (500.0, 180.0, 650.0, 'accident'),
+                                              (700.0, 120.0, 500.0, 'pee')):
+            self.store.record(start, start + minutes, minutes * 60.0, peak, outcome)
+        self.store.flush()
+
+
+
+
+    def test_records_are_numbered_in_order(self):
+        self.record_holds()
+        self.assertEqual(self.store.count(), 5)
+        self.assertEqual(self.store.count('accident'), 2)
+        self.assertEqual(self.store.latest(1), [hold_store.Hold(5, 700.0, 820.0, 7200.0, 500.0, 'pee')])
+
+
+
+
+    def test_latest(self):
+        self.record_holds()
+        self.assertEqual([hold.number for hold in self.store.latest(3)], [5, 4, 3])
+        self.assertEqual([hold.number for hold in self.store.latest(3, 'accident')], [4, 2])
+
+
+
+
+    def test_longest(self):
+        self.record_holds()
+        self.assertEqual([hold.duration for hold in self.store.longest(2)], [14400.0, 10800.0])
+        self.assertEqual([hold.number for hold in self.store.longest(5, 'pee')], [5, 1, 3])
+
+
+
+
+    def test_between(self):
+        self.record_holds()
+        self.assertEqual([hold.number for hold in self.store.between(100.0, 500.0)], [2, 3, 4])
+        self.assertEqual([hold.number for hold in self.store.between(0.0, 1000.0, 'pee', limit=2)], [1, 3])
+
+
+
+
+    def test_holds_survive_reopening(self):
+        self.record_holds()
+        self.store.close()
+        self.store = hold_store.HoldStore(self.path)
+        self.assertEqual(self.store.count(), 5)
+        self.assertEqual(self.store.latest(1)[0].number, 5)
+
+
+
+
+    def test_close_commits_queued_holds(self):
+        self.store = hold_store.HoldStore(self.path, commit_interval=60.0)
+        self.store.record(0.0, 60.0, 3600.0, 500.0, 'pee')
+        self.store.close()
+        self.store = hold_store.HoldStore(self.path)
+        self.assertEqual(self.store.count(), 1)
+
+
+
+
+    def test_queries_use_indexes(self):
+        connection = sqlite3.connect(self.path)
+        # The newest holds are read straight off the end of the table:
+        plan = " ".join(row[-1] for row in connection.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM holds ORDER BY number DESC LIMIT 10"))
+        self.assertNotIn("TEMP B-TREE", plan)
+        queries = (
+            "SELECT * FROM holds ORDER BY duration DESC LIMIT 10",
+            "SELECT * FROM holds WHERE outcome = 'pee' ORDER BY duration DESC LIMIT 10",
+            "SELECT * FROM holds WHERE outcome = 'pee' ORDER BY number DESC LIMIT 10",
+            "SELECT * FROM holds WHERE start_time >= 0 AND start_time <= 1 ORDER BY start_time",
+        )
+        for query in queries:
+            plan = " ".join(row[-1] for row in connection.execute("EXPLAIN QUERY PLAN " + query))
+            self.assertNotIn("TEMP B-TREE", plan, query)
+            self.assertIn("INDEX", plan, query)
+        connection.close()
+
+
+
+
+    def test_rejects_unknown_outcome(self):
+        with self.assertRaises(hold_store.HoldStoreError):
+            self.store.record(0.0, 60.0, 3600.0, 500.0, 'leak')
+
+
+
+
+    def test_closed_store_refuses_holds(self):
+        self.store.close()
+        with self.assertRaises(hold_store.HoldStoreError):
+            self.store.record(0.0, 60.0, 3600.0, 500.0, 'pee')
+        with self.assertRaises(hold_store.HoldStoreError):
+            self.store.latest(1)
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------
+# Main Loop
+#----------------------------
+if __name__ == "__main__":
+    unittest.main()
+#----------------------------
@@ -0,0 +1,130 @@
+#----------------------------
+# Import Statements:
+#----------------------------
+import os
+import tempfile
+import unittest
+
+import journal
+import omo
+#----------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Journal Tests:
+#----------------------------------------------------------------------------------------------------------------------
+class JournalTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'saves', 'session.journal')
+
+
+
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+
+
+
+    def test_rebuilds_drinker_after_crash(self):
+        drinker = omo.Drinker(journal.Journal(self.path, commit_interval=0.01))
+        drinker.add_drink(0.0, 500)
+        drinker.add_drink(20.0, 250)
+        drinker.roll_for_permission(60.0)
+        drinker.add_release(70.0, False)
+        drinker.journal.flush()
+
+        # No close(): the session ends as if the process had been killed
+        restored = journal.rebuild(self.path)
+        self.assertEqual(list(restored.history), list(drinker.history))
+        self.assertEqual(restored.capacity, drinker.capacity)
+        self.assertEqual(restored.roll_allowed(80.0), drinker.roll_allowed(80.0))
+        drinker.journal.close()
+
+
+
+
+    def test_torn_final_row_is_skipped(self):
+        log = journal.Journal(self.path)
+        log.record(omo.Drink(1.5, 300.0))
+        log.close()
+        with open(self.path, 'a') as f:
+            f.write('R,2.0,')
+        self.assertEqual(journal.load(self.path), [omo.Drink(1.5, 300.0)])
+
+
+
+
+    def test_torn_final_row_that_parses_is_skipped(self):
+        log = journal.Journal(self.path)
+        log.record(omo.Drink(1.5, 300.0))
+        log.close()
+        with open(self.path, 'a') as f:
+            f.write('D,2.0,25') # Cut from D,2.0,250.0
+        self.assertEqual(journal.load(self.path), [omo.Drink(1.5, 300.0)])
+
+
+
+
+    def test_reopening_after_a_crash_cuts_off_the_torn_row(self):
+        log = journal.Journal(self.path)
+        log.record(omo.Drink(1.5, 300.0))
+        log.close()
+        with open(self.path, 'a') as f:
+            f.write('D,2.0,25')
+
+        # The next start rebuilds the session, then reopens the journal and carries on:
+        self.assertEqual(journal.load(self.path), [omo.Drink(1.5, 300.0)])
+        log = journal.Journal(self.path)
+        log.record(omo.Drink(3.0, 100.0))
+        log.close()
+        self.assertEqual(journal.load(self.path), [omo.Drink(1.5, 300.0), omo.Drink(3.0, 100.0)])
+
+
+
+
+    def test_repair(self):
+        os.makedirs(os.path.dirname(self.path))
+        self.assertEqual(journal.repair(self.path), 0)
+        with open(self.path, 'w', newline='') as f:
+            f.write('D,1.0,100.0\r\n' * 1000 + 'R,2.0,3')
+        self.assertEqual(journal.repair(self.path, block_size=7), 7)
+        self.assertEqual(journal.repair(self.path), 0)
+        self.assertEqual(len(journal.load(self.path)), 1000)
+        with open(self.path, 'w') as f:
+            f.write('D,1.0,')
+        self.assertEqual(journal.repair(self.path), 6)
+        self.assertEqual(os.path.getsize(self.path), 0)
+
+
+
+
+    def test_close_discards_saved_session(self):
+        log = journal.Journal(self.path)
+        log.record(omo.Drink(1.0, 100.0))
+        log.close(discard=True)
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(journal.load(self.path), [])
+
+
+
+
+    def test_closed_journal_refuses_events(self):
+        log = journal.Journal(self.path)
+        log.close()
+        with self.assertRaises(journal.JournalError):
+            log.record(omo.Drink(1.0, 100.0))
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------
+# Main Loop
+#----------------------------
+if __name__ == "__main__":
+    unittest.main()
+#----------------------------
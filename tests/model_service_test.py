@@ -0,0 +1,323 @@
+#----------------------------
+# Import Statements:
+#----------------------------
+import os
+import queue
+import subprocess
+import sys
+import threading
+import unittest
+
+import model_service
+import omo
+#----------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Fakes:
+#----------------------------------------------------------------------------------------------------------------------
+class FakeRoot():
+    """Stands in for the Tk root: generated events are handled when the test says so."""
+    def __init__(self):
+        self.bindings = {}
+        self.events = []
+        self.lock = threading.Lock()
+
+    def bind(self, sequence, callback, add=None):
+        self.bindings[sequence] = callback
+        return 'binding'
+
+    def unbind(self, sequence, funcid=None):
+        del self.bindings[sequence]
+
+    def event_generate(self, sequence, when=None):
+        with self.lock:
+            self.events.append(sequence)
+
+    def run_pending(self):
+        with self.lock:
+            events, self.events = self.events, []
+        for sequence in events:
+            if sequence in self.bindings:
+                self.bindings[sequence]()
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# ModelService Tests:
+#----------------------------------------------------------------------------------------------------------------------
+class ModelServiceTest(unittest.TestCase):
+    def setUp(self):
+        self.states = queue.Queue()
+        self.errors = queue.Queue()
+        self.service = model_service.ModelService(publish=self.states.put, on_error=self.errors.put)
+        self.service.start()
+
+
+
+
+    def tearDown(self):
+        self.service.stop()
+
+
+
+
+    def test_publishes_state_after_each_command(self):
+        self.service.add_drink(0.0, 500)
+        self.service.refresh(30.0)
+        self.service.add_release(60.0, True)
+        drink, refreshed, release = (self.states.get(timeout=5) for _ in range(3))
+
+        expected = omo.Drinker()
+        expected.add_drink(0.0, 500)
+        self.assertEqual(tuple(drink)[:7], tuple(expected.snapshot(0.0)))
+        self.assertEqual(tuple(refreshed)[:7], tuple(expected.snapshot(30.0)))
+        expected.add_release(60.0, True)
+        self.assertEqual(tuple(release)[:7], tuple(expected.snapshot(60.0)))
+        self.assertEqual([state.version for state in (drink, refreshed, release)], [1, 2, 3])
+
+
+
+
+    def test_state_answers_time_to_reach(self):
+        self.service.add_drink(0.0, 500)
+        state = self.states.get(timeout=5)
+        expected = omo.Drinker()
+        expected.add_drink(0.0, 500)
+        for volume in (100.0, 250.0, 499.0, 500.0, 600.0):
+            self.assertEqual(state.time_to_reach(volume), expected.time_to_reach(volume))
+        self.assertEqual(state.eta, expected.eta)
+
+
+
+
+    def test_commands_run_on_the_worker_thread(self):
+        threads = []
+        future = self.service.submit(lambda drinker, amount: (threads.append(threading.current_thread()),
+                                                              drinker.add_drink(0.0, amount)), 250)
+        future.result(timeout=5)
+        count = self.service.submit(lambda drinker: len(drinker.drinks)).result(timeout=5)
+        self.assertEqual(count, 1)
+        self.assertIsNot(threads[0], threading.current_thread())
+        self.assertEqual(threads[0].name, "Model Service")
+
+
+
+
+    def test_submit_reports_exceptions(self):
+        future = self.service.submit(lambda drinker: 1 / 0)
+        with self.assertRaises(ZeroDivisionError):
+            future.result(timeout=5)
+        # The worker carries on:
+        self.service.refresh(0.0)
+        self.assertEqual(self.states.get(timeout=5).bladder, 0.0)
+
+
+
+
+    def test_command_errors_go_to_on_error(self):
+        self.service.add_drink(0.0, None)
+        self.assertIsInstance(self.errors.get(timeout=5), TypeError)
+
+
+
+
+    def test_stop_finishes_queued_commands(self):
+        for i in range(100):
+            self.service.add_drink(float(i), 100)
+        self.service.stop()
+        published = 0
+        while not self.states.empty():
+            published += 1
+            last = self.states.get()
+        self.assertEqual(published, 100)
+        self.assertEqual(last.time, 99.0)
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Loading Tests:
+#----------------------------------------------------------------------------------------------------------------------
+class LoadingTest(unittest.TestCase):
+    def test_commands_wait_for_load(self):
+        release = threading.Event()
+        def load():
+            release.wait(5)
+            drinker = omo.Drinker()
+            drinker.add_drink(0.0, 300)
+            return drinker
+
+        states = queue.Queue()
+        service = model_service.ModelService(load, states.put)
+        service.start()
+        service.refresh(10.0)
+        self.assertFalse(service.loaded.is_set())
+        release.set()
+        self.assertGreater(states.get(timeout=5).bladder, 0.0)
+        self.assertTrue(service.loaded.is_set())
+        service.stop()
+
+
+
+
+    def test_load_errors_go_to_on_error(self):
+        errors = queue.Queue()
+        def load():
+            raise OSError("no such journal")
+        service = model_service.ModelService(load, on_error=errors.put)
+        service.start()
+        self.assertIsInstance(errors.get(timeout=5), OSError)
+        service.stop()
+        self.assertFalse(service.loaded.is_set())
+
+
+
+
+    def test_omo_is_only_imported_by_the_worker(self):
+        # So the GUI's first frame doesn't wait for omo and numpy:
+        code = ("import sys, model_service, virtual_list\n"
+                "assert 'omo' not in sys.modules\n"
+                "service = model_service.ModelService()\n"
+                "service.start()\n"
+                "service.stop()\n"
+                "assert 'omo' in sys.modules and service.loaded.is_set()\n")
+        subprocess.run([sys.executable, '-c', code], cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       check=True)
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Inbox Tests:
+#----------------------------------------------------------------------------------------------------------------------
+class InboxTest(unittest.TestCase):
+    def setUp(self):
+        self.root = FakeRoot()
+        self.inbox = model_service.Inbox(self.root)
+        self.main_thread = threading.current_thread()
+        self.calls = []
+
+
+
+
+    def record(self, value):
+        self.calls.append((value, threading.current_thread()))
+
+
+
+
+    def test_worker_states_are_handled_on_the_main_loop(self):
+        service = model_service.ModelService(publish=lambda state: self.inbox.put(self.record, state))
+        service.start()
+        self.inbox.start()
+        service.add_drink(0.0, 500)
+        service.refresh(10.0)
+        service.stop()
+        self.assertEqual(self.calls, [])
+        self.root.run_pending()
+        self.assertEqual([state.time for state, thread in self.calls], [0.0, 10.0])
+        self.assertTrue(all(thread is self.main_thread for state, thread in self.calls))
+
+
+
+
+    def test_wakes_the_main_loop_only_when_there_is_something_to_drain(self):
+        self.inbox.start()
+        self.root.run_pending()
+        self.assertEqual(self.root.events, [])
+        self.inbox.put(self.record, 1)
+        self.inbox.put(self.record, 2)
+        self.assertEqual(self.root.events, [model_service.INBOX_EVENT])
+        self.root.run_pending()
+        self.assertEqual([value for value, thread in self.calls], [1, 2])
+        self.assertEqual(self.root.events, [])
+        self.inbox.put(self.record, 3)
+        self.assertEqual(len(self.root.events), 1)
+
+
+
+
+    def test_calls_queued_before_start_are_drained_once_started(self):
+        self.inbox.put(self.record, 1)
+        self.assertEqual(self.root.events, [])
+        self.inbox.start()
+        self.root.run_pending()
+        self.assertEqual(self.calls[0][0], 1)
+
+
+
+
+    def test_a_failed_wakeup_is_retried_by_the_next_put(self):
+        self.inbox.start()
+        self.root.run_pending()
+        generate = self.root.event_generate
+        def fail(sequence, when=None):
+            raise RuntimeError("main thread is not in main loop")
+        self.root.event_generate = fail
+        self.inbox.put(self.record, 1)
+        self.root.event_generate = generate
+        self.inbox.put(self.record, 2)
+        self.root.run_pending()
+        self.assertEqual([value for value, thread in self.calls], [1, 2])
+
+
+
+
+    def test_main_loop_chains_futures_instead_of_waiting(self):
+        gate = threading.Event()
+        service = model_service.ModelService()
+        service.start()
+        service.submit(lambda drinker: gate.wait(5))
+        future = service.submit(lambda drinker: len(drinker.drinks))
+        future.add_done_callback(lambda future: self.inbox.put(self.record, future.result()))
+        # The main loop carries on while the worker is busy:
+        self.assertEqual(self.inbox.drain(), 0)
+        gate.set()
+        service.stop()
+        self.assertEqual(self.inbox.drain(), 1)
+        self.assertEqual(self.calls[0][0], 0)
+
+
+
+
+    def test_stopping_leaves_the_rest_queued(self):
+        self.inbox.start()
+        self.inbox.put(self.inbox.stop)
+        self.inbox.put(self.record, 1)
+        self.root.run_pending()
+        self.assertEqual((self.calls, self.root.bindings), ([], {}))
+        self.inbox.put(self.record, 2)
+        self.assertEqual(self.root.events, [])
+        self.assertEqual(self.inbox.drain(), 2)
+        self.assertEqual([value for value, thread in self.calls], [1, 2])
+
+
+
+
+    def test_a_failing_call_wakes_the_main_loop_for_the_rest(self):
+        self.inbox.start()
+        self.inbox.put(lambda: 1 / 0)
+        self.inbox.put(self.record, 1)
+        with self.assertRaises(ZeroDivisionError):
+            self.root.run_pending()
+        self.assertEqual(len(self.root.events), 1)
+        self.root.run_pending()
+        self.assertEqual(self.calls[0][0], 1)
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------
+# Main Loop
+#----------------------------
+if __name__ == "__main__":
+    unittest.main()
+#----------------------------
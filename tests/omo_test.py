@@ -0,0 +1,517 @@
+#----------------------------
+# Import Statements:
+#----------------------------
+from math import log2
+import random
+import statistics
+import unittest
+
+import omo
+#----------------------------
+
+
+
+
+#--------------------------------------
+# Exterior Functions:
+#--------------------------------------
+# Reference O(n) formulas, as the model was originally written. The incremental
+# implementation in omo.Drinker must agree with these.
+def reference_absorbed(drinker, t):
+    return sum(el.amount - el.unabsorbed(t) for el in drinker.drinks)
+
+
+def reference_bladder(drinker, t):
+    return reference_absorbed(drinker, t) - sum(el.amount for el in drinker.releases if el.time <= t)
+
+
+def reference_desperation(drinker, t):
+    fullness = reference_bladder(drinker, t)/float(drinker.capacity)
+    return 1.0 if fullness > 1.0 else fullness
+
+
+def reference_eta(drinker):
+    excess_latent_water = \
+        sum(el.amount for el in drinker.drinks) - sum(el.amount for el in drinker.releases) - drinker.capacity
+    if excess_latent_water > 0:
+        start_time = min(el.time for el in drinker.drinks)
+        return start_time + \
+            omo.h*log2(sum(el.amount * 2 ** ((el.time - start_time) / omo.h) for el in drinker.drinks) / excess_latent_water)
+    else:
+        return None
+
+
+def random_session(rng, start, events, compaction_horizon = omo.compaction_horizon):
+    drinker = omo.Drinker()
+    drinker.compaction_horizon = compaction_horizon
+    t = start
+    for _ in range(events):
+        t += rng.uniform(0, 60)
+        if rng.random() < 0.7:
+            drinker.add_drink(t, rng.choice(range(100, 800, 50)))
+        else:
+            drinker.add_release(t, rng.random() < 0.8)
+    return drinker, t
+#--------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Incremental Model Tests:
+#----------------------------------------------------------------------------------------------------------------------
+class IncrementalModelTest(unittest.TestCase):
+    def assertClose(self, actual, expected):
+        self.assertAlmostEqual(actual, expected, delta = 1e-6 * max(1.0, abs(expected)))
+
+
+
+
+    def test_empty_drinker(self):
+        drinker = omo.Drinker()
+        self.assertEqual(drinker.absorbed(100.0), 0)
+        self.assertEqual(drinker.bladder(100.0), 0)
+        self.assertEqual(drinker.desperation(100.0), 0)
+        self.assertTrue(drinker.roll_allowed(100.0))
+
+
+
+
+    def test_matches_reference_at_and_after_latest_event(self):
+        rng = random.Random(1)
+        for _ in range(20):
+            drinker, end = random_session(rng, 0.0, 50)
+            for t in (end, end + 1, end + 45, end + 600):
+                self.assertClose(drinker.absorbed(t), reference_absorbed(drinker, t))
+                self.assertClose(drinker.bladder(t), reference_bladder(drinker, t))
+                self.assertClose(drinker.desperation(t), reference_desperation(drinker, t))
+
+
+
+
+    def test_matches_reference_in_the_past(self):
+        rng = random.Random(2)
+        drinker, end = random_session(rng, 0.0, 100)
+        for _ in range(200):
+            t = rng.uniform(-10, end)
+            self.assertClose(drinker.bladder(t), reference_bladder(drinker, t))
+
+
+
+
+    def test_back_dated_events(self):
+        drinker = omo.Drinker()
+        drinker.add_drink(100.0, 500)
+        drinker.add_drink(40.0, 250)
+        drinker.add_release(90.0, True)
+        drinker.add_drink(70.0, 300)
+        for t in (40.0, 80.0, 100.0, 150.0):
+            self.assertClose(drinker.bladder(t), reference_bladder(drinker, t))
+
+
+
+
+    def test_prefix_index_after_back_dated_inserts(self):
+        rng = random.Random(10)
+        drinker = omo.Drinker()
+        for _ in range(150):
+            t = rng.uniform(0, 2000)
+            if rng.random() < 0.7:
+                drinker.add_drink(t, rng.choice(range(100, 800, 50)))
+            else:
+                drinker.add_release(t, True)
+        for _ in range(100):
+            t = rng.uniform(-10, 2100)
+            self.assertClose(drinker.bladder(t), reference_bladder(drinker, t))
+
+
+
+
+    def test_multi_day_session_does_not_overflow(self):
+        # Wall clock minutes, as used by the app, over a week of drinking
+        rng = random.Random(3)
+        drinker, end = random_session(rng, 29000000.0, 400)
+        self.assertGreater(end - 29000000.0, 7 * 24 * 60)
+        self.assertClose(drinker.bladder(end), reference_bladder(drinker, end))
+        self.assertClose(drinker.bladder(end + 30), reference_bladder(drinker, end + 30))
+
+
+
+
+    def test_history_setter_rebuilds_totals(self):
+        rng = random.Random(4)
+        source, end = random_session(rng, 0.0, 30)
+        drinker = omo.Drinker()
+        drinker.history = reversed(source.history)
+        self.assertClose(drinker.bladder(end + 5), source.bladder(end + 5))
+
+
+
+
+    def test_roll_allowed_matches_reference(self):
+        drinker = omo.Drinker()
+        drinker.add_drink(0.0, 500)
+        drinker.roll_for_permission(10.0)
+        capacity = drinker.capacity
+        for t in (10.0, 20.0, 40.0, 90.0):
+            expected = reference_absorbed(drinker, t) - reference_absorbed(drinker, 10.0) > capacity / omo.fullness_quantum
+            self.assertEqual(drinker.roll_allowed(t), expected)
+
+        # A drink logged late, before permission was asked, moves the baseline
+        drinker.add_drink(5.0, 750)
+        for t in (10.0, 20.0, 40.0):
+            expected = reference_absorbed(drinker, t) - reference_absorbed(drinker, 10.0) > capacity / omo.fullness_quantum
+            self.assertEqual(drinker.roll_allowed(t), expected)
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Event Log Tests:
+#----------------------------------------------------------------------------------------------------------------------
+class EventLogTest(unittest.TestCase):
+    def test_history_stays_time_ordered(self):
+        rng = random.Random(5)
+        drinker = omo.Drinker()
+        added = []
+        for i in range(200):
+            t = rng.uniform(0, 1000)
+            if i % 3:
+                drinker.add_drink(t, 250)
+            else:
+                drinker.add_release(t, True)
+            added.append(t)
+        self.assertEqual([el.time for el in drinker.history], sorted(added))
+        history = drinker.history
+        self.assertEqual([history[i] for i in range(len(history))], list(history))
+        self.assertEqual(history[-3:], list(history)[-3:])
+
+
+
+
+    def test_equal_times_keep_insertion_order(self):
+        drinker = omo.Drinker()
+        drinker.add_drink(10.0, 100)
+        drinker.add_drink(20.0, 200)
+        drinker.add_drink(10.0, 300)
+        self.assertEqual([el.amount for el in drinker.history], [100, 300, 200])
+
+
+
+
+    def test_kind_columns(self):
+        drinker = omo.Drinker()
+        drinker.add_drink(0.0, 500)
+        drinker.add_release(30.0, True)
+        drinker.add_drink(40.0, 250)
+        drinker.add_release(90.0, False)
+        self.assertEqual([el.time for el in drinker.drinks], [0.0, 40.0])
+        self.assertEqual([el.permission for el in drinker.releases], [True, False])
+        self.assertEqual(len(drinker.accidents), 1)
+        self.assertEqual(drinker.accidents[0], drinker.releases[1])
+        self.assertIsInstance(drinker.history[2], omo.Drink)
+        self.assertIsInstance(drinker.history[3], omo.Release)
+
+
+
+
+    def test_history_is_a_read_only_view(self):
+        drinker = omo.Drinker()
+        drinker.add_drink(0.0, 500)
+        view = drinker.history
+        drinker.add_drink(1.0, 250)
+        self.assertEqual(len(view), 2)
+        with self.assertRaises(TypeError):
+            view[0] = omo.Drink(5.0, 100)
+
+
+
+
+    def test_history_concatenation_still_assigns(self):
+        drinker = omo.Drinker()
+        drinker.add_drink(10.0, 500)
+        drinker.history += [omo.Drink(5.0, 250)]
+        self.assertEqual([el.time for el in drinker.history], [5.0, 10.0])
+        self.assertAlmostEqual(drinker.bladder(10.0), reference_bladder(drinker, 10.0))
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Bladder Curve Tests:
+#----------------------------------------------------------------------------------------------------------------------
+class BladderCurveTest(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(6)
+        self.drinker, end = random_session(rng, 29000000.0, 80)
+        self.times = [29000000.0 - 30 + i * (end - 29000000.0 + 120) / 500 for i in range(500)]
+
+
+
+
+    def check_curve(self, curve):
+        self.assertEqual(len(curve.bladder), len(self.times))
+        for i, t in enumerate(self.times):
+            self.assertAlmostEqual(curve.absorbed[i], self.drinker.absorbed(t), delta = 1e-6)
+            self.assertAlmostEqual(curve.bladder[i], self.drinker.bladder(t), delta = 1e-6)
+            self.assertAlmostEqual(curve.desperation[i], self.drinker.desperation(t), delta = 1e-9)
+
+
+
+
+    def test_pure_python_fallback(self):
+        numpy = omo.numpy
+        omo.numpy = None
+        try:
+            self.check_curve(self.drinker.bladder_curve(self.times))
+        finally:
+            omo.numpy = numpy
+
+
+
+
+    @unittest.skipUnless(omo.numpy, "NumPy is not installed")
+    def test_numpy(self):
+        self.check_curve(self.drinker.bladder_curve(self.times))
+
+
+
+
+    def test_empty_drinker(self):
+        curve = omo.Drinker().bladder_curve([0.0, 10.0])
+        self.assertEqual(list(curve.bladder), [0.0, 0.0])
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Capacity Tests:
+#----------------------------------------------------------------------------------------------------------------------
+class CapacityTest(unittest.TestCase):
+    def test_default_capacity(self):
+        self.assertEqual(omo.Drinker().capacity, omo.default_capacity)
+
+
+
+
+    def test_matches_mean_of_old_and_new_accidents(self):
+        rng = random.Random(7)
+        drinker, _ = random_session(rng, 0.0, 200)
+        drinker.old_accidents = [rng.uniform(300, 900) for _ in range(1000)]
+        amounts = [el.amount for el in drinker.accidents] + drinker.old_accidents
+        self.assertAlmostEqual(drinker.capacity, statistics.mean(amounts), delta = 1e-6)
+
+
+
+
+    def test_reset_and_rebuild(self):
+        drinker = omo.Drinker()
+        drinker.old_accidents = [600.0, 800.0]
+        self.assertEqual(drinker.capacity, 700.0)
+        drinker.add_drink(0.0, 750)
+        drinker.add_release(120.0, False)
+        accident = drinker.accidents[0].amount
+        self.assertAlmostEqual(drinker.capacity, (1400.0 + accident) / 3)
+        drinker.old_accidents = []
+        self.assertAlmostEqual(drinker.capacity, accident)
+        drinker.history = list(drinker.history)
+        self.assertAlmostEqual(drinker.capacity, accident)
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# ETA Tests:
+#----------------------------------------------------------------------------------------------------------------------
+class EtaTest(unittest.TestCase):
+    def test_matches_reference(self):
+        rng = random.Random(8)
+        for _ in range(20):
+            drinker, _ = random_session(rng, 0.0, 40)
+            expected = reference_eta(drinker)
+            if expected is None:
+                self.assertIsNone(drinker.eta)
+            else:
+                self.assertAlmostEqual(drinker.eta, expected, delta = 1e-6)
+
+
+
+
+    def test_bladder_reaches_capacity_at_eta(self):
+        drinker = omo.Drinker()
+        drinker.add_drink(0.0, 400)
+        drinker.add_drink(20.0, 400)
+        self.assertAlmostEqual(drinker.bladder(drinker.eta), drinker.capacity, delta = 1e-6)
+        self.assertAlmostEqual(drinker.bladder(drinker.time_to_reach(250)), 250, delta = 1e-6)
+        self.assertIsNone(drinker.time_to_reach(800))
+
+
+
+
+    def test_eta_follows_events_and_capacity(self):
+        drinker = omo.Drinker()
+        drinker.add_drink(0.0, 400)
+        self.assertIsNone(drinker.eta)
+        drinker.add_drink(10.0, 400)
+        first = drinker.eta
+        self.assertIsNotNone(first)
+        drinker.old_accidents = [700.0]
+        self.assertGreater(drinker.eta, first)
+        drinker.add_release(30.0, True)
+        self.assertIsNone(drinker.eta)
+
+
+
+
+    def test_no_drinks_and_negative_volume(self):
+        drinker = omo.Drinker()
+        self.assertIsNone(drinker.time_to_reach(-10.0))
+        # A recorded release larger than anything drunk leaves the bladder below zero:
+        drinker.load_events([omo.Release(5.0, 100.0, True)])
+        self.assertIsNone(drinker.time_to_reach(-50.0))
+        self.assertEqual(drinker.projection().time_to_reach(-50.0), drinker.time_to_reach(-50.0))
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Snapshot Tests:
+#----------------------------------------------------------------------------------------------------------------------
+class SnapshotTest(unittest.TestCase):
+    def test_matches_individual_queries(self):
+        rng = random.Random(9)
+        drinker, end = random_session(rng, 0.0, 60)
+        drinker.roll_for_permission(end - 30)
+        for t in (end - 60, end, end + 20, end + 90):
+            snapshot = drinker.snapshot(t)
+            self.assertEqual(snapshot.time, t)
+            self.assertAlmostEqual(snapshot.bladder, drinker.bladder(t))
+            self.assertAlmostEqual(snapshot.absorbed, drinker.absorbed(t))
+            self.assertAlmostEqual(snapshot.desperation, drinker.desperation(t))
+            self.assertEqual(snapshot.capacity, drinker.capacity)
+            self.assertEqual(snapshot.eta, drinker.eta)
+            self.assertEqual(snapshot.roll_allowed, drinker.roll_allowed(t))
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Compaction Tests:
+#----------------------------------------------------------------------------------------------------------------------
+class CompactionTest(unittest.TestCase):
+    def setUp(self):
+        self.full, self.end = random_session(random.Random(10), 0.0, 10000, compaction_horizon = None)
+        self.compacted, _ = random_session(random.Random(10), 0.0, 10000)
+
+
+
+
+    def test_memory_stays_bounded(self):
+        self.assertEqual(len(self.full.history), 10000)
+        self.assertLessEqual(len(self.compacted.history), omo.compaction_batch)
+        self.assertIsNone(self.full.compacted_until)
+        self.assertGreater(self.compacted.compacted_until, 0.0)
+
+
+
+
+    def test_matches_uncompacted_at_and_after_horizon(self):
+        # Exact, not merely close: the rows kept are the same rows
+        start = self.compacted.compacted_until
+        for t in (start, start + 1.0, self.end - 300, self.end, self.end + 120):
+            self.assertEqual(self.compacted.absorbed(t), self.full.absorbed(t))
+            self.assertEqual(self.compacted.bladder(t), self.full.bladder(t))
+        self.assertEqual(self.compacted.eta, self.full.eta)
+        self.assertEqual(self.compacted.projection(), self.full.projection())
+        self.assertEqual([el for el in self.compacted.history if el.time >= start],
+                         [el for el in self.full.history if el.time >= start])
+
+
+
+
+    def test_capacity_and_accidents_are_kept(self):
+        self.assertEqual(list(self.compacted.accidents), list(self.full.accidents))
+        self.assertEqual(self.compacted.capacity, self.full.capacity)
+
+
+
+
+    def test_before_horizon_raises(self):
+        before = self.compacted.compacted_until - 1.0
+        self.assertRaises(ValueError, self.compacted.bladder, before)
+        self.assertRaises(ValueError, self.compacted.add_drink, before, 250)
+        self.assertRaises(ValueError, self.compacted.add_release, before, True)
+        self.assertRaises(ValueError, self.compacted.bladder_curve, [before, self.end])
+        self.assertRaises(ValueError, self.compacted.set_permission, before, True)
+        self.assertEqual(len(self.compacted.drinks) + len(self.compacted.releases), len(self.compacted.history))
+
+
+
+
+    def test_back_dated_insert_after_horizon(self):
+        t = self.end - 60
+        self.full.add_drink(t, 400)
+        self.compacted.add_drink(t, 400)
+        self.assertAlmostEqual(self.compacted.bladder(self.end), self.full.bladder(self.end), delta = 1e-6)
+        self.assertEqual(list(self.compacted.history)[-5:], list(self.full.history)[-5:])
+
+
+
+
+    def test_permission_survives_compaction(self):
+        drinkers = [omo.Drinker(), omo.Drinker()]
+        for drinker in drinkers:
+            drinker.add_drink(0.0, 500)
+            drinker.add_drink(1.0, 100)
+            drinker.set_permission(10.0, False)
+            drinker.add_drink(5000.0, 50)
+        compacted, full = drinkers
+        self.assertEqual(compacted.compact(), 1)
+        self.assertEqual(compacted.compacted_until, 1.0)
+        self.assertRaises(ValueError, compacted.absorbed, 0.5)
+        # Still measured from what had been absorbed when permission was asked:
+        for t in (5000.0, 5100.0):
+            self.assertEqual(compacted.roll_allowed(t), full.roll_allowed(t))
+        self.assertEqual(compacted._permission_absorbed, full._permission_absorbed)
+
+
+
+
+    def test_late_permission_before_horizon_is_refused(self):
+        permission = self.compacted.permission
+        before = self.compacted.compacted_until - 1.0
+        with self.assertRaises(ValueError):
+            self.compacted.set_permission(before, False)
+        self.assertEqual(self.compacted.permission, permission)
+        # Polling and rolling carry on:
+        self.compacted.snapshot(self.end)
+        self.assertEqual(self.compacted.roll_allowed(self.end), self.full.roll_allowed(self.end))
+        self.compacted.set_permission(self.compacted.compacted_until, True)
+        self.assertEqual(self.compacted.permission.time, self.compacted.compacted_until)
+        self.compacted.snapshot(self.end)
+
+
+
+
+    def test_disabled(self):
+        drinker, _ = random_session(random.Random(11), 0.0, omo.compaction_batch + 10, compaction_horizon = None)
+        self.assertEqual(len(drinker.history), omo.compaction_batch + 10)
+        self.assertEqual(drinker.compact(), 0)
+        self.assertIsNone(drinker.compacted_until)
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------
+# Main Loop
+#----------------------------
+if __name__ == "__main__":
+    unittest.main()
+#----------------------------
@@ -0,0 +1,282 @@
+#----------------------------
+# Import Statements:
+#----------------------------
+import json
+import os
+import pstats
+import random
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import bindings
+import omo
+import profiling
+#----------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Fakes:
+#----------------------------------------------------------------------------------------------------------------------
+class FakeClock():
+    """A nanosecond clock that only moves when told to."""
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+
+
+class FakeRoot():
+    """Stands in for the Tk root: after() callbacks run when the test says so."""
+    def __init__(self):
+        self.jobs = {}
+        self.next_job = 0
+
+    def after(self, ms, callback):
+        self.next_job += 1
+        self.jobs[self.next_job] = (ms, callback)
+        return self.next_job
+
+    def after_cancel(self, job):
+        del self.jobs[job]
+
+    def run_pending(self):
+        jobs, self.jobs = self.jobs, {}
+        for ms, callback in jobs.values():
+            callback()
+
+
+
+
+class Counter():
+    def step(self, n):
+        return n + 1
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Histogram Tests:
+#----------------------------------------------------------------------------------------------------------------------
+class HistogramTest(unittest.TestCase):
+    def test_buckets_cover_every_value_once(self):
+        histogram = profiling.Histogram(precision_bits=4)
+        previous_high = -1
+        for index in range(200):
+            low, high = histogram._bounds(index)
+            self.assertEqual(low, previous_high + 1)
+            self.assertEqual(histogram._index(low), index)
+            self.assertEqual(histogram._index(high), index)
+            previous_high = high
+
+
+
+
+    def test_relative_error_is_bounded(self):
+        histogram = profiling.Histogram()
+        for value in (1, 100, 127, 128, 1000, 123456, 10**9, 3 * 10**12):
+            low, high = histogram._bounds(histogram._index(value))
+            self.assertTrue(low <= value <= high)
+            self.assertLessEqual(high - low, value / 2 ** (profiling.PRECISION_BITS - 1))
+
+
+
+
+    def test_percentiles(self):
+        histogram = profiling.Histogram()
+        values = list(range(1, 10001))
+        random.Random(3).shuffle(values)
+        for value in values:
+            histogram.record(value * 1000)
+        self.assertEqual(histogram.count, 10000)
+        self.assertEqual((histogram.min, histogram.max), (1000, 10**7))
+        self.assertAlmostEqual(histogram.mean(), 5000.5 * 1000)
+        for percent in (50.0, 90.0, 99.0, 99.9):
+            expected = percent * 100 * 1000
+            self.assertLessEqual(abs(histogram.percentile(percent) - expected), expected / 64 + 1000)
+        self.assertEqual(histogram.percentile(100.0), 10**7)
+
+
+
+
+    def test_empty(self):
+        histogram = profiling.Histogram()
+        self.assertIsNone(histogram.percentile(50.0))
+        self.assertEqual(histogram.to_dict()['count'], 0)
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Profiler Tests:
+#----------------------------------------------------------------------------------------------------------------------
+class ProfilerTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.profiler = profiling.Profiler(clock=self.clock)
+
+
+
+
+    def tearDown(self):
+        self.profiler.disable()
+
+
+
+
+    def test_timed_records_only_while_enabled(self):
+        clock = self.clock
+        @self.profiler.timed("work")
+        def work():
+            clock.now += 250
+            return "done"
+
+        self.assertEqual(work(), "done")
+        self.assertEqual(self.profiler.histograms, {})
+        self.profiler.enable()
+        work()
+        work()
+        self.assertEqual(self.profiler.histograms["work"].count, 2)
+        self.assertEqual(self.profiler.histograms["work"].max, 250)
+
+
+
+
+    def test_instrumented_class_is_only_patched_while_enabled(self):
+        original = Counter.__dict__['step']
+        self.profiler.instrument(Counter, ('step',))
+        self.assertIs(Counter.__dict__['step'], original)
+        self.profiler.enable()
+        self.assertIsNot(Counter.__dict__['step'], original)
+        self.assertEqual(Counter().step(1), 2)
+        self.profiler.disable()
+        self.assertIs(Counter.__dict__['step'], original)
+        self.assertEqual(self.profiler.histograms[__name__ + '.Counter.step'].count, 1)
+
+
+
+
+    def test_instruments_drinker(self):
+        self.profiler.instrument(omo.Drinker, ('add_drink', 'snapshot'), 'omo.Drinker')
+        self.profiler.enable()
+        drinker = omo.Drinker()
+        drinker.add_drink(0.0, 500)
+        drinker.snapshot(10.0)
+        self.profiler.disable()
+        self.assertEqual(sorted(self.profiler.histograms), ['omo.Drinker.add_drink', 'omo.Drinker.snapshot'])
+        self.assertNotIn('wrapper', omo.Drinker.snapshot.__code__.co_name)
+
+
+
+
+    def test_drift_probe(self):
+        root = FakeRoot()
+        self.profiler.watch_drift(root, 500)
+        self.assertEqual(root.jobs, {})
+        self.profiler.enable()
+        self.clock.now += 503 * 10**6
+        root.run_pending()
+        self.clock.now += 500 * 10**6
+        root.run_pending()
+        histogram = self.profiler.histograms['tk.after(500) lateness']
+        self.assertEqual(histogram.count, 2)
+        self.assertEqual(histogram.min, 0)
+        self.assertGreaterEqual(histogram.max, 3 * 10**6)
+        self.profiler.disable()
+        self.assertEqual(root.jobs, {})
+
+
+
+
+    def test_reports(self):
+        self.profiler.enable()
+        self.profiler.record("tick", 1500)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'profile.json')
+            self.profiler.write_report(path)
+            with open(path) as f:
+                report = json.load(f)
+            self.assertEqual(report['unit'], 'ns')
+            self.assertEqual(report['histograms']['tick']['count'], 1)
+            self.assertEqual(report['histograms']['tick']['p99_9'], 1500)
+            self.assertEqual(report['counters'], {})
+
+            self.assertFalse(self.profiler.dump_cprofile(os.path.join(directory, 'none.prof')))
+            self.profiler.start_cprofile()
+            sorted(random.random() for _ in range(100))
+            self.profiler.stop_cprofile()
+            dump = os.path.join(directory, 'omo.prof')
+            self.assertTrue(self.profiler.dump_cprofile(dump))
+            self.assertGreater(pstats.Stats(dump).total_calls, 0)
+
+
+
+
+    def test_reports_binding_counters(self):
+        variable = mock.Mock()
+        named = {'bladder_text': bindings.Binding(variable)}
+        self.profiler.add_counters('bindings', lambda: bindings.counters(named))
+        for _ in range(3):
+            named['bladder_text'].set("500 mL")
+        report = json.loads(json.dumps(self.profiler.report()))
+        self.assertEqual(report['counters']['bindings'], {'bladder_text': [1, 2], 'total': [1, 2]})
+
+
+
+
+    def test_report_while_another_thread_creates_histograms(self):
+        self.profiler.enable()
+        done = threading.Event()
+        def create():
+            for i in range(2000):
+                self.profiler.record('worker.%d' % i, i)
+            done.set()
+        worker = threading.Thread(target=create)
+        worker.start()
+        while not done.is_set():
+            self.profiler.report()
+        worker.join()
+        self.assertEqual(len(self.profiler.report()['histograms']), 2000)
+
+
+
+
+    def test_close_writes_to_destination(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'profile.json')
+            self.profiler.destination = path
+            self.profiler.enable()
+            self.profiler.record("tick", 10)
+            self.profiler.close()
+            self.assertFalse(self.profiler.enabled)
+            self.assertTrue(os.path.exists(path))
+
+
+
+
+    def test_from_environment(self):
+        for setting, enabled, destination in (('', False, None), ('0', False, None),
+                                              ('1', True, None), ('profile.json', True, 'profile.json')):
+            with mock.patch.dict(os.environ, {profiling.ENVIRONMENT_VARIABLE: setting}):
+                profiler = profiling.from_environment()
+            self.assertEqual((profiler.enabled, profiler.destination), (enabled, destination))
+            profiler.disable()
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------
+# Main Loop
+#----------------------------
+if __name__ == "__main__":
+    unittest.main()
+#----------------------------
@@ -0,0 +1,154 @@
+#----------------------------
+# Import Statements:
+#----------------------------
+import time
+import unittest
+from unittest import mock
+
+import omo
+import refresh
+import stopwatch
+#----------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Fake Tk Root:
+#----------------------------------------------------------------------------------------------------------------------
+class FakeRoot():
+    """Records after() calls instead of running them."""
+    def __init__(self):
+        self.jobs = {}
+        self._next_id = 0
+
+    def after(self, ms, callback):
+        self._next_id += 1
+        job = 'after#' + str(self._next_id)
+        self.jobs[job] = (ms, callback)
+        return job
+
+    def after_cancel(self, job):
+        del self.jobs[job]
+
+    def fire(self):
+        job, (ms, callback) = next(iter(self.jobs.items()))
+        del self.jobs[job]
+        callback()
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Delay Tests:
+#----------------------------------------------------------------------------------------------------------------------
+class DelayTest(unittest.TestCase):
+    def test_volume_deadline_matches_model(self):
+        drinker = omo.Drinker()
+        drinker.add_drink(0.0, 500)
+        t = 10.0
+        bladder = drinker.bladder(t)
+        delay = refresh.seconds_until_volume(drinker, refresh.next_rounded_volume(bladder), t)
+        self.assertEqual(round(drinker.bladder(t + delay / 60.0 - 1e-6)), round(bladder))
+        self.assertEqual(round(drinker.bladder(t + delay / 60.0 + 1e-6)), round(bladder) + 1)
+
+
+
+
+    def test_no_volume_deadline_once_absorbed(self):
+        drinker = omo.Drinker()
+        drinker.add_drink(0.0, 500)
+        self.assertIsNone(refresh.seconds_until_volume(drinker, 600.0, 10.0))
+        self.assertIsNone(refresh.seconds_until_volume(drinker, None, 10.0))
+
+
+
+
+    def test_eta_text_changes_on_whole_minutes(self):
+        self.assertAlmostEqual(refresh.seconds_until_eta_text_changes(10.25, 0.0), 15.0)
+        self.assertAlmostEqual(refresh.seconds_until_eta_text_changes(10.0, 0.0), 60.0)
+        self.assertIsNone(refresh.seconds_until_eta_text_changes(None, 0.0))
+        self.assertIsNone(refresh.seconds_until_eta_text_changes(5.0, 6.0))
+
+
+
+
+    def test_next_level_volume(self):
+        self.assertEqual(refresh.next_level_volume(0.5, 600.0, 100), 306.0)
+        self.assertEqual(refresh.next_level_volume(-0.1, 600.0, 100), 6.0)
+        self.assertIsNone(refresh.next_level_volume(1.0, 600.0, 100))
+        self.assertIsNone(refresh.next_level_volume(0.5, 600.0, 0))
+
+
+
+
+    def test_stopwatch_next_change(self):
+        with mock.patch.object(time, 'perf_counter_ns', side_effect=[10**12, 10**12 + 2250000000]):
+            hold_stopwatch = stopwatch.Stopwatch()
+            self.assertIsNone(hold_stopwatch.seconds_until_next_change())
+            hold_stopwatch.start_stopwatch()
+            self.assertAlmostEqual(hold_stopwatch.seconds_until_next_change(), 0.75)
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# RefreshScheduler Tests:
+#----------------------------------------------------------------------------------------------------------------------
+class RefreshSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.root = FakeRoot()
+        self.calls = 0
+        self.scheduler = refresh.RefreshScheduler(self.root, self.callback)
+
+    def callback(self):
+        self.calls += 1
+
+
+
+
+    def test_sleeps_until_earliest_deadline(self):
+        self.assertAlmostEqual(self.scheduler.schedule(None, 30.0, 0.5, None), 0.5 + refresh.MARGIN)
+        (ms, _), = self.root.jobs.values()
+        self.assertEqual(ms, 505)
+
+
+
+
+    def test_delay_is_clamped(self):
+        self.assertEqual(self.scheduler.next_delay(), refresh.MAX_DELAY)
+        self.assertEqual(self.scheduler.next_delay(None, 1e6), refresh.MAX_DELAY)
+        self.assertEqual(self.scheduler.next_delay(0.0), refresh.MIN_DELAY)
+
+
+
+
+    def test_keeps_one_pending_refresh(self):
+        self.scheduler.schedule(10.0)
+        self.scheduler.schedule(1.0)
+        self.assertEqual(len(self.root.jobs), 1)
+        self.root.fire()
+        self.assertEqual((self.calls, self.scheduler.wakeups), (1, 1))
+
+
+
+
+    def test_wake_runs_now_and_cancels_pending(self):
+        self.scheduler.schedule(10.0)
+        self.scheduler.wake()
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.root.jobs, {})
+        self.assertEqual(self.scheduler.wakeups, 0)
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------
+# Main Loop
+#----------------------------
+if __name__ == "__main__":
+    unittest.main()
+#----------------------------
@@ -0,0 +1,78 @@
+#----------------------------
+# Import Statements:
+#----------------------------
+import io
+import os
+import tempfile
+import unittest
+
+import journal
+import omo
+import replay
+#----------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Replay Tests:
+#----------------------------------------------------------------------------------------------------------------------
+class ReplayTest(unittest.TestCase):
+    def test_frames_match_a_live_drinker(self):
+        events = list(replay.synthetic_session(300, seed=1))
+        live = omo.Drinker()
+        frames = replay.replay(events)
+        for event, frame in zip(events, frames):
+            if isinstance(event, omo.Drink):
+                live.add_drink(event.time, event.amount)
+            elif isinstance(event, omo.Release):
+                self.assertEqual(frame.event.amount, live.add_release(event.time, event.permission))
+            else:
+                live.set_permission(event.time, event.permission)
+            self.assertEqual(frame.bladder, live.bladder(event.time))
+            self.assertEqual(frame.eta, live.eta)
+            self.assertEqual(frame.roll_allowed, live.roll_allowed(event.time))
+
+
+
+
+    def test_frames_are_streamed(self):
+        frames = replay.replay(replay.synthetic_session(10**9))
+        self.assertEqual(len([frame for _, frame in zip(range(50), frames)]), 50)
+
+
+
+
+    def test_replay_journal_to_timeline(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'session.journal')
+            drinker = omo.Drinker(journal.Journal(path))
+            drinker.add_drink(0.0, 500)
+            drinker.set_permission(50.0, False)
+            drinker.add_release(90.0, False)
+            drinker.journal.close()
+
+            out = io.StringIO()
+            replay.write_timeline(replay.replay_file(path), out)
+            rows = out.getvalue().splitlines()
+            self.assertEqual(len(rows), 4)
+            self.assertTrue(rows[2].startswith('50.0,permission denied'))
+            self.assertTrue(rows[3].startswith('90.0,accident,' + repr(drinker.accidents[0].amount)))
+
+
+
+
+    def test_benchmark_reports_each_size(self):
+        results = replay.benchmark(sizes=(100, 1000), out=io.StringIO())
+        self.assertEqual(sorted(results), [100, 1000])
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------
+# Main Loop
+#----------------------------
+if __name__ == "__main__":
+    unittest.main()
+#----------------------------
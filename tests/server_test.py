@@ -0,0 +1,188 @@
+#----------------------------
+# Import Statements:
+#----------------------------
+import asyncio
+import unittest
+
+import loadgen
+import server
+#----------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Fake Clock:
+#----------------------------------------------------------------------------------------------------------------------
+class FakeClock():
+    def __init__(self):
+        self.minutes = 0.0
+
+    def __call__(self):
+        return self.minutes
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# API Tests:
+#----------------------------------------------------------------------------------------------------------------------
+class ApiTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.server = server.SessionServer(clock=self.clock, seed=0)
+
+
+
+
+    def test_session_lifecycle(self):
+        status, created = self.server.handle('POST', '/sessions', {})
+        self.assertEqual(status, 201)
+        path = '/sessions/' + created['id']
+        self.assertEqual(created['state']['bladder'], 0.0)
+
+        self.assertEqual(self.server.handle('POST', path + '/drink', {'amount': 500})[0], 200)
+        self.clock.minutes = 45.0
+        status, state = self.server.handle('GET', path, {})
+        self.assertAlmostEqual(state['bladder'], 250.0)
+
+        status, released = self.server.handle('POST', path + '/accident', {})
+        self.assertAlmostEqual(released['released'], 250.0)
+        self.assertEqual(released['capacity'], 250.0)
+
+        self.assertEqual(self.server.handle('DELETE', path, {})[0], 200)
+        self.assertEqual(self.server.handle('GET', path, {})[0], 404)
+
+
+
+
+    def test_sessions_are_independent(self):
+        first = self.server.handle('POST', '/sessions', {})[1]['id']
+        second = self.server.handle('POST', '/sessions', {})[1]['id']
+        self.server.handle('POST', f'/sessions/{first}/drink', {'amount': 750})
+        self.clock.minutes = 60.0
+        self.assertGreater(self.server.handle('GET', '/sessions/' + first, {})[1]['bladder'], 0.0)
+        self.assertEqual(self.server.handle('GET', '/sessions/' + second, {})[1]['bladder'], 0.0)
+
+
+
+
+    def test_permission_cannot_be_asked_twice_in_a_row(self):
+        path = '/sessions/' + self.server.handle('POST', '/sessions', {})[1]['id']
+        self.server.handle('POST', path + '/drink', {'amount': 500})
+        self.clock.minutes = 30.0
+        status, answer = self.server.handle('POST', path + '/permission', {})
+        self.assertEqual(status, 200)
+        self.assertIn(answer['granted'], (True, False))
+        self.assertEqual(answer['permission'], answer['granted'])
+        self.assertEqual(self.server.handle('POST', path + '/permission', {})[0], 409)
+
+
+
+
+    def test_bad_requests(self):
+        path = '/sessions/' + self.server.handle('POST', '/sessions', {})[1]['id']
+        self.assertEqual(self.server.handle('POST', path + '/drink', {'amount': 'lots'})[0], 400)
+        self.assertEqual(self.server.handle('POST', path + '/drink', {'amount': -5})[0], 400)
+        self.assertEqual(self.server.handle('GET', '/sessions', {})[0], 405)
+        self.assertEqual(self.server.handle('POST', '/nowhere', {})[0], 404)
+        self.assertEqual(self.server.handle('POST', '/sessions/99/pee', {})[0], 404)
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Localhost Tests:
+#----------------------------------------------------------------------------------------------------------------------
+class LocalhostTest(unittest.TestCase):
+    def run_async(self, coroutine):
+        return asyncio.run(asyncio.wait_for(coroutine, 20))
+
+
+
+
+    def test_http_round_trip(self):
+        async def scenario():
+            session_server = server.SessionServer()
+            port = await session_server.start()
+            client = loadgen.HttpClient('127.0.0.1', port)
+            try:
+                status, created = await client.request('POST', '/sessions', {})
+                drink = await client.request('POST', f"/sessions/{created['id']}/drink", {'amount': 250})
+                missing = await client.request('GET', '/sessions/nope')
+                return status, drink, missing
+            finally:
+                await client.close()
+                await session_server.stop()
+
+        status, (drink_status, state), (missing_status, _) = self.run_async(scenario())
+        self.assertEqual((status, drink_status, missing_status), (201, 200, 404))
+        self.assertIn('desperation', state)
+
+
+
+
+    def test_pushes_at_each_clients_rate(self):
+        async def scenario():
+            session_server = server.SessionServer(tick=0.01)
+            port = await session_server.start()
+            client = loadgen.HttpClient('127.0.0.1', port)
+            try:
+                session_id = (await client.request('POST', '/sessions', {}))[1]['id']
+                fast, slow = await asyncio.gather(
+                    client.subscribe(f'/sessions/{session_id}/events?interval=0.02', 6),
+                    client.subscribe(f'/sessions/{session_id}/events?interval=0.1', 2))
+                await asyncio.sleep(0.05)
+                return fast, slow, session_server.subscribers
+            finally:
+                await client.close()
+                await session_server.stop()
+
+        fast, slow, subscribers = self.run_async(scenario())
+        self.assertEqual((len(fast), len(slow)), (6, 2))
+        # The second push of the slow stream comes after most of the fast ones:
+        self.assertGreater(slow[1], fast[3])
+        self.assertEqual(subscribers, 0)
+
+
+
+
+    def test_load_generator(self):
+        report = self.run_async(loadgen.run_spawned(sessions=20, clients=4, requests=200,
+                                                    subscribers=3, interval=0.1, pushes=2))
+        self.assertEqual(report['requests'], 200)
+        self.assertLessEqual(set(report['statuses']), {'200', '409'})
+        self.assertLessEqual(report['latency_ms']['all']['p50'], report['latency_ms']['all']['p99'])
+        self.assertEqual(report['pushes_received'], 6)
+        self.assertAlmostEqual(report['requests_per_second'] * report['request_seconds'], 200)
+        self.assertGreaterEqual(report['stream_seconds'], 0.1)
+        self.assertEqual(report['server_stats']['sessions'], 20)
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Percentile Tests:
+#----------------------------------------------------------------------------------------------------------------------
+class PercentileTest(unittest.TestCase):
+    def test_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(loadgen.percentile(values, 50), 50)
+        self.assertEqual(loadgen.percentile(values, 99), 99)
+        self.assertEqual(loadgen.percentile(values, 100), 100)
+        self.assertEqual(loadgen.percentile([7], 99), 7)
+        self.assertIsNone(loadgen.percentile([], 50))
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------
+# Main Loop
+#----------------------------
+if __name__ == "__main__":
+    unittest.main()
+#----------------------------
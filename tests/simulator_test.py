@@ -0,0 +1,87 @@
+#----------------------------
+# Import Statements:
+#----------------------------
+import random
+import unittest
+
+import simulator
+#----------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Simulator Tests:
+#----------------------------------------------------------------------------------------------------------------------
+class SimulatorTest(unittest.TestCase):
+    def test_results_do_not_depend_on_workers(self):
+        pattern = simulator.Pattern(duration=8 * 60.0)
+        inline = simulator.simulate(pattern, 40, seed=3, workers=1)
+        pooled = simulator.simulate(pattern, 40, seed=3, workers=2)
+        self.assertEqual(inline.sessions, 40)
+        for a, b in zip(inline, pooled):
+            self.assertAlmostEqual(a, b)
+
+
+
+
+    def test_sessions_are_seeded(self):
+        pattern = simulator.Pattern()
+        self.assertEqual(simulator.run_session(pattern, 7), simulator.run_session(pattern, 7))
+
+
+
+
+    def test_timing_and_rolls_are_independent_streams(self):
+        timing_seed, roll_seed = simulator.session_seeds(7)
+        self.assertNotEqual(timing_seed, roll_seed)
+        timing = random.Random(timing_seed)
+        rolls = simulator.Rolls(roll_seed)
+        self.assertNotEqual([timing.random() for _ in range(10)], [rolls.next() for _ in range(10)])
+
+
+
+
+    def test_rolls_do_not_depend_on_numpy(self):
+        seed = 2**40 + 12345
+        expected = random.Random(seed)
+        rolls = simulator.Rolls(seed)
+        self.assertEqual([rolls.next() for _ in range(2 * simulator.ROLL_BATCH)],
+                         [expected.random() for _ in range(2 * simulator.ROLL_BATCH)])
+        numpy = simulator.numpy
+        try:
+            simulator.numpy = None
+            without_numpy = simulator.run_session(simulator.Pattern(), 5)
+        finally:
+            simulator.numpy = numpy
+        self.assertEqual(simulator.run_session(simulator.Pattern(), 5), without_numpy)
+
+
+
+
+    def test_less_than_capacity_never_causes_accidents(self):
+        # Drinks are at least an hour apart, so at most 17 drinks of 50 mL in 16 hours
+        pattern = simulator.Pattern(drink_amount=50.0, drink_interval=120.0, true_capacity=900.0)
+        summary = simulator.simulate(pattern, 20, workers=1)
+        self.assertEqual(summary.accident_probability, 0.0)
+
+
+
+
+    def test_huge_bladder_always_gets_permission_eventually(self):
+        pattern = simulator.Pattern(true_capacity=10**6, old_accidents=(600.0,))
+        totals = simulator.run_sessions(pattern, range(10))
+        self.assertEqual(totals.accidents, 0)
+        self.assertGreater(totals.pees, 0)
+        self.assertEqual(totals.asks, totals.pees + totals.denials)
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------
+# Main Loop
+#----------------------------
+if __name__ == "__main__":
+    unittest.main()
+#----------------------------
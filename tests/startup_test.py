@@ -0,0 +1,105 @@
+#----------------------------
+# Import Statements:
+#----------------------------
+import io
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import startup
+#----------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# StartupProfile Tests:
+#----------------------------------------------------------------------------------------------------------------------
+class StartupProfileTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        for name, source in (('startup_fixture_outer', 'import startup_fixture_inner\n'),
+                             ('startup_fixture_inner', 'VALUE = 1\n')):
+            with open(os.path.join(self.directory.name, name + '.py'), 'w') as f:
+                f.write(source)
+        sys.path.insert(0, self.directory.name)
+
+
+
+
+    def tearDown(self):
+        sys.path.remove(self.directory.name)
+        for name in ('startup_fixture_outer', 'startup_fixture_inner'):
+            sys.modules.pop(name, None)
+        self.directory.cleanup()
+
+
+
+
+    def test_times_first_imports_like_importtime(self):
+        profile = startup.StartupProfile(enabled=True)
+        profile.install()
+        try:
+            import startup_fixture_outer
+            import startup_fixture_outer
+        finally:
+            profile.uninstall()
+
+        names = [(depth, name) for depth, name, _, _ in profile.imports]
+        self.assertEqual(names, [(1, 'startup_fixture_inner'), (0, 'startup_fixture_outer')])
+        (_, _, inner_self, inner_cumulative), (_, _, outer_self, outer_cumulative) = profile.imports
+        self.assertEqual(inner_self, inner_cumulative)
+        self.assertAlmostEqual(outer_self + inner_cumulative, outer_cumulative)
+
+
+
+
+    def test_disabled_profile_records_nothing(self):
+        profile = startup.StartupProfile(enabled=False)
+        profile.install()
+        import startup_fixture_outer
+        profile.mark("first frame")
+        self.assertEqual((profile.imports, profile.phases), ([], []))
+        self.assertIsNone(profile.elapsed("first frame"))
+
+
+
+
+    def test_reports_phases_once(self):
+        ticks = iter([0.0, 0.25, 0.5])
+        profile = startup.StartupProfile(enabled=True, clock=lambda: next(ticks))
+        profile.mark("window built")
+        profile.mark("first frame")
+        self.assertEqual(profile.elapsed("first frame"), 0.5)
+
+        with mock.patch.object(sys, 'stderr', io.StringIO()) as stderr:
+            profile.report()
+            profile.report()
+        self.assertEqual(stderr.getvalue().count("first frame"), 1)
+        self.assertIn("startup phase:        500.0 | first frame", stderr.getvalue())
+
+
+
+
+    def test_environment_setting(self):
+        with mock.patch.dict(os.environ, {startup.ENVIRONMENT_VARIABLE: '0'}):
+            self.assertFalse(startup.from_environment().enabled)
+        with mock.patch.dict(os.environ, {startup.ENVIRONMENT_VARIABLE: '1'}):
+            profile = startup.from_environment()
+            self.assertTrue(profile.enabled)
+            self.assertIsNone(profile.destination)
+        with mock.patch.dict(os.environ, {startup.ENVIRONMENT_VARIABLE: 'startup.txt'}):
+            self.assertEqual(startup.from_environment().destination, 'startup.txt')
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------
+# Main Loop
+#----------------------------
+if __name__ == "__main__":
+    unittest.main()
+#----------------------------
@@ -0,0 +1,188 @@
+#----------------------------
+# Import Statements:
+#----------------------------
+import time
+import unittest
+
+import omo
+import virtual_list
+#----------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Fakes:
+#----------------------------------------------------------------------------------------------------------------------
+class FakeLabel():
+    def __init__(self, slot):
+        self.slot = slot
+        self.texts = []
+
+    def configure(self, text):
+        self.texts.append(text)
+
+
+
+
+class CountingSource():
+    """A sequence of n numbers that records which items were read."""
+    def __init__(self, n):
+        self.n = n
+        self.read = 0
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, index):
+        items = list(range(*index.indices(self.n)))
+        self.read += len(items)
+        return items
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Viewport Tests:
+#----------------------------------------------------------------------------------------------------------------------
+class ViewportTest(unittest.TestCase):
+    def test_follows_appended_rows(self):
+        viewport = virtual_list.Viewport(5)
+        viewport.set_count(3)
+        self.assertEqual(viewport.visible(), (0, 3))
+        viewport.set_count(12)
+        self.assertEqual(viewport.visible(), (7, 12))
+        self.assertEqual(viewport.fractions(), (7 / 12, 1.0))
+
+
+
+
+    def test_stays_put_when_scrolled_up(self):
+        viewport = virtual_list.Viewport(5)
+        viewport.set_count(100)
+        viewport.scroll_by(-10)
+        self.assertFalse(viewport.following)
+        viewport.set_count(200)
+        self.assertEqual(viewport.visible(), (85, 90))
+        viewport.scroll_to(1.0)
+        self.assertTrue(viewport.following)
+        self.assertEqual(viewport.visible(), (195, 200))
+
+
+
+
+    def test_scrolling_is_clamped(self):
+        viewport = virtual_list.Viewport(5)
+        viewport.set_count(20)
+        viewport.scroll_by(-100)
+        self.assertEqual(viewport.visible(), (0, 5))
+        viewport.scroll_to(0.5)
+        self.assertEqual(viewport.visible(), (10, 15))
+        viewport.scroll_by(100)
+        self.assertEqual(viewport.visible(), (15, 20))
+
+
+
+
+    def test_resize(self):
+        viewport = virtual_list.Viewport()
+        viewport.set_count(50)
+        viewport.resize(110, row_height=20)
+        self.assertEqual(viewport.rows, 6)
+        self.assertEqual(viewport.visible(), (44, 50))
+
+
+
+
+    def test_empty(self):
+        viewport = virtual_list.Viewport(5)
+        self.assertEqual(viewport.visible(), (0, 0))
+        self.assertEqual(viewport.fractions(), (0.0, 1.0))
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# RowPool Tests:
+#----------------------------------------------------------------------------------------------------------------------
+class RowPoolTest(unittest.TestCase):
+    def test_binds_items_and_blanks_the_rest(self):
+        pool = virtual_list.RowPool(FakeLabel, format_row=str)
+        pool.ensure(3)
+        pool.bind([7, 8])
+        self.assertEqual([label.texts for label in pool.labels], [['7'], ['8'], ['']])
+
+
+
+
+    def test_unchanged_rows_are_not_touched(self):
+        pool = virtual_list.RowPool(FakeLabel, format_row=str)
+        pool.ensure(3)
+        pool.bind([1, 2, 3])
+        pool.bind([1, 2, 3])
+        self.assertEqual(pool.rebinds, 3)
+        pool.bind([2, 2, 3])
+        self.assertEqual(pool.rebinds, 4)
+
+
+
+
+    def test_pool_only_grows_to_the_tallest_window(self):
+        pool = virtual_list.RowPool(FakeLabel)
+        pool.ensure(10)
+        pool.ensure(4)
+        self.assertEqual([label.slot for label in pool.labels], list(range(10)))
+
+
+
+
+    def test_scrolling_reads_only_visible_rows(self):
+        source = CountingSource(10**6)
+        viewport = virtual_list.Viewport(8)
+        pool = virtual_list.RowPool(FakeLabel, format_row=str)
+        pool.ensure(viewport.rows)
+        viewport.set_count(len(source))
+        for fraction in (0.0, 0.25, 0.5, 0.999):
+            viewport.scroll_to(fraction)
+            start, stop = viewport.visible()
+            pool.bind(source[start:stop])
+        self.assertEqual(source.read, 4 * 8)
+        self.assertEqual(len(pool.labels), 8)
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Describe Tests:
+#----------------------------------------------------------------------------------------------------------------------
+class DescribeTest(unittest.TestCase):
+    def test_describe(self):
+        t = time.mktime((2026, 10, 18, 14, 5, 0, 0, 0, -1)) / 60.0
+        self.assertEqual(virtual_list.describe(omo.Drink(t, 500.0)), "14:05  Drink 500 mL")
+        self.assertEqual(virtual_list.describe(omo.Release(t, 431.6, True)), "14:05  Pee 432 mL")
+        self.assertEqual(virtual_list.describe(omo.Release(t, 700.0, False)), "14:05  Accident 700 mL")
+        self.assertEqual(virtual_list.describe(omo.Release(t, float('nan'), True)), "14:05  Pee ? mL")
+
+
+
+
+    def test_history_view_is_a_source(self):
+        log = omo.EventLog()
+        for i in range(100):
+            log.insert_drink(float(i), 100.0)
+        view = log.view()
+        self.assertEqual(view[95:100], [omo.Drink(float(i), 100.0) for i in range(95, 100)])
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------
+# Main Loop
+#----------------------------
+if __name__ == "__main__":
+    unittest.main()
+#----------------------------
@@ -19,11 +19,14 @@ Description:
     A basic timer class that will primarily be used to track remaining hold time,
     consequently it is only designed to track time for hours, not days or beyond
     and it's precision is limited to seconds.
-    
+
+    Time is kept in nanoseconds and only rounded up to whole seconds when read, so pausing
+    and resuming does not lose time. On a clock.ClockScheduler the countdown fires on_expire
+    by itself when it runs out.
 
 License: MIT License
 Contact: tsukiko1701@gmail.com
-Dependencies: time
+Dependencies: time, clock.py
 """
 
 
@@ -45,6 +48,7 @@ __status__ = "Production"
 # Import Statements:
 #----------------------------
 import time
+from clock import NS_PER_SECOND
 #----------------------------
 
 
@@ -73,16 +77,24 @@ class TimerError(Exception):
 #----------------------------------------------------------------------------------------------------------------------
 class Timer():
     # Constructor:
-    def __init__(self, duration):
+    def __init__(self, duration, scheduler=None, on_expire=None):
         """
         Initializes the Countdown class.
         :param duration: Countdown duration in seconds.
+        :param scheduler: A clock.ClockScheduler to run on. The countdown then schedules its own
+                          expiry instead of noticing it when polled, and many countdowns share one clock.
+                          By default the countdown reads time.perf_counter_ns() itself.
+        :param on_expire: Called with the countdown when it reaches zero.
         """
         if duration <= 0:
             raise ValueError("Duration must be greater than zero.")
         
-        self._initial_duration = int(duration)
-        self._remaining_time = int(duration)
+        self._scheduler = scheduler
+        self._now_ns = scheduler.now_ns if scheduler is not None else time.perf_counter_ns
+        self._on_expire = on_expire
+        self._expiry_handle = None
+        self._initial_duration = int(duration) * NS_PER_SECOND
+        self._remaining_time = self._initial_duration # Nanoseconds
         self._start_time = None
         self._running = False
 
@@ -93,13 +105,38 @@ class Timer():
     def _update_remaining_time(self):
         """Updates the remaining time based on elapsed time since start."""
         if self.is_running():
-            elapsed = int(time.perf_counter()) - self._start_time
-            self._remaining_time -= int(elapsed)
-            self._start_time = int(time.perf_counter())
+            now = self._now_ns()
+            self._remaining_time -= now - self._start_time
+            self._start_time = now
             # Prevent negative remaining time:
             if self._remaining_time <= 0:
-                self._remaining_time = 0
-                self._running = False
+                self._expire()
+
+
+
+
+    def _expire(self):
+        """Finishes the countdown, on its scheduled expiry or when a poll finds it ran out."""
+        self._cancel_expiry()
+        self._remaining_time = 0
+        self._running = False
+        if self._on_expire is not None:
+            self._on_expire(self)
+
+
+
+
+    def _schedule_expiry(self):
+        if self._scheduler is not None:
+            self._expiry_handle = self._scheduler.call_at(self._start_time + self._remaining_time, self._expire)
+
+
+
+
+    def _cancel_expiry(self):
+        if self._expiry_handle is not None:
+            self._scheduler.cancel(self._expiry_handle)
+            self._expiry_handle = None
 
 
 
@@ -116,8 +153,9 @@ class Timer():
         if self._remaining_time <= 0:
             raise TimerError("The countdown has already finished. Reset to start again.")
         
-        self._start_time = int(time.perf_counter())
+        self._start_time = self._now_ns()
         self._running = True
+        self._schedule_expiry()
 
     def pause_countdown(self):
         """Pauses the countdown."""
@@ -125,6 +163,7 @@ class Timer():
             raise TimerError("Cannot pause a countdown that isn't running.")
         self._update_remaining_time()
         self._running = False
+        self._cancel_expiry()
 
     def resume_countdown(self):
         """Resumes the countdown."""
@@ -133,20 +172,22 @@ class Timer():
         if self._remaining_time <= 0:
             raise TimerError("Cannot resume a finished countdown. Reset to start again.")
         
-        self._start_time = int(time.perf_counter())
+        self._start_time = self._now_ns()
         self._running = True
+        self._schedule_expiry()
 
     def reset_countdown(self):
         """Resets the countdown to its initial duration."""
+        self._cancel_expiry()
         self._remaining_time = self._initial_duration
         self._start_time = None
         self._running = False
 
     def get_remaining_time(self):
-        """Returns the remaining time in seconds."""
+        """Returns the remaining time in seconds, rounded up to whole seconds."""
         if self.is_running():
             self._update_remaining_time()
-        return self._remaining_time
+        return -(-self._remaining_time // NS_PER_SECOND)
 
     def output_remaining_time(self):
         """Returns the remaining time as a formatted string (hh:mm:ss)."""
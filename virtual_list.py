@@ -0,0 +1,335 @@
+#----------------------------
+# File Headers:
+#----------------------------
+# Shebang:
+#!/usr/bin/env python
+
+
+# Encoding:
+# -*- coding: utf-8 -*-
+
+
+# Docstring:
+"""
+Filename: virtual_list.py
+Authors: Tsukiko
+Date: 18/10/2026
+Version: 1.0.0
+Description:
+    A scrollable list that only renders the rows on screen, for the activity log of drinks,
+    pees and accidents. It keeps a fixed pool of row labels, one per visible row, and re-binds
+    them to a slice of its source sequence as the user scrolls. Scrolling and appending cost
+    O(visible rows) and the widget's memory does not depend on how long the source grows.
+
+    The source is any sequence supporting len() and slicing, such as an omo.HistoryView.
+    Call refresh() after appending to it. While the list is scrolled to the bottom it follows
+    new rows, otherwise it stays put.
+
+License: MIT License
+Contact: tsukiko1701@gmail.com
+Dependencies: math, time, tkinter
+"""
+
+
+# Dunders:
+__author__ = "Tsukiko"
+__copyright__ = "Copyright (c) 2025 Tsukiko-030"
+__credits__ = ["Tsukiko"]
+__license__ = "The MIT License (MIT)"
+__version__ = "1.0.0"
+__maintainer__ = "Tsukiko"
+__email__ = "tsukiko1701@gmail.com"
+__status__ = "Production"
+#----------------------------
+
+
+
+
+#----------------------------
+# Import Statements:
+#----------------------------
+import math
+import time
+import tkinter as tk
+#----------------------------
+
+
+
+
+#--------------------------------------
+# Exterior Variables:
+#--------------------------------------
+ROW_HEIGHT = 20 # Pixels.
+# Rows the list asks the window for, it shows more or fewer if given a different height:
+VISIBLE_ROWS = 6
+# Rows scrolled per mouse wheel notch:
+WHEEL_ROWS = 3
+#--------------------------------------
+
+
+
+
+#--------------------------------------
+# Exterior Functions:
+#--------------------------------------
+def describe(event):
+    """
+    Returns the activity log text for an omo.Drink or omo.Release event. An unknown amount, NaN,
+    shows as ?. Releases are told apart by their permission field, so omo need not be imported.
+    """
+    clock = time.strftime('%H:%M', time.localtime(event.time * 60.0))
+    amount = "?" if math.isnan(event.amount) else str(round(event.amount))
+    if not hasattr(event, 'permission'):
+        return clock + "  Drink " + amount + " mL"
+    elif event.permission:
+        return clock + "  Pee " + amount + " mL"
+    else:
+        return clock + "  Accident " + amount + " mL"
+#--------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# Viewport Class:
+#----------------------------------------------------------------------------------------------------------------------
+class Viewport():
+    # Constructor:
+    def __init__(self, rows=1):
+        """
+        Initializes the Viewport Class: which rows of a list are on screen.
+        :param rows: Rows that fit on screen, a partly shown last row included.
+        """
+        self.rows = max(1, rows)
+        self.count = 0
+        self.top = 0
+        self.following = True
+
+
+
+
+    # Private Methods:
+    def _max_top(self):
+        return max(0, self.count - self.rows)
+
+
+
+
+    def _clamp(self):
+        self.top = min(max(0, self.top), self._max_top())
+        self.following = self.top == self._max_top()
+
+
+
+
+    # Public Methods:
+    def resize(self, height, row_height=ROW_HEIGHT):
+        """Fits the viewport to height pixels."""
+        self.rows = max(1, math.ceil(height / row_height))
+        if self.following:
+            self.top = self._max_top()
+        self._clamp()
+
+
+
+
+    def set_count(self, count):
+        """Updates the length of the list, keeping the bottom in view if it was."""
+        self.count = count
+        if self.following:
+            self.top = self._max_top()
+        self._clamp()
+
+
+
+
+    def scroll_to(self, fraction):
+        """Scrolls so the row at fraction of the list is on top."""
+        self.top = round(fraction * self.count)
+        self._clamp()
+
+
+
+
+    def scroll_by(self, rows):
+        """Scrolls down by rows, up if negative."""
+        self.top += rows
+        self._clamp()
+
+
+
+
+    def visible(self):
+        """Returns the (start, stop) rows on screen."""
+        return self.top, min(self.count, self.top + self.rows)
+
+
+
+
+    def fractions(self):
+        """Returns the (first, last) fractions of the list on screen, as a Tk scrollbar expects."""
+        if not self.count:
+            return 0.0, 1.0
+        return self.top / self.count, min(1.0, (self.top + self.rows) / self.count)
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# RowPool Class:
+#----------------------------------------------------------------------------------------------------------------------
+class RowPool():
+    # Constructor:
+    def __init__(self, make_label, format_row=describe):
+        """
+        Initializes the RowPool Class.
+        :param make_label: Called with the slot number to create a row label, which needs configure(text=...).
+        :param format_row: Turns an item of the source into the row's text.
+        """
+        self._make_label = make_label
+        self._format_row = format_row
+        self.labels = []
+        self._texts = []
+        self.rebinds = 0
+
+
+
+
+    # Public Methods:
+    def ensure(self, rows):
+        """Grows the pool to at least rows labels. The pool never shrinks, it is as tall as the tallest window."""
+        while len(self.labels) < rows:
+            self.labels.append(self._make_label(len(self.labels)))
+            self._texts.append(None)
+
+
+
+
+    def bind(self, items):
+        """Shows items in the first slots and blanks the rest, only touching labels whose text changes."""
+        for slot, label in enumerate(self.labels):
+            text = self._format_row(items[slot]) if slot < len(items) else ""
+            if text != self._texts[slot]:
+                label.configure(text=text)
+                self._texts[slot] = text
+                self.rebinds += 1
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#----------------------------------------------------------------------------------------------------------------------
+# VirtualList Class:
+#----------------------------------------------------------------------------------------------------------------------
+class VirtualList(tk.Frame):
+    # Constructor:
+    def __init__(self, master, source, format_row=describe, row_height=ROW_HEIGHT, visible_rows=VISIBLE_ROWS,
+                 **label_options):
+        """
+        Initializes the VirtualList Class.
+        :param source: Sequence of items, with len() and slicing.
+        :param format_row: Turns an item into its row's text.
+        :param label_options: Passed to each row's tk.Label, e.g. bg, fg and font.
+        """
+        super().__init__(master, bg=label_options.get('bg'))
+        self.source = source
+        self.row_height = row_height
+        self._label_options = label_options
+        self.viewport = Viewport()
+
+        self.body = tk.Frame(self, height=visible_rows * row_height, bg=label_options.get('bg'))
+        self.body.grid(column=0, row=0, sticky=(tk.N, tk.S, tk.E, tk.W))
+        self.scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.grid(column=1, row=0, sticky=(tk.N, tk.S))
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+        self.pool = RowPool(self._make_label, format_row)
+
+        self.body.bind("<Configure>", self._on_configure)
+        for widget in (self, self.body):
+            widget.bind("<MouseWheel>", self._on_wheel)
+            widget.bind("<Button-4>", self._on_wheel)
+            widget.bind("<Button-5>", self._on_wheel)
+
+
+
+
+    # Private Methods:
+    def _make_label(self, slot):
+        label = tk.Label(self.body, anchor=tk.W, **self._label_options)
+        label.place(x=0, y=slot * self.row_height, relwidth=1.0, height=self.row_height)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            label.bind(sequence, self._on_wheel)
+        return label
+
+
+
+
+    def _on_configure(self, event):
+        self.viewport.resize(event.height, self.row_height)
+        self.pool.ensure(self.viewport.rows)
+        self.render()
+
+
+
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == tk.MOVETO:
+            self.viewport.scroll_to(float(amount))
+        elif unit == tk.PAGES:
+            self.viewport.scroll_by(int(amount) * max(1, self.viewport.rows - 1))
+        else:
+            self.viewport.scroll_by(int(amount))
+        self.render()
+
+
+
+
+    def _on_wheel(self, event):
+        if event.num == 4 or getattr(event, 'delta', 0) > 0:
+            self.viewport.scroll_by(-WHEEL_ROWS)
+        else:
+            self.viewport.scroll_by(WHEEL_ROWS)
+        self.render()
+
+
+
+
+    # Public Methods:
+    def render(self):
+        """Re-binds the pool to the rows on screen."""
+        start, stop = self.viewport.visible()
+        self.pool.bind(self.source[start:stop])
+        self.scrollbar.set(*self.viewport.fractions())
+
+
+
+
+    def refresh(self):
+        """Picks up rows appended to the source, re-binding only the rows on screen."""
+        self.viewport.set_count(len(self.source))
+        self.render()
+#----------------------------------------------------------------------------------------------------------------------
+
+
+
+
+#--------------------------------------------------------------------------------------------------
+# Ideas for Improvements:
+#--------------------------------------------------------------------------------------------------
+"""
+* Colour rows by kind, and show the hold number from the hold history next to each pee and accident.
+"""
+#--------------------------------------------------------------------------------------------------
+
+
+
+
+#--------------------------------------------------------------------------------------------------
+# References:
+#--------------------------------------------------------------------------------------------------
+"""
+* https://tkdocs.com/shipman/scrollbar.html
+"""
+#--------------------------------------------------------------------------------------------------